@@ -0,0 +1,228 @@
+"""
+Catalog of database backups
+
+Backups and the chunks each one uses are recorded in ``catalog.db`` next to
+them, a separate SQLite file so it is neither part of the backups nor
+replaced by a restore. Listing backups, retention and chunk garbage
+collection query it instead of reading every manifest in the directory, and
+point-in-time restores look up the backups to start from by the position of
+the change journal each one contains (see backend.change_journal).
+
+The catalog is opened on first use, and one that doesn't exist yet is filled
+once from the backups already in the directory.
+
+Scheduled backups are pruned grandfather-father-son style: the newest backup
+of each day is kept for ``days`` days, of each ISO week for ``weeks`` weeks
+and of each month for ``months`` months.
+"""
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS backups (
+        filename TEXT PRIMARY KEY,
+        created_at TEXT NOT NULL,
+        kind TEXT NOT NULL DEFAULT 'manual',
+        description TEXT,
+        size INTEGER,
+        stored_size INTEGER,
+        compression_ratio REAL,
+        sha256 TEXT,
+        journal_id INTEGER,
+        journal_at TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_backups_kind_created ON backups(kind, created_at);
+
+    CREATE TABLE IF NOT EXISTS backup_chunks (
+        filename TEXT NOT NULL REFERENCES backups(filename) ON DELETE CASCADE,
+        digest TEXT NOT NULL,
+        PRIMARY KEY (filename, digest)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_backup_chunks_digest ON backup_chunks(digest);
+"""
+
+_FIELDS = (
+    "filename", "created_at", "kind", "description", "size", "stored_size", "compression_ratio", "sha256",
+    "journal_id", "journal_at"
+)
+
+# Columns added after the first catalogs were created
+_ADDED_COLUMNS = {"journal_id": "INTEGER", "journal_at": "TEXT"}
+
+
+class BackupCatalog:
+    """Backups recorded in a small SQLite database"""
+
+    def __init__(self, backup_dir: Path):
+        self.backup_dir = Path(backup_dir)
+        self.path = self.backup_dir / "catalog.db"
+        self._ready = False
+        self._init_lock = threading.Lock()
+
+    def _initialize(self):
+        """Create the catalog on first use (not when the service is built)"""
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        is_new = not self.path.exists()
+        conn = self._open()
+        try:
+            conn.executescript(_SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(backups)")}
+            for column, column_type in _ADDED_COLUMNS.items():
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE backups ADD COLUMN {column} {column_type}")
+            if is_new:
+                self._import_directory(conn)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._ready:
+            with self._init_lock:
+                if not self._ready:
+                    self._initialize()
+                    self._ready = True
+        return self._open()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def _import_directory(self, conn: sqlite3.Connection):
+        """Record backups made before the catalog existed"""
+        for path in self.backup_dir.glob("backup_*.manifest"):
+            try:
+                with open(path, 'r') as f:
+                    manifest = json.load(f)
+            except Exception:
+                continue
+            self._insert(conn, {**manifest, "filename": path.name}, manifest.get("chunks", []))
+
+        for path in self.backup_dir.glob("backup_*.db"):
+            metadata = {}
+            meta_path = path.with_suffix('.meta')
+            if meta_path.exists():
+                try:
+                    with open(meta_path, 'r') as f:
+                        metadata = json.load(f)
+                except Exception:
+                    pass
+            stat = path.stat()
+            self._insert(conn, {
+                "filename": path.name,
+                "created_at": metadata.get("created_at") or datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                "description": metadata.get("description", "Backup"),
+                "size": stat.st_size,
+                "stored_size": stat.st_size,
+                "compression_ratio": 1.0,
+            }, [])
+
+    def _insert(self, conn: sqlite3.Connection, entry: Dict, chunks: Iterable[str]):
+        values = {**entry, "kind": entry.get("kind") or "manual"}
+        conn.execute(
+            f"INSERT OR REPLACE INTO backups ({', '.join(_FIELDS)}) VALUES ({', '.join('?' * len(_FIELDS))})",
+            [values.get(field) for field in _FIELDS]
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO backup_chunks (filename, digest) VALUES (?, ?)",
+            [(entry["filename"], digest) for digest in chunks]
+        )
+
+    def add(self, entry: Dict, chunks: Iterable[str]):
+        """Record a backup and the chunks it uses"""
+        conn = self._connect()
+        try:
+            self._insert(conn, entry, chunks)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def remove(self, filenames: Iterable[str]):
+        conn = self._connect()
+        try:
+            conn.executemany("DELETE FROM backups WHERE filename = ?", [(name,) for name in filenames])
+            conn.commit()
+        finally:
+            conn.close()
+
+    def list(self, kind: Optional[str] = None) -> List[Dict]:
+        """Backups, newest first"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(f"""
+                SELECT {', '.join(_FIELDS)} FROM backups
+                WHERE :kind IS NULL OR kind = :kind
+                ORDER BY created_at DESC, filename DESC
+            """, {"kind": kind}).fetchall()
+        finally:
+            conn.close()
+        return [dict(row) for row in rows]
+
+    def latest(self, kind: str) -> Optional[Dict]:
+        conn = self._connect()
+        try:
+            row = conn.execute(f"""
+                SELECT {', '.join(_FIELDS)} FROM backups
+                WHERE kind = ?
+                ORDER BY created_at DESC, filename DESC
+                LIMIT 1
+            """, (kind,)).fetchone()
+        finally:
+            conn.close()
+        return dict(row) if row else None
+
+    def recovery_bases(self, until: str) -> List[Dict]:
+        """Backups whose change journal ends by ``until``, newest first"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(f"""
+                SELECT {', '.join(_FIELDS)} FROM backups
+                WHERE journal_id IS NOT NULL AND (journal_at IS NULL OR journal_at <= ?)
+                ORDER BY created_at DESC, filename DESC
+            """, (until,)).fetchall()
+        finally:
+            conn.close()
+        return [dict(row) for row in rows]
+
+    def oldest_journal_id(self) -> Optional[int]:
+        """Journal position of the oldest backup recorded with one"""
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT MIN(journal_id) FROM backups").fetchone()[0]
+        finally:
+            conn.close()
+
+    def referenced_chunks(self) -> Set[str]:
+        conn = self._connect()
+        try:
+            return {row[0] for row in conn.execute("SELECT DISTINCT digest FROM backup_chunks")}
+        finally:
+            conn.close()
+
+
+def retained_backups(backups: List[Dict], now: datetime, days: int, weeks: int, months: int) -> Set[str]:
+    """Filenames the daily/weekly/monthly retention keeps (the newest always)"""
+    keep = set()
+    seen = set()
+    this_month = now.year * 12 + now.month
+    for backup in sorted(backups, key=lambda b: b["created_at"], reverse=True):
+        created = datetime.fromisoformat(backup["created_at"])
+        age = now - created
+        tiers = (
+            ("day", created.date(), age < timedelta(days=days)),
+            ("week", created.isocalendar()[:2], age < timedelta(weeks=weeks)),
+            ("month", (created.year, created.month), this_month - (created.year * 12 + created.month) < months),
+        )
+        for tier, bucket, in_window in tiers:
+            if in_window and (tier, bucket) not in seen:
+                seen.add((tier, bucket))
+                keep.add(backup["filename"])
+        if not keep:
+            keep.add(backup["filename"])
+    return keep
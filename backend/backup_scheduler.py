@@ -0,0 +1,124 @@
+"""
+In-process scheduler for daily backups
+
+A background thread takes a scheduled backup every day at
+``settings.backup_schedule_time`` (local time), and once right after startup
+when the last one is more than a day old, then applies the retention policy.
+The change journal is pruned to the oldest backup just before each snapshot.
+Weekly and monthly backups are the daily ones retention keeps longer (see
+backend.backup_catalog).
+
+A run is skipped without reading the database when ``PRAGMA data_version``
+on the scheduler's own connection, which changes whenever another connection
+commits, hasn't changed since the last backup. After a restart the snapshot
+is compared with the latest scheduled backup instead, and dropped if equal.
+"""
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from backend.config import settings
+from backend.services.backup_service import BackupService
+
+
+class BackupScheduler:
+    """Thread taking the daily backup and pruning old ones"""
+
+    def __init__(self, service: Optional[BackupService] = None):
+        self.service = service or BackupService()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._monitor: Optional[sqlite3.Connection] = None
+        self._backed_up_version: Optional[int] = None
+        self.last_run: Optional[Dict] = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="backup-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self._monitor is not None:
+            self._monitor.close()
+            self._monitor = None
+
+    def next_run(self, now: datetime) -> datetime:
+        """Next time of day the backup is due"""
+        hour, minute = (int(part) for part in settings.backup_schedule_time.split(":"))
+        run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        return run if run > now else run + timedelta(days=1)
+
+    def _run(self):
+        # Catch up on a run missed while the server was down
+        latest = self.service.catalog.latest("scheduled")
+        if not latest or datetime.fromisoformat(latest["created_at"]) < datetime.now() - timedelta(days=1):
+            self.run_once()
+
+        while not self._stop.is_set():
+            delay = (self.next_run(datetime.now()) - datetime.now()).total_seconds()
+            if self._stop.wait(max(delay, 0)):
+                break
+            self.run_once()
+
+    def _data_version(self) -> int:
+        if self._monitor is None:
+            self._monitor = sqlite3.connect(str(settings.database_path), check_same_thread=False)
+        return self._monitor.execute("PRAGMA data_version").fetchone()[0]
+
+    def run_once(self) -> Dict:
+        """Prune the change journal and take the scheduled backup unless
+        nothing changed, then apply retention"""
+        result = {
+            "started_at": datetime.now().isoformat(),
+            "backup": None,
+            "skipped": False,
+            "deleted": 0,
+            "journal_pruned": 0
+        }
+        try:
+            version = self._data_version()
+            if version == self._backed_up_version:
+                result["skipped"] = True
+            else:
+                # Pruning commits too; do it before the version the backup
+                # stands for is read, or the next run would see a change
+                result["journal_pruned"] = self.service.prune_journal()
+                # Read before the snapshot, so commits during it trigger the next run
+                version = self._data_version()
+                result["backup"] = self.service.create_backup(
+                    description="Scheduled backup", kind="scheduled", skip_unchanged=True
+                )
+                result["skipped"] = result["backup"] is None
+                self._backed_up_version = version
+            result["deleted"] = self.service.apply_retention()
+        except Exception as e:
+            result["error"] = str(e)
+            print(f"⚠ Scheduled backup failed: {e}")
+        self.last_run = result
+        return result
+
+
+_scheduler: Optional[BackupScheduler] = None
+
+
+def start_backup_scheduler() -> Optional[BackupScheduler]:
+    """Start the scheduler if backups are scheduled (see settings)"""
+    global _scheduler
+    if not settings.backup_schedule_enabled:
+        return None
+    if _scheduler is None:
+        _scheduler = BackupScheduler()
+    _scheduler.start()
+    return _scheduler
+
+
+def stop_backup_scheduler():
+    """Stop the scheduler (used on shutdown)"""
+    if _scheduler is not None:
+        _scheduler.stop()
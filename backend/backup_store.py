@@ -0,0 +1,164 @@
+"""
+Content-addressed chunk store for database backups
+
+A backup is a manifest listing the SHA-256 digests of the database file's
+chunks (runs of whole pages, in order); the chunks themselves are stored once
+under ``chunks/<first two hex digits>/<digest>[.gz|.zst]``. Pages that didn't
+change between backups hash to chunks that are already stored, so each backup
+only writes what changed since the ones before it, although every chunk is
+still read and hashed. Chunks no manifest refers to any more are removed by
+collect_garbage.
+
+Chunks are compressed one by one (gzip, or zstd when the zstandard package is
+installed). Concatenated gzip members, like concatenated zstd frames, form one
+valid compressed file, so a compressed download of a backup is just its stored
+chunks one after another.
+"""
+import gzip
+import hashlib
+import os
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+_DECOMPRESS_ERRORS = (OSError, EOFError, zlib.error) + ((zstandard.ZstdError,) if zstandard else ())
+
+# Compression -> suffix of stored chunks and of downloads
+COMPRESSION_SUFFIXES: Dict[str, str] = {'none': '', 'gzip': '.gz', 'zstd': '.zst'}
+
+
+def resolve_compression(name: str) -> str:
+    """Compression to use for a configured name (gzip when zstd is unavailable)"""
+    name = (name or 'none').lower()
+    if name not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unknown backup compression: {name}")
+    if name == 'zstd' and zstandard is None:
+        return 'gzip'
+    return name
+
+
+def compress(data: bytes, compression: str) -> bytes:
+    if compression == 'gzip':
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if compression == 'zstd':
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return data
+
+
+def decompress(data: bytes, compression: str) -> bytes:
+    if compression == 'gzip':
+        return gzip.decompress(data)
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ValueError("Backup chunk is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return data
+
+
+class StoredFile(NamedTuple):
+    """A file written to the store"""
+    chunks: List[str]
+    size: int
+    sha256: str
+    stored_size: int  # bytes of all its chunks as stored
+    written: int  # bytes of the chunks that weren't stored before
+
+
+class ChunkStore:
+    """Chunks stored as files named by the hash of their content"""
+
+    def __init__(self, root: Path, compression: str = 'none'):
+        self.root = Path(root)
+        self.compression = resolve_compression(compression)
+
+    def _find(self, digest: str) -> Optional[Tuple[Path, str]]:
+        """Stored file of a chunk and its compression"""
+        folder = self.root / digest[:2]
+        for compression, suffix in COMPRESSION_SUFFIXES.items():
+            path = folder / f"{digest}{suffix}"
+            if path.exists():
+                return path, compression
+        return None
+
+    def put(self, data: bytes) -> Tuple[str, int, int]:
+        """Store a chunk unless it exists; returns (digest, size as stored, bytes written)"""
+        digest = hashlib.sha256(data).hexdigest()
+        found = self._find(digest)
+        if found:
+            return digest, found[0].stat().st_size, 0
+
+        stored = compress(data, self.compression)
+        path = self.root / digest[:2] / f"{digest}{COMPRESSION_SUFFIXES[self.compression]}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(temp_path, 'wb') as f:
+            f.write(stored)
+        temp_path.replace(path)
+        return digest, len(stored), len(stored)
+
+    def get(self, digest: str) -> bytes:
+        """Content of a chunk; raises ValueError if it is missing or damaged"""
+        found = self._find(digest)
+        if not found:
+            raise ValueError(f"Backup chunk {digest} is missing")
+        path, compression = found
+        try:
+            data = decompress(path.read_bytes(), compression)
+        except _DECOMPRESS_ERRORS:
+            raise ValueError(f"Backup chunk {digest} is damaged")
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Backup chunk {digest} is damaged")
+        return data
+
+    def get_compressed(self, digest: str, compression: str) -> bytes:
+        """A chunk compressed with ``compression`` (as stored when it matches)"""
+        found = self._find(digest)
+        if found and found[1] == compression:
+            return found[0].read_bytes()
+        return compress(self.get(digest), compression)
+
+    def write_file(self, f: BinaryIO, chunk_size: int) -> StoredFile:
+        """Store a file in chunks"""
+        chunks = []
+        size = stored_size = written = 0
+        file_hash = hashlib.sha256()
+        while True:
+            data = f.read(chunk_size)
+            if not data:
+                break
+            file_hash.update(data)
+            digest, stored, new = self.put(data)
+            chunks.append(digest)
+            size += len(data)
+            stored_size += stored
+            written += new
+        return StoredFile(chunks, size, file_hash.hexdigest(), stored_size, written)
+
+    def read_file(self, digests: Iterable[str]) -> Iterator[bytes]:
+        """Contents of the chunks in order (a stored file reassembled)"""
+        for digest in digests:
+            yield self.get(digest)
+
+    def read_compressed(self, digests: Iterable[str], compression: str) -> Iterator[bytes]:
+        """A stored file as one compressed stream, chunk by chunk"""
+        for digest in digests:
+            yield self.get_compressed(digest, compression)
+
+    def collect_garbage(self, referenced: Set[str]) -> Tuple[int, int]:
+        """Delete chunks not in ``referenced``; returns (chunks, bytes) freed"""
+        deleted = freed = 0
+        if not self.root.exists():
+            return deleted, freed
+        for path in self.root.glob("*/*"):
+            # Left-over temporary files go too
+            if path.name.split('.')[0] in referenced and not path.name.endswith('.tmp'):
+                continue
+            freed += path.stat().st_size
+            path.unlink()
+            deleted += 1
+        return deleted, freed
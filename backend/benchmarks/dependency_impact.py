@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark: schedule impact analysis on a large dependency graph
+
+Seeds one project with a layered dependency graph and times
+analyze_schedule_impact of a ten-day delay of the first item (reaching
+every other one) against the previous approach: a recursive walk calling get_successors and
+_get_item (a connection and a query each) for every dependency. Also times
+the critical path computation (uncached and cached), the cycle check of a
+new dependency and the whole-project audit.
+
+Usage:
+    python -m backend.benchmarks.dependency_impact [edge_count]
+
+Runs against a throwaway database, never the configured one.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+EDGES_PER_ITEM = 2.5
+REPEAT = 5
+
+
+def seed(edge_count: int) -> str:
+    """Add one project whose items form a DAG with edge_count dependencies"""
+    from backend.db_writer import get_writer
+    from backend.services.wbs_service import wbs_sort_key
+
+    rng = random.Random(1)
+    item_count = int(edge_count / EDGES_PER_ITEM) + 1
+    start = date(2024, 1, 1)
+
+    items = []
+    for n in range(item_count):
+        wbs_id = str(n + 1)
+        items.append((
+            f"BD_{wbs_id}", wbs_id, wbs_sort_key(wbs_id), f"Task {wbs_id}",
+            str(start + timedelta(days=n)), str(start + timedelta(days=n + 5)),
+        ))
+
+    # Every item after the first depends on an earlier one, so all are
+    # reachable from item 0; the rest of the edges are random forward links
+    edges = {(rng.randrange(n), n) for n in range(1, item_count)}
+    while len(edges) < edge_count:
+        a, b = sorted(rng.sample(range(item_count), 2))
+        edges.add((a, b))
+
+    def _insert(conn):
+        conn.execute("INSERT INTO projects (project_id, project_name) VALUES ('BD', 'Bench')")
+        conn.executemany("""
+            INSERT INTO tracking_items (item_id, project_id, wbs_id, wbs_sort_key, task_name, item_type,
+                                        original_planned_start, original_planned_end, status)
+            VALUES (?, 'BD', ?, ?, ?, 'WBS', ?, ?, '未開始')
+        """, items)
+        conn.executemany("""
+            INSERT INTO item_dependencies (predecessor_id, successor_id, dependency_type, lag_days)
+            VALUES (?, ?, ?, 0)
+        """, [(items[a][0], items[b][0], rng.choice(['FS', 'FS', 'SS', 'FF'])) for a, b in sorted(edges)])
+
+    get_writer().execute(_insert)
+    return items[0][0]
+
+
+def previous_walk(service, item_id: str) -> int:
+    """The recursive walk analyze_schedule_impact used before (returns edges seen)"""
+    visited = set()
+    seen = 0
+
+    def walk(current_id):
+        nonlocal seen
+        if current_id in visited:
+            return
+        visited.add(current_id)
+        for dep in service.get_successors(current_id, active_only=True):
+            service._get_item(dep.successor_id)
+            service._get_item(dep.predecessor_id)
+            seen += 1
+            walk(dep.successor_id)
+
+    sys.setrecursionlimit(100_000)
+    walk(item_id)
+    return seen
+
+
+def best_of(func, repeat: int = REPEAT) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    edge_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+
+    tmp_dir = tempfile.mkdtemp()
+    os.environ["DATABASE_PATH"] = os.path.join(tmp_dir, "bench.db")
+
+    from backend.init_db import create_database_schema
+    from backend.services.dependency_service import DependencyService
+    from backend.critical_path import CriticalPath
+
+    create_database_schema()
+    source = seed(edge_count)
+    service = DependencyService()
+
+    delay = {"field": "revised_planned_end", "new_value": "2024-01-16"}
+    analysis = service.analyze_schedule_impact(source, delay)
+    assert previous_walk(service, source) == edge_count
+
+    load = best_of(lambda: service.load_graph('BD'))
+    analyze = best_of(lambda: service.analyze_schedule_impact(source, delay))
+    graph = service.load_graph('BD')
+    critical_path = best_of(lambda: CriticalPath(graph))
+    critical_path_cached = best_of(lambda: service.get_critical_path('BD'))
+    # A valid new edge from the first item: finding no way back to it means
+    # searching everything reachable from the successor
+    first = graph.index[source]
+    successor = graph.items[graph.edges[graph.out_edges[first][0]].successor].item_id
+    cycle_check = best_of(lambda: service._check_cycle(graph, source, successor))
+    audit = best_of(lambda: graph.cycles())
+    previous = best_of(lambda: previous_walk(service, source), repeat=1)
+
+    print("=" * 66)
+    print(f"Schedule impact benchmark ({edge_count:,} dependencies, "
+          f"{analysis.total_affected:,} suggestions)")
+    print("=" * 66)
+    print(f"   load graph (2 queries)       {load * 1000:>9.1f} ms")
+    print(f"   analyze_schedule_impact      {analyze * 1000:>9.1f} ms")
+    print(f"   critical path (CPM passes)   {critical_path * 1000:>9.1f} ms")
+    print(f"   get_critical_path (cached)   {critical_path_cached * 1000:>9.1f} ms")
+    print(f"   cycle check, worst case      {cycle_check * 1000:>9.1f} ms")
+    print(f"   cycle audit (Tarjan)         {audit * 1000:>9.1f} ms")
+    print(f"   previous recursive walk      {previous * 1000:>9.1f} ms  ({previous / analyze:.0f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark: issue list page latency by page depth, OFFSET vs cursor
+
+Seeds one project with many issues, then times fetching a page at several
+depths both with ``skip`` (LIMIT/OFFSET) and with the cursor of the page
+before it.
+
+Usage:
+    python -m backend.benchmarks.pagination [issue_count]
+
+Runs against a throwaway database, never the configured one.
+"""
+import os
+import sys
+import tempfile
+import time
+
+PAGE_SIZE = 100
+REPEAT = 5
+
+
+def seed(issue_count: int):
+    """Add one project with issue_count issues (many sharing a created_at)"""
+    from backend.db_writer import get_writer
+
+    def _insert(conn):
+        conn.execute("INSERT INTO projects (project_id, project_name) VALUES ('BP', 'Bench')")
+        conn.executemany("""
+            INSERT INTO issue_tracking (project_id, issue_number, issue_title, issue_type,
+                                        issue_category, source, reported_by, reported_date,
+                                        severity, priority, status, created_at)
+            VALUES ('BP', ?, 'issue', '技術問題', '風險', '內部', 'bench', '2024-01-01',
+                    'Low', 'Low', 'Open', datetime('2024-01-01', ?))
+        """, [(f"BP-{n}", f"+{n // 10} minutes") for n in range(issue_count)])
+
+    get_writer().execute(_insert)
+
+
+def best_of(func) -> float:
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    issue_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    tmp_dir = tempfile.mkdtemp()
+    os.environ["DATABASE_PATH"] = os.path.join(tmp_dir, "bench.db")
+
+    from backend.init_db import create_database_schema
+    from backend.services.issue_service import IssueService
+
+    create_database_schema()
+    seed(issue_count)
+    service = IssueService()
+
+    print("=" * 66)
+    print(f"Issue list benchmark ({issue_count:,} issues, page size {PAGE_SIZE})")
+    print("=" * 66)
+    print(f"   {'page starts at':>14}  {'skip':>12}  {'cursor':>12}  {'speedup':>8}")
+
+    depths = [0, issue_count // 10, issue_count // 2, issue_count - PAGE_SIZE]
+    for depth in depths:
+        # Cursor of the page that ends right before this one
+        cursor = None
+        if depth:
+            cursor = service.get_issue_list(project_id="BP", skip=depth - PAGE_SIZE, limit=PAGE_SIZE).next_cursor
+
+        with_skip = best_of(lambda: service.get_issue_list(project_id="BP", skip=depth, limit=PAGE_SIZE))
+        with_cursor = best_of(lambda: service.get_issue_list(project_id="BP", limit=PAGE_SIZE, page_cursor=cursor))
+
+        assert (
+            [i.issue_id for i in service.get_issue_list(project_id="BP", skip=depth, limit=PAGE_SIZE).items]
+            == [i.issue_id for i in service.get_issue_list(project_id="BP", limit=PAGE_SIZE, page_cursor=cursor).items]
+        )
+        print(f"   {depth:>14,}  {with_skip * 1000:>9.1f} ms  {with_cursor * 1000:>9.1f} ms"
+              f"  {with_skip / with_cursor:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
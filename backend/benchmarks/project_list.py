@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark: project list latency as the number of projects grows
+
+Compares get_project_list, which joins the page of projects to their
+trigger-maintained project_stats rows, with the previous N+1 approach: list
+the page, then per project open a connection and run one lookup plus three
+aggregate queries over the item tables.
+
+Usage:
+    python -m backend.benchmarks.project_list [project_count ...]
+
+Runs against a throwaway database, never the configured one.
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+WBS_PER_PROJECT = 50
+ISSUES_PER_PROJECT = 10
+PENDING_PER_PROJECT = 10
+REPEAT = 5
+
+
+def seed(project_count: int, start: int):
+    """Add projects start..project_count-1 with child rows"""
+    from backend.db_writer import get_writer
+    from backend.services.wbs_service import WBSService
+
+    project_ids = [f"BP{i:05d}" for i in range(start, project_count)]
+
+    def _insert(conn):
+        conn.executemany(
+            "INSERT INTO projects (project_id, project_name, status) VALUES (?, ?, 'Active')",
+            [(pid, f"Project {pid}") for pid in project_ids]
+        )
+        conn.executemany(
+            "INSERT INTO issue_tracking (project_id, issue_number, issue_title, status) VALUES (?, ?, ?, 'Open')",
+            [(pid, f"{pid}-{n}", "issue") for pid in project_ids for n in range(ISSUES_PER_PROJECT)]
+        )
+        conn.executemany(
+            "INSERT INTO pending_items (project_id, task_date, description, status) VALUES (?, ?, ?, '待處理')",
+            [(pid, date.today(), "pending") for pid in project_ids for _ in range(PENDING_PER_PROJECT)]
+        )
+
+    get_writer().execute(_insert)
+    WBSService().bulk_create_wbs([
+        {'project_id': pid, 'wbs_id': str(n), 'task_name': 'task',
+         'status': '已完成' if n % 3 == 0 else '進行中'}
+        for pid in project_ids for n in range(WBS_PER_PROJECT)
+    ])
+
+
+def best_of(func) -> float:
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    sizes = sorted(int(arg) for arg in sys.argv[1:]) or [10, 100, 500, 1000]
+
+    tmp_dir = tempfile.mkdtemp()
+    os.environ["DATABASE_PATH"] = os.path.join(tmp_dir, "bench.db")
+
+    from backend.init_db import create_database_schema
+    from backend.services.project_service import ProjectService
+
+    create_database_schema()
+    service = ProjectService()
+
+    def per_project_lookups(limit: int):
+        conn = service._get_connection()
+        rows = conn.execute(
+            "SELECT * FROM projects ORDER BY created_at DESC LIMIT ? OFFSET 0", (limit,)
+        ).fetchall()
+        conn.close()
+
+        projects = []
+        for row in rows:
+            conn = service._get_connection()
+            project = dict(conn.execute(
+                "SELECT * FROM projects WHERE project_id = ?", (row['project_id'],)
+            ).fetchone())
+            project['wbs'] = conn.execute("""
+                SELECT COUNT(*), SUM(CASE WHEN status = '已完成' THEN 1 ELSE 0 END),
+                       SUM(CASE WHEN status = '進行中' THEN 1 ELSE 0 END)
+                FROM tracking_items WHERE project_id = ? AND item_type = 'WBS'
+            """, (row['project_id'],)).fetchone()
+            project['issues'] = conn.execute(
+                "SELECT COUNT(*) FROM issue_tracking WHERE project_id = ?", (row['project_id'],)
+            ).fetchone()
+            project['pending'] = conn.execute(
+                "SELECT COUNT(*) FROM pending_items WHERE project_id = ?", (row['project_id'],)
+            ).fetchone()
+            conn.close()
+            projects.append(project)
+        return projects
+
+    print("=" * 66)
+    print("Project list benchmark (page size = all projects)")
+    print("=" * 66)
+    print(f"   {'projects':>8}  {'project_stats':>14}  {'N+1 lookups':>20}  {'speedup':>8}")
+
+    seeded = 0
+    for size in sizes:
+        seed(size, seeded)
+        seeded = size
+
+        stats = best_of(lambda: service.get_project_list(limit=size))
+        lookups = best_of(lambda: per_project_lookups(size))
+
+        print(f"   {size:>8,}  {stats * 1000:>11.1f} ms  {lookups * 1000:>17.1f} ms  {lookups / stats:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
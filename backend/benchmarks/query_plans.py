@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Check: no service query falls back to a full table scan
+
+Drives the API against a small seeded database, records every statement
+the services execute (with its parameters still bound, as in production),
+and runs EXPLAIN QUERY PLAN on each. A plain "SCAN <table>" of one of the
+item tables fails the check; walking an index in order ("SCAN ... USING
+INDEX") is fine.
+
+Usage:
+    python -m backend.benchmarks.query_plans [-v]
+
+backend/tests/test_query_plans.py runs the same check under pytest.
+
+Exits with status 1 if any statement scans a checked table. Runs against a
+throwaway database, never the configured one.
+"""
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+from datetime import date, timedelta
+
+# Tables that grow with usage; small lookup tables may be scanned
+CHECKED_TABLES = {
+    "tracking_items", "item_dependencies", "schedule_changes", "pending_items",
+    "issue_tracking", "issue_status_history", "pending_replies", "notifications",
+}
+
+# Statements that read whole tables on purpose
+ALLOWED_SCANS = [
+    # Whole-table aggregates used when rebuilding or checking materialized stats
+    re.compile(r"FROM \w+ AS t\s+WHERE .*GROUP BY 1, 3", re.S),
+]
+
+_SCAN = re.compile(r"^SCAN (\w+)(?! USING)")
+_ALIAS = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+AS)?\s+(\w+)", re.I)
+
+
+def scanned_tables(sql: str, plan) -> list:
+    """Plan steps that scan a checked table (by name or by its alias in sql)"""
+    aliases = {alias: table for table, alias in _ALIAS.findall(sql)}
+    return [
+        step for step in plan
+        if (m := _SCAN.match(step)) and aliases.get(m.group(1), m.group(1)) in CHECKED_TABLES
+    ]
+
+
+class RecordingCursor(sqlite3.Cursor):
+    """Cursor that remembers every statement and its parameters"""
+
+    statements = {}
+
+    def execute(self, sql, parameters=()):
+        self.statements.setdefault(" ".join(sql.split()), (sql, parameters))
+        return super().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        seq_of_parameters = list(seq_of_parameters)
+        if seq_of_parameters:
+            self.statements.setdefault(" ".join(sql.split()), (sql, seq_of_parameters[0]))
+        return super().executemany(sql, seq_of_parameters)
+
+
+def record_statements():
+    """Route pooled and writer connections through RecordingCursor"""
+    from backend.db_pool import PooledConnection
+    from backend.db_writer import WriterConnection
+
+    for cls in (PooledConnection, WriterConnection):
+        cls.cursor = lambda self, factory=RecordingCursor: sqlite3.Connection.cursor(self, factory)
+
+
+def exercise_api():
+    """Call the read and write endpoints the frontend uses"""
+    from fastapi.testclient import TestClient
+    from backend.main import app
+
+    client = TestClient(app)
+    today = date.today()
+
+    def call(method, url, expected=(200, 201, 204), **kwargs):
+        response = client.request(method, url, **kwargs)
+        assert response.status_code in expected, (method, url, response.status_code, response.text[:300])
+        return response.json() if response.content and "json" in response.headers.get("content-type", "") else None
+
+    call("POST", "/api/projects/", json={"project_id": "QP", "project_name": "Query plans"})
+    for wbs_id in ["1", "1.1", "1.2", "2", "2.1"]:
+        call("POST", "/api/wbs/", json={
+            "project_id": "QP", "wbs_id": wbs_id, "task_name": f"Task {wbs_id}",
+            "parent_id": wbs_id.rsplit(".", 1)[0] if "." in wbs_id else None,
+            "original_planned_start": str(today - timedelta(days=5)),
+            "original_planned_end": str(today + timedelta(days=5)),
+        })
+    call("PUT", "/api/wbs/QP_1.1", json={"status": "進行中", "actual_progress": 30})
+    dependency = call("POST", "/api/dependencies/", json={"predecessor_id": "QP_1.1", "successor_id": "QP_1.2"})
+    call("POST", "/api/dependencies/", json={"predecessor_id": "QP_1.2", "successor_id": "QP_2"})
+
+    issue = call("POST", "/api/issues/", json={
+        "project_id": "QP", "issue_title": "Issue", "reported_by": "check", "severity": "High",
+        "issue_type": "技術問題", "issue_category": "風險", "priority": "High",
+        "target_resolution_date": str(today + timedelta(days=2)),
+    })
+    call("PUT", f"/api/issues/{issue['issue_id']}", json={"status": "In Progress"})
+    call("PUT", f"/api/issues/{issue['issue_id']}/escalate", json={"escalation_level": "PM", "escalation_reason": "late", "changed_by": "check"})
+    pending = call("POST", "/api/pending/", json={
+        "project_id": "QP", "task_date": str(today), "source_type": "客戶", "description": "Pending",
+        "expected_completion_date": str(today + timedelta(days=1)),
+    })
+    call("POST", f"/api/pending/{pending['pending_id']}/replies", json={"reply_content": "ok", "replied_by": "check"})
+
+    for url, params in [
+        ("/api/projects/", {}), ("/api/projects/QP", {}), ("/api/projects/QP/stats", {}),
+        ("/api/wbs/", {}), ("/api/wbs/", {"project_id": "QP"}), ("/api/wbs/", {"project_id": "QP", "status": "進行中"}),
+        ("/api/wbs/QP_1", {}), ("/api/wbs/QP_1/children", {}), ("/api/wbs/tree/QP", {}),
+        ("/api/wbs/tree/QP", {"root_id": "1", "depth": 2}),
+        ("/api/dependencies/", {}), ("/api/dependencies/", {"project_id": "QP"}),
+        ("/api/dependencies/", {"item_id": "QP_1.2"}), (f"/api/dependencies/{dependency['dependency_id']}", {}),
+        ("/api/dependencies/project/QP/critical-path", {}),
+        ("/api/dependencies/item/QP_1.1/successors", {}), ("/api/dependencies/item/QP_1.2/predecessors", {}),
+        ("/api/issues/", {}), ("/api/issues/", {"project_id": "QP"}), ("/api/issues/", {"project_id": "QP", "status": "Open"}),
+        ("/api/issues/stats", {}), ("/api/issues/stats", {"project_id": "QP"}),
+        (f"/api/issues/{issue['issue_id']}", {}), (f"/api/issues/{issue['issue_id']}/history", {}),
+        ("/api/pending/", {}), ("/api/pending/", {"project_id": "QP"}), ("/api/pending/stats", {"project_id": "QP"}),
+        ("/api/pending/overdue", {}), ("/api/pending/overdue", {"project_id": "QP"}),
+        (f"/api/pending/{pending['pending_id']}/with-replies", {}),
+        ("/api/dashboard/summary", {}), ("/api/dashboard/summary", {"project_id": "QP"}),
+        ("/api/excel/export/wbs/QP", {}), ("/api/excel/export/pending/QP", {}), ("/api/excel/export/issues/QP", {}),
+    ]:
+        call("GET", url, params=params)
+
+    # Cursor pages
+    for url in ["/api/wbs/", "/api/issues/", "/api/pending/", "/api/dependencies/", "/api/projects/"]:
+        for params in [{}, {"project_id": "QP"}] if url != "/api/projects/" else [{}]:
+            first = call("GET", url, params={**params, "limit": 1})
+            if first["next_cursor"]:
+                call("GET", url, params={**params, "limit": 1, "cursor": first["next_cursor"]})
+
+    call("POST", "/api/dependencies/item/QP_1.1/analyze-impact", json={
+        "field": "revised_planned_end", "old_value": str(today), "new_value": str(today + timedelta(days=3)),
+    })
+    call("POST", "/api/dependencies/item/QP_1.1/apply-impact", json={
+        "field": "revised_planned_end", "new_value": str(today + timedelta(days=3)),
+    })
+    call("PUT", f"/api/issues/{issue['issue_id']}/resolve", json={"resolution": "done", "resolved_by": "check"})
+    call("PUT", f"/api/pending/{pending['pending_id']}/reply")
+    call("DELETE", f"/api/dependencies/{dependency['dependency_id']}")
+    call("DELETE", "/api/wbs/QP_2.1")
+    call("DELETE", f"/api/issues/{issue['issue_id']}")
+    call("DELETE", f"/api/pending/{pending['pending_id']}")
+
+
+def find_full_scans(verbose: bool = False) -> list:
+    """(statement, scan steps) for each recorded statement that scans a
+    checked table; call after record_statements() and exercise_api()"""
+    from backend.config import settings
+
+    conn = sqlite3.connect(str(settings.database_path))
+    failures = []
+    for statement, (sql, params) in sorted(RecordingCursor.statements.items()):
+        if not statement.upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH", "INSERT")):
+            continue
+        plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+        scans = scanned_tables(sql, plan)
+        if scans and not any(p.search(sql) for p in ALLOWED_SCANS):
+            failures.append((statement, scans))
+        if verbose:
+            print(statement[:120])
+            for step in plan:
+                print(f"    {step}")
+    conn.close()
+    return failures
+
+
+def main():
+    verbose = "-v" in sys.argv[1:]
+
+    tmp_dir = tempfile.mkdtemp()
+    os.environ["DATABASE_PATH"] = os.path.join(tmp_dir, "plans.db")
+
+    from backend.init_db import create_database_schema
+    from backend.migrations import add_is_internal_column, update_pending_dates
+
+    create_database_schema()
+    add_is_internal_column.migrate()
+    update_pending_dates.migrate()
+
+    record_statements()
+    exercise_api()
+    failures = find_full_scans(verbose)
+
+    print("=" * 66)
+    print(f"Query plan check ({len(RecordingCursor.statements)} distinct statements)")
+    print("=" * 66)
+    for statement, scans in failures:
+        print(f"✗ {statement[:200]}")
+        for step in scans:
+            print(f"    {step}")
+    if failures:
+        print(f"\n❌ {len(failures)} statement(s) scan a whole table")
+        sys.exit(1)
+    print("✅ Every statement uses an index")
+
+
+if __name__ == "__main__":
+    main()
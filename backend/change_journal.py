@@ -0,0 +1,217 @@
+"""
+Row-level change journal for point-in-time recovery
+
+Triggers on the journaled tables append every inserted, updated or deleted
+row to ``change_journal``: the table, the row's primary key and, unless it
+was deleted, the whole row as JSON. Times are local ISO timestamps to the
+millisecond, like the backup catalog's.
+
+Entries written by one write job share a txn_id, the change_id of the job's
+first entry, stamped by a hook on the write queue (see backend.db_writer),
+so a restore replays whole jobs only; entries written outside the write
+queue count as a job each.
+
+A backup contains the journal up to its snapshot, so the journal of a later
+database holds what happened after it: replaying those entries on top of the
+backup, up to a given time, recovers the four tables as they were then.
+Other tables stay as they are in the backup.
+"""
+import json
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from backend.db_writer import add_job_hook
+
+# Journaled table -> primary key column
+JOURNALED_TABLES: Dict[str, str] = {
+    "tracking_items": "item_id",
+    "item_dependencies": "dependency_id",
+    "issue_tracking": "issue_id",
+    "pending_items": "pending_id",
+}
+
+_NOW = "strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')"
+
+_MAX_ID = 2 ** 63 - 1
+
+
+def journal_time(moment: datetime) -> str:
+    """A time as the journal records it (local, to the millisecond)"""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    return moment.isoformat(timespec='milliseconds')
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def _add_txn_id(conn: sqlite3.Connection):
+    """Journals created before entries carried a txn_id lack the column"""
+    if "txn_id" not in _columns(conn, "change_journal"):
+        conn.execute("ALTER TABLE change_journal ADD COLUMN txn_id INTEGER")
+
+
+def _journal_triggers(conn: sqlite3.Connection) -> Dict[str, str]:
+    """CREATE TRIGGER statement for each trigger name"""
+    triggers = {}
+    for table, key in JOURNALED_TABLES.items():
+        columns = _columns(conn, table)
+        if not columns:
+            continue
+        row = "json_object(" + ", ".join(f"'{col}', NEW.{col}" for col in columns) + ")"
+        for operation, event, ref, data in (
+            ("INSERT", "AFTER INSERT", "NEW", row),
+            ("UPDATE", "AFTER UPDATE", "NEW", row),
+            ("DELETE", "AFTER DELETE", "OLD", "NULL"),
+        ):
+            name = f"trg_change_journal_{table}_{operation.lower()}"
+            triggers[name] = (
+                f"CREATE TRIGGER {name} {event} ON {table}\nBEGIN\n"
+                "    INSERT INTO change_journal (changed_at, table_name, operation, row_key, row_data)\n"
+                f"    VALUES ({_NOW}, '{table}', '{operation}', {ref}.{key}, {data});\nEND"
+            )
+    return triggers
+
+
+def create_change_journal(conn: sqlite3.Connection):
+    """Create the journal table and (re)create its triggers. The caller commits.
+
+    Call after migrations that add columns, so the triggers record them.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS change_journal (
+            change_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            changed_at TEXT NOT NULL,
+            table_name TEXT NOT NULL,
+            operation TEXT NOT NULL,
+            row_key TEXT,
+            row_data TEXT,
+            txn_id INTEGER
+        )
+    """)
+    _add_txn_id(conn)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_change_journal_changed ON change_journal(changed_at)")
+
+    wanted = _journal_triggers(conn)
+    current = dict(conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_change_journal_%'"
+    ).fetchall())
+    if current == wanted:
+        return
+
+    for name in current:
+        conn.execute(f"DROP TRIGGER {name}")
+    for sql in wanted.values():
+        conn.execute(sql)
+
+
+def journal_position(conn: sqlite3.Connection) -> Optional[Tuple[int, Optional[str]]]:
+    """(change_id, changed_at) of the last entry, (0, None) for an empty
+    journal, or None for a database without one"""
+    try:
+        row = conn.execute(
+            "SELECT change_id, changed_at FROM change_journal ORDER BY change_id DESC LIMIT 1"
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return (row[0], row[1]) if row else (0, None)
+
+
+def follows(conn: sqlite3.Connection, journal_id: int, journal_at: Optional[str]) -> bool:
+    """Whether this database's journal continues from a backup's position
+
+    False if the entries after it were pruned, or if the database went
+    through a point-in-time restore to before it (a different history).
+    """
+    if journal_id:
+        row = conn.execute("SELECT changed_at FROM change_journal WHERE change_id = ?", (journal_id,)).fetchone()
+        return row is not None and row[0] == journal_at
+    first = conn.execute("SELECT MIN(change_id) FROM change_journal").fetchone()[0]
+    return first is None or first == 1
+
+
+def journal_mark(conn: sqlite3.Connection) -> Optional[int]:
+    """Last change_id before a write job (0 if none), or None without a journal"""
+    try:
+        return conn.execute("SELECT COALESCE(MAX(change_id), 0) FROM change_journal").fetchone()[0]
+    except sqlite3.OperationalError:
+        return None
+
+
+def stamp_transaction(conn: sqlite3.Connection, mark: Optional[int]):
+    """Give the entries written after ``mark`` the change_id of the first as
+    txn_id (nothing when there was no journal)"""
+    if mark is None:
+        return
+    conn.execute("""
+        UPDATE change_journal
+        SET txn_id = (SELECT MIN(change_id) FROM change_journal WHERE change_id > :mark)
+        WHERE change_id > :mark
+    """, {"mark": mark})
+
+
+# Point-in-time restores replay a write job's changes together or not at all
+add_job_hook(journal_mark, stamp_transaction)
+
+
+def read_changes(conn: sqlite3.Connection, after_id: int, until: str) -> List[sqlite3.Row]:
+    """Entries after ``after_id`` of the jobs finished by the time ``until``, in order
+
+    A job with any entry after ``until`` is left out whole, so a restore
+    never replays part of one.
+    """
+    cut = conn.execute("""
+        SELECT MIN(COALESCE(txn_id, change_id)) FROM change_journal
+        WHERE change_id > ? AND changed_at > ?
+    """, (after_id, until)).fetchone()[0]
+    return conn.execute("""
+        SELECT change_id, changed_at, table_name, operation, row_key, row_data, txn_id
+        FROM change_journal
+        WHERE change_id > ? AND change_id < ?
+        ORDER BY change_id
+    """, (after_id, _MAX_ID if cut is None else cut)).fetchall()
+
+
+def replay_changes(conn: sqlite3.Connection, changes: List[sqlite3.Row]) -> int:
+    """Apply journal entries to a database and append them to its journal
+
+    Updates go through upserts, so other triggers (statistics, graph
+    revisions) see them as ordinary changes; the journal triggers are
+    dropped meanwhile and the entries copied as they were. The caller
+    commits.
+    """
+    for name, in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_change_journal_%'"
+    ).fetchall():
+        conn.execute(f"DROP TRIGGER {name}")
+
+    columns = {table: set(_columns(conn, table)) for table in JOURNALED_TABLES}
+    for change in changes:
+        table = change[2]
+        key = JOURNALED_TABLES[table]
+        if change[3] == 'DELETE':
+            conn.execute(f"DELETE FROM {table} WHERE {key} = ?", (change[4],))
+            continue
+        row = {col: value for col, value in json.loads(change[5]).items() if col in columns[table]}
+        names = list(row)
+        updates = ", ".join(f"{col} = excluded.{col}" for col in names if col != key)
+        conn.execute(
+            f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})\n"
+            f"ON CONFLICT ({key}) DO UPDATE SET {updates}",
+            [row[col] for col in names]
+        )
+
+    _add_txn_id(conn)
+    conn.executemany("""
+        INSERT INTO change_journal (change_id, changed_at, table_name, operation, row_key, row_data, txn_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, [tuple(change) for change in changes])
+
+    create_change_journal(conn)
+    return len(changes)
+
+
+def prune_journal(conn: sqlite3.Connection, before_id: int) -> int:
+    """Delete entries older than ``before_id``. The caller commits."""
+    return conn.execute("DELETE FROM change_journal WHERE change_id < ?", (before_id,)).rowcount
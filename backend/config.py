@@ -20,10 +20,51 @@ class Settings:
     database_url: str = "sqlite+aiosqlite:///./data/project_tracking.db"
     database_path: Path = Path(os.getenv("DATABASE_PATH", "./data/project_tracking.db"))
 
+    # SQLite Storage Settings
+    sqlite_journal_mode: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    sqlite_synchronous: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    sqlite_cache_size_kb: int = int(os.getenv("SQLITE_CACHE_SIZE_KB", "20000"))
+    sqlite_mmap_size: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    sqlite_busy_timeout_ms: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "30000"))
+
+    # PRAGMAs applied once to every connection (pooled readers and the writer)
+    sqlite_connection_pragmas: dict = {
+        "synchronous": sqlite_synchronous,
+        "cache_size": -sqlite_cache_size_kb,  # negative value = size in KiB
+        "mmap_size": sqlite_mmap_size,
+        "busy_timeout": sqlite_busy_timeout_ms,
+        "temp_store": "MEMORY",
+    }
+
+    # Connection Pool Settings
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "5"))  # seconds to wait for a free connection
+
+    # Worker threads for blocking database calls made from async routes
+    db_executor_workers: int = int(os.getenv("DB_EXECUTOR_WORKERS", str(db_pool_size)))
+
+    # Write Queue Settings
+    db_writer_batch_size: int = int(os.getenv("DB_WRITER_BATCH_SIZE", "64"))  # max jobs per commit
+
+    # Background Job Settings
+    job_workers: int = int(os.getenv("JOB_WORKERS", "2"))  # jobs running at the same time
+    job_retention_days: int = int(os.getenv("JOB_RETENTION_DAYS", "7"))  # finished jobs and their files
+
+    # Dashboard Settings
+    dashboard_cache_max_age: int = int(os.getenv("DASHBOARD_CACHE_MAX_AGE", "10"))  # seconds browsers may reuse the summary
+    dashboard_list_limit: int = int(os.getenv("DASHBOARD_LIST_LIMIT", "5"))  # default items per dashboard list
+
     # Backup Settings
     backup_base_path: Path = Path("./data/backups")
-    backup_daily_retention_days: int = 30
-    backup_weekly_retention_weeks: int = 12
+    backup_daily_retention_days: int = int(os.getenv("BACKUP_DAILY_RETENTION_DAYS", "30"))
+    backup_weekly_retention_weeks: int = int(os.getenv("BACKUP_WEEKLY_RETENTION_WEEKS", "12"))
+    backup_monthly_retention_months: int = int(os.getenv("BACKUP_MONTHLY_RETENTION_MONTHS", "12"))
+    backup_schedule_enabled: bool = os.getenv("BACKUP_SCHEDULE_ENABLED", "true").lower() in ("1", "true", "yes")
+    backup_schedule_time: str = os.getenv("BACKUP_SCHEDULE_TIME", "02:00")  # daily, local time
+    backup_pages_per_step: int = int(os.getenv("BACKUP_PAGES_PER_STEP", "1024"))  # pages copied per backup step
+    backup_chunk_pages: int = int(os.getenv("BACKUP_CHUNK_PAGES", "16"))  # pages per deduplicated backup chunk
+    backup_compression: str = os.getenv("BACKUP_COMPRESSION", "gzip")  # none / gzip / zstd (needs zstandard, else gzip)
+    backup_step_sleep: float = float(os.getenv("BACKUP_STEP_SLEEP", "0.01"))  # seconds between steps, leaving room for writers
 
     # Frontend Settings
     frontend_build_path: Path = Path("./frontend/dist")
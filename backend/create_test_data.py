@@ -4,7 +4,15 @@
 """
 import sqlite3
 import os
+import sys
 from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.services.wbs_service import WBSService
 
 def create_test_data():
     # 連接資料庫
@@ -35,90 +43,65 @@ def create_test_data():
 
     wbs_data = [
         # Phase 1: 需求分析 (已完成)
-        ('WBS-001', 'PRJ001', 'WBS-001', None, '需求分析', 'WBS', 'Phase 1',
-         None, None, '王小明', None,
-         (today - timedelta(days=30)).strftime('%Y-%m-%d'),
-         (today - timedelta(days=15)).strftime('%Y-%m-%d'),
-         None, None,
-         (today - timedelta(days=30)).strftime('%Y-%m-%d'),
-         (today - timedelta(days=15)).strftime('%Y-%m-%d'),
-         15, 100, 100, 0, '已完成', 0, None, None, None, None, None),
+        {'wbs_id': 'WBS-001', 'task_name': '需求分析', 'category': 'Phase 1', 'owner_unit': '王小明',
+         'original_planned_start': (today - timedelta(days=30)).strftime('%Y-%m-%d'),
+         'original_planned_end': (today - timedelta(days=15)).strftime('%Y-%m-%d'),
+         'actual_start_date': (today - timedelta(days=30)).strftime('%Y-%m-%d'),
+         'actual_end_date': (today - timedelta(days=15)).strftime('%Y-%m-%d'),
+         'work_days': 15, 'actual_progress': 100, 'status': '已完成'},
 
         # Phase 2: 系統設計 (已完成)
-        ('WBS-002', 'PRJ001', 'WBS-002', None, '系統架構設計', 'WBS', 'Phase 2',
-         None, None, '張工程師', None,
-         (today - timedelta(days=14)).strftime('%Y-%m-%d'),
-         (today - timedelta(days=7)).strftime('%Y-%m-%d'),
-         None, None,
-         (today - timedelta(days=14)).strftime('%Y-%m-%d'),
-         (today - timedelta(days=5)).strftime('%Y-%m-%d'),
-         9, 100, 100, 0, '已完成', 0, None, None, None, None, None),
-
-        ('WBS-003', 'PRJ001', 'WBS-003', None, '資料庫設計', 'WBS', 'Phase 2',
-         None, None, '張工程師', None,
-         (today - timedelta(days=10)).strftime('%Y-%m-%d'),
-         (today - timedelta(days=5)).strftime('%Y-%m-%d'),
-         None, None,
-         (today - timedelta(days=10)).strftime('%Y-%m-%d'),
-         (today - timedelta(days=3)).strftime('%Y-%m-%d'),
-         7, 100, 100, 0, '已完成', 0, None, None, None, None, None),
+        {'wbs_id': 'WBS-002', 'task_name': '系統架構設計', 'category': 'Phase 2', 'owner_unit': '張工程師',
+         'original_planned_start': (today - timedelta(days=14)).strftime('%Y-%m-%d'),
+         'original_planned_end': (today - timedelta(days=7)).strftime('%Y-%m-%d'),
+         'actual_start_date': (today - timedelta(days=14)).strftime('%Y-%m-%d'),
+         'actual_end_date': (today - timedelta(days=5)).strftime('%Y-%m-%d'),
+         'work_days': 9, 'actual_progress': 100, 'status': '已完成'},
+
+        {'wbs_id': 'WBS-003', 'task_name': '資料庫設計', 'category': 'Phase 2', 'owner_unit': '張工程師',
+         'original_planned_start': (today - timedelta(days=10)).strftime('%Y-%m-%d'),
+         'original_planned_end': (today - timedelta(days=5)).strftime('%Y-%m-%d'),
+         'actual_start_date': (today - timedelta(days=10)).strftime('%Y-%m-%d'),
+         'actual_end_date': (today - timedelta(days=3)).strftime('%Y-%m-%d'),
+         'work_days': 7, 'actual_progress': 100, 'status': '已完成'},
 
         # Phase 3: 開發中
-        ('WBS-004', 'PRJ001', 'WBS-004', None, '前端開發 - 商品頁面', 'WBS', 'Phase 3',
-         None, None, '陳前端', None,
-         (today - timedelta(days=5)).strftime('%Y-%m-%d'),
-         (today + timedelta(days=10)).strftime('%Y-%m-%d'),
-         None, None,
-         (today - timedelta(days=5)).strftime('%Y-%m-%d'),
-         None,
-         None, 60, 50, 10, '進行中', 0, None, None, None, None, None),
-
-        ('WBS-005', 'PRJ001', 'WBS-005', None, '後端開發 - API 實作', 'WBS', 'Phase 3',
-         None, None, '林後端', None,
-         (today - timedelta(days=3)).strftime('%Y-%m-%d'),
-         (today + timedelta(days=12)).strftime('%Y-%m-%d'),
-         None, (today + timedelta(days=15)).strftime('%Y-%m-%d'),
-         (today - timedelta(days=3)).strftime('%Y-%m-%d'),
-         None,
-         None, 45, 30, 15, '進行中', 0, None, None, None, None, None),
-
-        ('WBS-006', 'PRJ001', 'WBS-006', None, '金流整合', 'WBS', 'Phase 3',
-         None, None, '林後端', None,
-         (today + timedelta(days=5)).strftime('%Y-%m-%d'),
-         (today + timedelta(days=20)).strftime('%Y-%m-%d'),
-         None, None,
-         None, None,
-         None, 0, 0, 0, '未開始', 0, None, None, None, None, None),
+        {'wbs_id': 'WBS-004', 'task_name': '前端開發 - 商品頁面', 'category': 'Phase 3', 'owner_unit': '陳前端',
+         'original_planned_start': (today - timedelta(days=5)).strftime('%Y-%m-%d'),
+         'original_planned_end': (today + timedelta(days=10)).strftime('%Y-%m-%d'),
+         'actual_start_date': (today - timedelta(days=5)).strftime('%Y-%m-%d'),
+         'actual_progress': 60, 'status': '進行中'},
+
+        {'wbs_id': 'WBS-005', 'task_name': '後端開發 - API 實作', 'category': 'Phase 3', 'owner_unit': '林後端',
+         'original_planned_start': (today - timedelta(days=3)).strftime('%Y-%m-%d'),
+         'original_planned_end': (today + timedelta(days=12)).strftime('%Y-%m-%d'),
+         'revised_planned_end': (today + timedelta(days=15)).strftime('%Y-%m-%d'),
+         'actual_start_date': (today - timedelta(days=3)).strftime('%Y-%m-%d'),
+         'actual_progress': 45, 'status': '進行中'},
+
+        {'wbs_id': 'WBS-006', 'task_name': '金流整合', 'category': 'Phase 3', 'owner_unit': '林後端',
+         'original_planned_start': (today + timedelta(days=5)).strftime('%Y-%m-%d'),
+         'original_planned_end': (today + timedelta(days=20)).strftime('%Y-%m-%d'),
+         'actual_progress': 0, 'status': '未開始'},
 
         # Phase 4: 測試
-        ('WBS-007', 'PRJ001', 'WBS-007', None, '單元測試', 'WBS', 'Phase 4',
-         None, None, '測試團隊', None,
-         (today + timedelta(days=15)).strftime('%Y-%m-%d'),
-         (today + timedelta(days=25)).strftime('%Y-%m-%d'),
-         None, None,
-         None, None,
-         None, 0, 0, 0, '未開始', 0, None, None, None, None, None),
-
-        ('WBS-008', 'PRJ001', 'WBS-008', None, '整合測試', 'WBS', 'Phase 4',
-         None, None, '測試團隊', None,
-         (today + timedelta(days=26)).strftime('%Y-%m-%d'),
-         (today + timedelta(days=35)).strftime('%Y-%m-%d'),
-         None, None,
-         None, None,
-         None, 0, 0, 0, '未開始', 0, None, None, None, None, None),
+        {'wbs_id': 'WBS-007', 'task_name': '單元測試', 'category': 'Phase 4', 'owner_unit': '測試團隊',
+         'original_planned_start': (today + timedelta(days=15)).strftime('%Y-%m-%d'),
+         'original_planned_end': (today + timedelta(days=25)).strftime('%Y-%m-%d'),
+         'actual_progress': 0, 'status': '未開始'},
+
+        {'wbs_id': 'WBS-008', 'task_name': '整合測試', 'category': 'Phase 4', 'owner_unit': '測試團隊',
+         'original_planned_start': (today + timedelta(days=26)).strftime('%Y-%m-%d'),
+         'original_planned_end': (today + timedelta(days=35)).strftime('%Y-%m-%d'),
+         'actual_progress': 0, 'status': '未開始'},
     ]
 
-    cursor.executemany("""
-        INSERT OR REPLACE INTO tracking_items
-        (item_id, project_id, wbs_id, parent_id, task_name, item_type, category,
-         owner_unit, owner_type, primary_owner, secondary_owner,
-         original_planned_start, original_planned_end,
-         revised_planned_start, revised_planned_end,
-         actual_start_date, actual_end_date, work_days,
-         actual_progress, estimated_progress, progress_variance,
-         status, is_overdue, notes, alert_flag, source, source_date, source_reference)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, wbs_data)
+    # 與 API 相同的 upsert（含 wbs_sort_key），讓 project_stats 統計保持正確
+    wbs_service = WBSService()
+    cursor.executemany(
+        WBSService._INSERT_SQL,
+        [wbs_service._insert_params({**item, 'project_id': 'PRJ001'}) for item in wbs_data]
+    )
 
     # 3. 建立待辦事項
     print("3. 建立待辦事項...")
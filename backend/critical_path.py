@@ -0,0 +1,133 @@
+"""
+Critical path method (CPM) over a project's dependency graph
+
+Items are scheduled in whole days counted from the earliest planned date of
+the project. A forward pass in topological order gives each item its early
+start/finish, a backward pass its late start/finish; total float is the gap
+between the two and items without float form the critical path. Both passes
+visit every item and dependency once.
+
+Dependency types, for predecessor P and successor S with lag L:
+
+    FS  S starts after P finishes + L      SS  S starts after P starts + L
+    FF  S finishes after P finishes + L    SF  S finishes after P starts + L
+
+An item's planned start is treated as "start no earlier than". Items without
+dates take no time. Items on a dependency cycle can't be scheduled and are
+reported separately.
+
+Results are kept with the cached graph (see get_dependency_graph), so they
+are reused until one of the projects the graph touches changes.
+"""
+import sqlite3
+from datetime import date, timedelta
+from typing import List
+
+from backend.dependency_graph import DependencyGraph, get_dependency_graph
+
+
+class CriticalPath:
+    """Early/late dates and float of every schedulable item of a graph
+
+    Times are day offsets from ``origin``; finishes are exclusive (an item
+    of one day starting at 0 finishes at 1).
+    """
+
+    def __init__(self, graph: DependencyGraph):
+        self.graph = graph
+        items = graph.items
+        count = len(items)
+
+        dated = [d for item in items for d in (item.start, item.end) if d]
+        self.origin: date = min(dated) if dated else date.today()
+
+        self.duration = [0] * count
+        planned = [0] * count
+        for i, item in enumerate(items):
+            if item.start and item.end and item.end >= item.start:
+                self.duration[i] = (item.end - item.start).days + 1
+            anchor = item.start or item.end
+            if anchor:
+                planned[i] = (anchor - self.origin).days
+
+        self.order, self.blocked = graph.topological_order()
+        self.scheduled = scheduled = set(self.order)
+        duration = self.duration
+
+        # Forward pass
+        self.early_start = [0] * count
+        self.early_finish = [0] * count
+        for i in self.order:
+            es = planned[i]
+            for e in graph.in_edges[i]:
+                edge = graph.edges[e]
+                p = edge.predecessor
+                if p not in scheduled:
+                    continue
+                kind, lag = edge.dependency_type, edge.lag_days
+                if kind == 'SS':
+                    bound = self.early_start[p] + lag
+                elif kind == 'FF':
+                    bound = self.early_finish[p] + lag - duration[i]
+                elif kind == 'SF':
+                    bound = self.early_start[p] + lag - duration[i]
+                else:
+                    bound = self.early_finish[p] + lag
+                if bound > es:
+                    es = bound
+            self.early_start[i] = es
+            self.early_finish[i] = es + duration[i]
+
+        self.finish = max((self.early_finish[i] for i in self.order), default=0)
+
+        # Backward pass
+        self.late_start = [0] * count
+        self.late_finish = [0] * count
+        for i in reversed(self.order):
+            lf = self.finish
+            for e in graph.out_edges[i]:
+                edge = graph.edges[e]
+                s = edge.successor
+                if s not in scheduled:
+                    continue
+                kind, lag = edge.dependency_type, edge.lag_days
+                if kind == 'SS':
+                    bound = self.late_start[s] - lag + duration[i]
+                elif kind == 'FF':
+                    bound = self.late_finish[s] - lag
+                elif kind == 'SF':
+                    bound = self.late_finish[s] - lag + duration[i]
+                else:
+                    bound = self.late_start[s] - lag
+                if bound < lf:
+                    lf = bound
+            self.late_finish[i] = lf
+            self.late_start[i] = lf - duration[i]
+
+    def total_float(self, i: int) -> int:
+        return self.late_start[i] - self.early_start[i]
+
+    def is_critical(self, i: int) -> bool:
+        return i in self.scheduled and self.total_float(i) <= 0
+
+    def critical_path(self) -> List[int]:
+        """Items without float, by early start"""
+        position = {node: n for n, node in enumerate(self.order)}
+        critical = [i for i in self.order if self.total_float(i) <= 0]
+        return sorted(critical, key=lambda i: (self.early_start[i], position[i]))
+
+    def start_date(self, offset: int) -> date:
+        return self.origin + timedelta(days=offset)
+
+    def finish_date(self, i: int, finish: int) -> date:
+        """Last day of an item finishing at offset ``finish`` (its start for milestones)"""
+        return self.origin + timedelta(days=finish - 1 if self.duration[i] else finish)
+
+
+def get_critical_path(conn: sqlite3.Connection, project_id: str) -> CriticalPath:
+    """CPM result of a project, computed again only when its graph changed"""
+    graph = get_dependency_graph(conn, project_id)
+    result = graph.cache.get('critical_path')
+    if result is None:
+        result = graph.cache['critical_path'] = CriticalPath(graph)
+    return result
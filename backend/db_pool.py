@@ -0,0 +1,227 @@
+"""
+Process-wide SQLite connection pool shared by all backend services
+"""
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+from backend.config import settings
+
+
+def apply_connection_pragmas(conn: sqlite3.Connection):
+    """Apply the configured per-connection PRAGMAs"""
+    for pragma, value in settings.sqlite_connection_pragmas.items():
+        conn.execute(f"PRAGMA {pragma} = {value}")
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() hands it back to the pool
+
+    Services keep their existing ``conn = self._get_connection() ... conn.close()``
+    pattern; closing a pooled connection only returns it for reuse.
+    """
+
+    _pool: Optional["ConnectionPool"] = None
+    _checked_out: bool = False
+
+    def close(self):
+        """Return connection to its pool (or really close it if unpooled)"""
+        if self._pool is not None:
+            self._pool.release(self)
+        else:
+            super().close()
+
+    def _close(self):
+        """Really close the underlying SQLite handle"""
+        super().close()
+
+    def __del__(self):
+        # A connection dropped without close() (e.g. an exception mid-method)
+        # must still give its slot back to the pool
+        if self._checked_out and self._pool is not None:
+            self._pool._forget(self)
+
+
+class ConnectionPool:
+    """Thread-safe, fixed-size pool of SQLite connections
+
+    Connections are created lazily up to ``size``. When all of them are checked
+    out, callers wait up to ``timeout`` seconds; after that an overflow
+    connection is opened so nested checkouts can never deadlock the pool.
+    """
+
+    def __init__(self, db_path: str, size: int = 5, timeout: float = 5.0):
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+
+        self._idle = deque()
+        self._created = 0
+        self._in_use = 0
+        self._closed_generation = 0
+        self._cond = threading.Condition(threading.Lock())
+
+        # Metrics
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._overflows = 0
+
+    def _create_connection(self, overflow: bool = False) -> PooledConnection:
+        """Open a new connection and apply per-connection PRAGMAs once"""
+        conn = sqlite3.connect(
+            self.db_path,
+            factory=PooledConnection,
+            check_same_thread=False,
+        )
+        conn.row_factory = sqlite3.Row
+        apply_connection_pragmas(conn)
+        conn._pool = self
+        conn._overflow = overflow
+        conn._generation = self._closed_generation
+        return conn
+
+    def acquire(self) -> PooledConnection:
+        """Check out a connection, waiting for a free one if necessary"""
+        started = None
+        overflow = False
+
+        with self._cond:
+            while True:
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+
+                conn = None
+                if self._created < self.size:
+                    self._created += 1
+                    break
+
+                if started is None:
+                    started = time.perf_counter()
+                    self._waits += 1
+
+                remaining = self.timeout - (time.perf_counter() - started)
+                if remaining <= 0:
+                    overflow = True
+                    self._overflows += 1
+                    break
+                self._cond.wait(remaining)
+
+            self._in_use += 1
+            self._checkouts += 1
+
+            if started is not None:
+                waited = time.perf_counter() - started
+                self._wait_time += waited
+                self._max_wait_time = max(self._max_wait_time, waited)
+
+        if conn is None:
+            try:
+                conn = self._create_connection(overflow=overflow)
+            except Exception:
+                with self._cond:
+                    self._in_use -= 1
+                    if not overflow:
+                        self._created -= 1
+                    self._cond.notify()
+                raise
+
+        conn._checked_out = True
+        return conn
+
+    def release(self, conn: PooledConnection):
+        """Return a connection to the pool, rolling back any open transaction"""
+        if not conn._checked_out:
+            return
+        conn._checked_out = False
+
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            healthy = True
+        except sqlite3.Error:
+            healthy = False
+
+        with self._cond:
+            self._in_use -= 1
+            stale = conn._generation != self._closed_generation
+            if conn._overflow or stale or not healthy:
+                if not conn._overflow and not stale:
+                    self._created -= 1
+                conn._close()
+            else:
+                self._idle.append(conn)
+            self._cond.notify()
+
+    def _forget(self, conn: PooledConnection):
+        """Drop the bookkeeping for a connection that was never released"""
+        conn._checked_out = False
+        with self._cond:
+            self._in_use -= 1
+            if not conn._overflow and conn._generation == self._closed_generation:
+                self._created -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """Context manager that checks out and returns a connection"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def close_all(self):
+        """Close idle connections; checked-out ones are closed when released"""
+        with self._cond:
+            while self._idle:
+                self._idle.pop()._close()
+            self._closed_generation += 1
+            self._created = 0
+            self._cond.notify_all()
+
+    def get_stats(self) -> Dict:
+        """Get checkout/wait metrics"""
+        with self._cond:
+            return {
+                "size": self.size,
+                "created": self._created,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "total_wait_ms": round(self._wait_time * 1000, 3),
+                "max_wait_ms": round(self._max_wait_time * 1000, 3),
+                "overflows": self._overflows,
+            }
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: Optional[str] = None) -> ConnectionPool:
+    """Get the shared pool for a database file (created on first use)"""
+    db_path = str(db_path or settings.database_path)
+
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None:
+            pool = ConnectionPool(
+                db_path,
+                size=settings.db_pool_size,
+                timeout=settings.db_pool_timeout,
+            )
+            _pools[db_path] = pool
+        return pool
+
+
+def close_all_pools():
+    """Close every pool (used on shutdown and before restores)"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close_all()
@@ -0,0 +1,229 @@
+"""
+Single-writer queue for the SQLite store
+
+All writes are funnelled through one background thread that owns the only
+write connection. Jobs queued while a transaction is running are committed
+together (group commit), so N concurrent writes cost one fsync instead of N.
+Readers use the connection pool and, with WAL enabled, never wait on writes.
+"""
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from backend.config import settings
+from backend.db_pool import apply_connection_pragmas
+
+
+class WriterConnection(sqlite3.Connection):
+    """Write connection whose commit/rollback are owned by the queue
+
+    Write jobs run inside a batch transaction, so a job calling commit()
+    must not end the batch early.
+    """
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+_STOP = object()
+
+# (before, after) callbacks run around every write job
+_job_hooks: List[Tuple[Callable, Callable]] = []
+
+
+def add_job_hook(before: Callable[[sqlite3.Connection], Any], after: Callable[[sqlite3.Connection, Any], None]):
+    """Run ``before(conn)`` ahead of every write job and ``after(conn, state)``
+    with what it returned once the job succeeded, both inside its savepoint"""
+    _job_hooks.append((before, after))
+
+
+class WriteQueue:
+    """Background thread that executes write jobs with batched commits"""
+
+    def __init__(self, db_path: str, batch_size: int = 64):
+        self.db_path = db_path
+        self.batch_size = batch_size
+
+        self._queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+        # Metrics
+        self._jobs = 0
+        self._batches = 0
+        self._failed_jobs = 0
+        self._max_batch = 0
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name=f"sqlite-writer:{self.db_path}",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Queue ``fn(conn, *args, **kwargs)`` and return a Future for its result"""
+        future = Future()
+        self._ensure_started()
+        self._queue.put((future, fn, args, kwargs))
+        return future
+
+    def execute(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a write job and wait until it has been committed
+
+        Calls made from inside a running job execute inline on the writer
+        connection, so jobs may compose other write helpers.
+        """
+        if threading.current_thread() is self._thread:
+            return fn(self._conn, *args, **kwargs)
+        return self.submit(fn, *args, **kwargs).result()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Finish queued jobs and stop the writer thread"""
+        with self._lock:
+            thread = self._thread
+            if thread is None or not thread.is_alive():
+                return
+            self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            factory=WriterConnection,
+            check_same_thread=False,
+            isolation_level=None,  # transactions are managed explicitly below
+        )
+        conn.row_factory = sqlite3.Row
+        apply_connection_pragmas(conn)
+        return conn
+
+    def _run(self):
+        try:
+            self._conn = self._connect()
+        except sqlite3.Error as e:
+            # Fail whatever is already queued rather than leaving callers blocked
+            while True:
+                try:
+                    job = self._queue.get_nowait()
+                except queue.Empty:
+                    return
+                if job is not _STOP and job[0].set_running_or_notify_cancel():
+                    job[0].set_exception(e)
+
+        try:
+            while True:
+                job = self._queue.get()
+                if job is _STOP:
+                    break
+
+                batch = [job]
+                stop_after = False
+                while len(batch) < self.batch_size:
+                    try:
+                        job = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if job is _STOP:
+                        stop_after = True
+                        break
+                    batch.append(job)
+
+                self._run_batch(batch)
+
+                if stop_after:
+                    break
+        finally:
+            self._conn.close()
+            self._conn = None
+
+    def _run_batch(self, batch):
+        """Run jobs in one transaction, isolating each job in a savepoint"""
+        conn = self._conn
+        outcomes = []
+
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.Error as e:
+            for future, _, _, _ in batch:
+                if future.set_running_or_notify_cancel():
+                    future.set_exception(e)
+            return
+
+        for future, fn, args, kwargs in batch:
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            conn.execute("SAVEPOINT write_job")
+            try:
+                states = [(after, before(conn)) for before, after in _job_hooks]
+                result = fn(conn, *args, **kwargs)
+                for after, state in states:
+                    after(conn, state)
+                conn.execute("RELEASE SAVEPOINT write_job")
+                outcomes.append((future, result, None))
+            except BaseException as e:
+                conn.execute("ROLLBACK TO SAVEPOINT write_job")
+                conn.execute("RELEASE SAVEPOINT write_job")
+                outcomes.append((future, None, e))
+
+        try:
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            outcomes = [(future, None, e) for future, _, _ in outcomes]
+
+        self._batches += 1
+        self._max_batch = max(self._max_batch, len(batch))
+
+        for future, result, error in outcomes:
+            self._jobs += 1
+            if error is not None:
+                self._failed_jobs += 1
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def get_stats(self) -> Dict:
+        """Get write queue metrics"""
+        return {
+            "queued": self._queue.qsize(),
+            "jobs": self._jobs,
+            "failed_jobs": self._failed_jobs,
+            "batches": self._batches,
+            "avg_batch": round(self._jobs / self._batches, 2) if self._batches else 0,
+            "max_batch": self._max_batch,
+        }
+
+
+_writers: Dict[str, WriteQueue] = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(db_path: Optional[str] = None) -> WriteQueue:
+    """Get the write queue for a database file (created on first use)"""
+    db_path = str(db_path or settings.database_path)
+
+    with _writers_lock:
+        writer = _writers.get(db_path)
+        if writer is None:
+            writer = WriteQueue(db_path, batch_size=settings.db_writer_batch_size)
+            _writers[db_path] = writer
+        return writer
+
+
+def stop_all_writers():
+    """Stop every writer thread (used on shutdown and before restores)"""
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.stop()
@@ -0,0 +1,427 @@
+"""
+In-memory dependency graph of a project
+
+A project's active item_dependencies and the dates of the items they connect
+are loaded in two queries into adjacency arrays: items and edges are numbered,
+and ``out_edges[i]`` / ``in_edges[i]`` list the edges leaving and entering
+item ``i``. Graph algorithms (impact analysis, scheduling, cycle checks) then
+walk plain Python lists instead of querying the database per edge.
+
+Edges whose other end lies in another project are included together with that
+item, so walks follow them as before.
+
+``graph_revisions`` holds a counter per project that triggers bump whenever
+an item's schedule fields or a dependency touching the project change.
+get_dependency_graph keeps loaded graphs (and results computed from them, in
+``graph.cache``) until the revision of a project they touch changes.
+"""
+import copy
+import json
+import sqlite3
+import threading
+from collections import OrderedDict, deque
+from datetime import date
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+_CACHE_SIZE = 32
+
+
+class GraphItem(NamedTuple):
+    """Tracking item fields used by the graph algorithms"""
+    item_id: str
+    project_id: Optional[str]
+    wbs_id: Optional[str]
+    task_name: Optional[str]
+    status: Optional[str]
+    start: Optional[date]
+    end: Optional[date]
+
+
+class Edge(NamedTuple):
+    """Active dependency between two item indexes"""
+    dependency_id: int
+    predecessor: int
+    successor: int
+    dependency_type: str
+    lag_days: int
+    impact_level: Optional[str]
+
+
+def parse_date(value) -> Optional[date]:
+    """Date stored as 'YYYY-MM-DD' (or None when missing or malformed)"""
+    if not value:
+        return None
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+class DependencyGraph:
+    """Items and active dependencies as adjacency arrays"""
+
+    def __init__(self, items: List[GraphItem], edges: List[Tuple]):
+        self.items = items
+        self.index: Dict[str, int] = {item.item_id: i for i, item in enumerate(items)}
+        self.edges: List[Edge] = []
+        self.out_edges: List[List[int]] = [[] for _ in items]
+        self.in_edges: List[List[int]] = [[] for _ in items]
+        # Dependency IDs whose predecessor or successor no longer exists
+        self.dangling: List[int] = []
+        # Results computed from this graph, kept as long as the graph is cached
+        self.cache: Dict[str, Any] = {}
+
+        for dependency_id, predecessor_id, successor_id, dependency_type, lag_days, impact_level in edges:
+            predecessor = self.index.get(predecessor_id)
+            successor = self.index.get(successor_id)
+            # Dependencies pointing at deleted items are left out of the graph
+            if predecessor is None or successor is None:
+                self.dangling.append(dependency_id)
+                continue
+            self.out_edges[predecessor].append(len(self.edges))
+            self.in_edges[successor].append(len(self.edges))
+            self.edges.append(Edge(
+                dependency_id, predecessor, successor,
+                dependency_type or 'FS', lag_days or 0, impact_level
+            ))
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def with_dependency(
+        self, dependency_id: int, predecessor_id: str, successor_id: str,
+        dependency_type: Optional[str], lag_days: Optional[int], impact_level: Optional[str]
+    ) -> "DependencyGraph":
+        """Copy of the graph with one more dependency between two of its items
+
+        Unchanged adjacency lists are shared; this graph is left as it was.
+        """
+        predecessor, successor = self.index[predecessor_id], self.index[successor_id]
+        edge = len(self.edges)
+
+        graph = copy.copy(self)
+        graph.cache = {}
+        graph.edges = self.edges + [Edge(
+            dependency_id, predecessor, successor, dependency_type or 'FS', lag_days or 0, impact_level
+        )]
+        graph.out_edges = list(self.out_edges)
+        graph.out_edges[predecessor] = self.out_edges[predecessor] + [edge]
+        graph.in_edges = list(self.in_edges)
+        graph.in_edges[successor] = self.in_edges[successor] + [edge]
+        return graph
+
+    def reachable(self, source: int) -> List[int]:
+        """Items reachable from source along dependencies, in BFS order (source first)"""
+        seen = {source}
+        order = [source]
+        queue = deque(order)
+        while queue:
+            node = queue.popleft()
+            for e in self.out_edges[node]:
+                successor = self.edges[e].successor
+                if successor not in seen:
+                    seen.add(successor)
+                    order.append(successor)
+                    queue.append(successor)
+        return order
+
+    def find_path(self, source: int, target: int) -> Optional[List[int]]:
+        """Shortest dependency path from source to target (BFS), or None
+
+        Only the part of the graph reachable from source is visited.
+        """
+        parents = {source: None}
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            for e in self.out_edges[node]:
+                successor = self.edges[e].successor
+                if successor == target:
+                    path = [target, node]
+                    while parents[path[-1]] is not None:
+                        path.append(parents[path[-1]])
+                    return path[::-1]
+                if successor not in parents:
+                    parents[successor] = node
+                    queue.append(successor)
+        return None
+
+    def cycles(self) -> List[List[int]]:
+        """One cycle (closed path of items) per group of items depending on each other
+
+        Finds the strongly connected components with Tarjan's algorithm,
+        iteratively, in a single pass over items and dependencies.
+        """
+        index_of: Dict[int, int] = {}
+        low: Dict[int, int] = {}
+        stack: List[int] = []
+        on_stack = set()
+        components = []
+
+        for root in range(len(self.items)):
+            if root in index_of:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, position = work.pop()
+                if position == 0:
+                    index_of[node] = low[node] = len(index_of)
+                    stack.append(node)
+                    on_stack.add(node)
+
+                out = self.out_edges[node]
+                while position < len(out):
+                    successor = self.edges[out[position]].successor
+                    position += 1
+                    if successor not in index_of:
+                        work.append((node, position))
+                        work.append((successor, 0))
+                        break
+                    if successor in on_stack:
+                        low[node] = min(low[node], index_of[successor])
+                else:
+                    if low[node] == index_of[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(component)
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+
+        cycles = []
+        for component in components:
+            start = min(component)
+            if len(component) > 1 or any(self.edges[e].successor == start for e in self.out_edges[start]):
+                # Any item of a component reaches every other one, including itself
+                cycles.append(self.find_path(start, start))
+        return sorted(cycles)
+
+    def topological_order(self, nodes: Optional[List[int]] = None) -> Tuple[List[int], List[int]]:
+        """Kahn's algorithm over nodes (default: all items)
+
+        Returns the items in topological order and, separately, the items
+        that are on or behind a cycle and therefore have no such order.
+        Edges from items outside ``nodes`` are ignored.
+        """
+        if nodes is None:
+            nodes = range(len(self.items))
+        members = set(nodes)
+
+        in_degree = {
+            node: sum(1 for e in self.in_edges[node] if self.edges[e].predecessor in members)
+            for node in nodes
+        }
+        queue = deque(node for node in nodes if in_degree[node] == 0)
+        order = []
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for e in self.out_edges[node]:
+                successor = self.edges[e].successor
+                if successor in members:
+                    in_degree[successor] -= 1
+                    if in_degree[successor] == 0:
+                        queue.append(successor)
+
+        blocked = [node for node in nodes if in_degree[node] > 0]
+        return order, blocked
+
+
+_ITEM_COLUMNS = """
+    item_id, project_id, wbs_id, task_name, status,
+    COALESCE(NULLIF(revised_planned_start, ''), original_planned_start),
+    COALESCE(NULLIF(revised_planned_end, ''), original_planned_end)
+"""
+
+
+def load_dependency_graph(conn: sqlite3.Connection, project_id: str) -> DependencyGraph:
+    """Load a project's items and active dependencies (two queries)"""
+    cursor = conn.cursor()
+
+    # "+d.is_active" keeps SQLite from driving the join with the is_active
+    # index (every project's dependencies) instead of the project's items
+    cursor.execute("""
+        SELECT d.dependency_id, d.predecessor_id, d.successor_id,
+               d.dependency_type, d.lag_days, d.impact_level
+        FROM item_dependencies d
+        JOIN tracking_items p ON p.item_id = d.predecessor_id
+        WHERE p.project_id = ? AND +d.is_active = 1
+        UNION
+        SELECT d.dependency_id, d.predecessor_id, d.successor_id,
+               d.dependency_type, d.lag_days, d.impact_level
+        FROM item_dependencies d
+        JOIN tracking_items s ON s.item_id = d.successor_id
+        WHERE s.project_id = ? AND +d.is_active = 1
+    """, (project_id, project_id))
+    edges = cursor.fetchall()
+
+    # The project's items plus items of other projects at the far end of an edge
+    endpoints = sorted({row[1] for row in edges} | {row[2] for row in edges})
+    cursor.execute(f"""
+        SELECT {_ITEM_COLUMNS} FROM tracking_items WHERE project_id = ?
+        UNION
+        SELECT {_ITEM_COLUMNS} FROM tracking_items
+        WHERE item_id IN (SELECT value FROM json_each(?))
+    """, (project_id, json.dumps(endpoints)))
+    items = [
+        GraphItem(row[0], row[1], row[2], row[3], row[4], parse_date(row[5]), parse_date(row[6]))
+        for row in cursor.fetchall()
+    ]
+
+    return DependencyGraph(items, [tuple(row) for row in edges])
+
+
+# Item columns whose changes alter a graph (or what is computed from it)
+_GRAPH_ITEM_COLUMNS = [
+    "project_id", "wbs_id", "task_name", "status",
+    "original_planned_start", "original_planned_end",
+    "revised_planned_start", "revised_planned_end",
+]
+
+
+def _bump_item(row: str) -> str:
+    return (
+        f"INSERT INTO graph_revisions (project_id, revision) VALUES (COALESCE({row}.project_id, ''), 1)\n"
+        "    ON CONFLICT (project_id) DO UPDATE SET revision = revision + 1;"
+    )
+
+
+def _bump_dependency(*rows: str) -> str:
+    endpoints = ", ".join(f"{row}.{col}" for row in rows for col in ("predecessor_id", "successor_id"))
+    return (
+        "INSERT INTO graph_revisions (project_id, revision)\n"
+        "    SELECT DISTINCT COALESCE(project_id, ''), 1 FROM tracking_items\n"
+        f"    WHERE item_id IN ({endpoints})\n"
+        "    ON CONFLICT (project_id) DO UPDATE SET revision = revision + 1;"
+    )
+
+
+def _revision_triggers() -> Dict[str, str]:
+    """CREATE TRIGGER statement for each trigger name"""
+    statements = {
+        "items_insert": ("AFTER INSERT ON tracking_items", [_bump_item("NEW")]),
+        "items_delete": ("AFTER DELETE ON tracking_items", [_bump_item("OLD")]),
+        "items_update": (
+            f"AFTER UPDATE OF {', '.join(_GRAPH_ITEM_COLUMNS)} ON tracking_items",
+            [_bump_item("OLD"), _bump_item("NEW")],
+        ),
+        "dependencies_insert": ("AFTER INSERT ON item_dependencies", [_bump_dependency("NEW")]),
+        "dependencies_delete": ("AFTER DELETE ON item_dependencies", [_bump_dependency("OLD")]),
+        "dependencies_update": ("AFTER UPDATE ON item_dependencies", [_bump_dependency("OLD", "NEW")]),
+    }
+    triggers = {}
+    for suffix, (event, body) in statements.items():
+        name = f"trg_graph_revisions_{suffix}"
+        triggers[name] = f"CREATE TRIGGER {name} {event}\nBEGIN\n    " + "\n    ".join(body) + "\nEND"
+    return triggers
+
+
+def create_graph_revisions(conn: sqlite3.Connection):
+    """Create the revision table and (re)create its triggers. The caller commits."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS graph_revisions (
+            project_id TEXT PRIMARY KEY,
+            revision INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    """)
+
+    wanted = _revision_triggers()
+    current = dict(conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_graph_revisions_%'"
+    ).fetchall())
+    if current == wanted:
+        return
+
+    for name in current:
+        conn.execute(f"DROP TRIGGER {name}")
+    for sql in wanted.values():
+        conn.execute(sql)
+
+
+def graph_revisions(conn: sqlite3.Connection, project_ids) -> Dict[str, int]:
+    """Current revision of each project (0 if it never changed)"""
+    project_ids = sorted(project_ids)
+    revisions = dict.fromkeys(project_ids, 0)
+    revisions.update(conn.execute(
+        "SELECT project_id, revision FROM graph_revisions WHERE project_id IN (SELECT value FROM json_each(?))",
+        (json.dumps(project_ids),)
+    ).fetchall())
+    return revisions
+
+
+_cache: "OrderedDict[str, Tuple[Dict[str, int], DependencyGraph]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def load_cached_graph(
+    conn: sqlite3.Connection, project_id: str, store: bool = True
+) -> Tuple[Dict[str, int], DependencyGraph]:
+    """A project's graph and the revisions it reflects, loaded again only
+    when a project it touches changed
+
+    Pass ``store=False`` inside a write transaction: a graph loaded there may
+    include changes that are later rolled back, so it must not be cached.
+    """
+    # One read transaction, so the revisions match the graph that is loaded
+    began = not conn.in_transaction
+    if began:
+        conn.execute("BEGIN")
+    try:
+        with _cache_lock:
+            cached = _cache.get(project_id)
+        if cached:
+            revisions, graph = cached
+            if graph_revisions(conn, revisions) == revisions:
+                with _cache_lock:
+                    if project_id in _cache:
+                        _cache.move_to_end(project_id)
+                return revisions, graph
+
+        graph = load_dependency_graph(conn, project_id)
+        projects = {project_id} | {item.project_id or '' for item in graph.items}
+        revisions = graph_revisions(conn, projects)
+    finally:
+        if began:
+            conn.rollback()
+
+    if store:
+        with _cache_lock:
+            _cache[project_id] = (revisions, graph)
+            _cache.move_to_end(project_id)
+            while len(_cache) > _CACHE_SIZE:
+                _cache.popitem(last=False)
+    return revisions, graph
+
+
+def clear_cached_graphs():
+    """Forget every cached graph (after the database was replaced by a restore)"""
+    with _cache_lock:
+        _cache.clear()
+
+
+def get_dependency_graph(conn: sqlite3.Connection, project_id: str) -> DependencyGraph:
+    """A project's graph (cached until a project it touches changes)"""
+    return load_cached_graph(conn, project_id)[1]
+
+
+def replace_cached_graph(
+    project_id: str, previous: Dict[str, int], revisions: Dict[str, int], graph: DependencyGraph
+) -> bool:
+    """Cache graph as the state at ``revisions``, if the cached graph is still the one at ``previous``
+
+    Lets a writer that changed a graph in a known way (e.g. added one
+    dependency) update the cache instead of having the next reader reload it.
+    """
+    with _cache_lock:
+        cached = _cache.get(project_id)
+        if not cached or cached[0] != previous:
+            return False
+        _cache[project_id] = (revisions, graph)
+        return True
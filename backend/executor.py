@@ -0,0 +1,30 @@
+"""
+Bounded thread pool for running blocking service calls off the event loop
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+from backend.config import settings
+
+# Sized to the connection pool so worker threads rarely wait for a connection
+_executor = ThreadPoolExecutor(
+    max_workers=settings.db_executor_workers,
+    thread_name_prefix="db-worker",
+)
+
+
+async def run_sync(func: Callable, *args, **kwargs) -> Any:
+    """
+    Run a blocking (sqlite3/pandas/openpyxl) call in the worker pool
+
+    Routes stay ``async def`` but no longer block the event loop, so one slow
+    query does not stall every other request on the same uvicorn worker.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+def shutdown_executor():
+    """Wait for in-flight calls and stop the worker pool"""
+    _executor.shutdown(wait=True)
@@ -10,6 +10,25 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from backend.config import settings
+from backend.project_stats import create_project_stats
+from backend.dependency_graph import create_graph_revisions
+from backend.change_journal import create_change_journal
+from backend.migrations.add_query_indexes import create_query_indexes
+from backend.migrations.add_wbs_sort_key import add_wbs_sort_key
+
+
+def configure_storage(conn: sqlite3.Connection) -> str:
+    """
+    Apply storage settings to the database file
+
+    journal_mode is persistent, so switching to WAL once here lets readers
+    keep reading while the writer commits. The remaining PRAGMAs are
+    per-connection and are applied again by the pool and the write queue.
+    """
+    journal_mode = conn.execute(f"PRAGMA journal_mode = {settings.sqlite_journal_mode}").fetchone()[0]
+    for pragma, value in settings.sqlite_connection_pragmas.items():
+        conn.execute(f"PRAGMA {pragma} = {value}")
+    return journal_mode
 
 
 def create_database_schema():
@@ -21,6 +40,7 @@ def create_database_schema():
 
     # Connect to database
     conn = sqlite3.connect(str(settings.database_path))
+    journal_mode = configure_storage(conn)
     cursor = conn.cursor()
 
     # 1. Projects table
@@ -44,6 +64,7 @@ def create_database_schema():
 
             -- WBS structure
             wbs_id TEXT,
+            wbs_sort_key TEXT,
             parent_id TEXT,
             task_name TEXT,
             item_type TEXT,
@@ -325,21 +346,62 @@ def create_database_schema():
         )
     """)
 
+    # 10. Background jobs table (long-running imports, exports and backups)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS background_jobs (
+            job_id TEXT PRIMARY KEY,
+            job_type TEXT NOT NULL,
+
+            -- queued/running/completed/failed/cancelled
+            status TEXT NOT NULL DEFAULT 'queued',
+            progress INTEGER DEFAULT 0,
+            message TEXT,
+            cancel_requested BOOLEAN DEFAULT 0,
+
+            -- JSON encoded parameters and result
+            params TEXT,
+            result TEXT,
+            error TEXT,
+
+            -- File produced by the job (exports)
+            result_file TEXT,
+
+            -- System fields
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP
+        )
+    """)
+
     # Create indexes for better query performance
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tracking_items_project ON tracking_items(project_id)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_tracking_items_wbs ON tracking_items(wbs_id)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_tracking_items_status ON tracking_items(status)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_dependencies_predecessor ON item_dependencies(predecessor_id)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_dependencies_successor ON item_dependencies(successor_id)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_dependencies_active ON item_dependencies(is_active)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_pending_items_project ON pending_items(project_id)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_pending_items_status ON pending_items(status)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_pending_replies_pending_id ON pending_replies(pending_id)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_pending_replies_reply_date ON pending_replies(reply_date)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_issue_tracking_project ON issue_tracking(project_id)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_issue_tracking_status ON issue_tracking(status)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_notifications_type ON notifications(notification_type)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_notifications_read ON notifications(is_read)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_background_jobs_status ON background_jobs(status)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_background_jobs_created ON background_jobs(created_at)")
+
+    # Natural-order WBS sort key (column added and filled for older databases)
+    add_wbs_sort_key(conn)
+
+    # Composite indexes matched to the service queries
+    create_query_indexes(conn)
+
+    # 11. Materialized project statistics, maintained by triggers
+    stats_rebuilt = create_project_stats(conn)
+
+    # 12. Dependency graph revisions (invalidate cached critical paths)
+    create_graph_revisions(conn)
+
+    # 13. Row-level change journal (point-in-time recovery)
+    create_change_journal(conn)
 
     # Commit changes
     conn.commit()
@@ -347,6 +409,9 @@ def create_database_schema():
 
     print("✓ Database schema created successfully")
     print(f"✓ Database location: {settings.database_path}")
+    print(f"✓ Journal mode: {journal_mode}")
+    if stats_rebuilt:
+        print("✓ Project statistics rebuilt")
 
 
 if __name__ == "__main__":
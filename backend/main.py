@@ -7,6 +7,11 @@ from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 from backend.config import settings
 from backend.init_db import create_database_schema
+from backend.db_pool import get_pool, close_all_pools
+from backend.db_writer import get_writer, stop_all_writers
+from backend.executor import shutdown_executor
+from backend.services.job_service import JobService, shutdown_jobs
+from backend.backup_scheduler import start_backup_scheduler, stop_backup_scheduler
 
 # Create FastAPI application
 app = FastAPI(
@@ -36,6 +41,28 @@ async def startup_event():
     # Create database schema if it doesn't exist
     create_database_schema()
 
+    # Fail jobs interrupted by the last shutdown and drop expired ones
+    interrupted = JobService().recover_jobs()
+    if interrupted:
+        print(f"⚠ Marked {interrupted} interrupted background job(s) as failed")
+
+    # Daily backups with retention, taken off the request path
+    if start_backup_scheduler():
+        print(f"✓ Scheduled backups daily at {settings.backup_schedule_time}")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    Stop background jobs and backups, drain in-flight requests, flush
+    queued writes and close pooled database connections on shutdown
+    """
+    stop_backup_scheduler()
+    shutdown_jobs()
+    shutdown_executor()
+    stop_all_writers()
+    close_all_pools()
+
 
 @app.get("/")
 async def root():
@@ -57,11 +84,13 @@ async def health_check():
     return {
         "status": "healthy",
         "database": str(settings.database_path.exists()),
+        "db_pool": get_pool().get_stats(),
+        "db_writer": get_writer().get_stats(),
     }
 
 
 # Import and include routers
-from backend.routers import wbs, projects, pending, issues, dependencies, backup
+from backend.routers import wbs, projects, pending, issues, dependencies, backup, jobs, dashboard
 from backend.routers import settings as settings_router
 
 app.include_router(projects.router, prefix="/api/projects", tags=["Projects"])
@@ -80,6 +109,8 @@ except ImportError:
 
 app.include_router(dependencies.router, prefix="/api/dependencies", tags=["Dependencies"])
 app.include_router(backup.router, prefix="/api/backup", tags=["Backup"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["Background Jobs"])
+app.include_router(dashboard.router, prefix="/api/dashboard", tags=["Dashboard"])
 
 # TODO: Add other routers
 # from backend.routers import reports, gantt, notifications
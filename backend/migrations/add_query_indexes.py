@@ -0,0 +1,106 @@
+"""
+Migration: Composite indexes matched to the service queries
+
+Each index follows the filter columns of a hot query and then its ORDER BY
+keys, so SQLite can seek and return rows in order without a sort step.
+Single-column indexes that are a prefix of a composite one are dropped.
+
+Check the result with:
+    python -m backend.benchmarks.query_plans
+"""
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.config import settings
+
+_WBS_END = "COALESCE(NULLIF(revised_planned_end, ''), original_planned_end)"
+
+# (index name, table, indexed columns or expressions, columns that must exist)
+QUERY_INDEXES = [
+    # WBS lists (item_type = 'WBS' [AND project_id = ?] ORDER BY wbs_sort_key, item_id)
+    ("idx_tracking_items_type_sort", "tracking_items", "item_type, wbs_sort_key, item_id",
+     ("wbs_sort_key",)),
+    ("idx_tracking_items_project_type_sort", "tracking_items", "project_id, item_type, wbs_sort_key, item_id",
+     ("wbs_sort_key",)),
+    # Children and tree lookups
+    ("idx_tracking_items_parent_sort", "tracking_items", "parent_id, item_type, wbs_sort_key",
+     ("wbs_sort_key",)),
+    # Dashboard due-date lists
+    ("idx_tracking_items_type_end", "tracking_items", f"item_type, {_WBS_END}", ()),
+
+    # Issue lists (newest first), history and dashboard due dates
+    ("idx_issue_tracking_created", "issue_tracking", "created_at", ()),
+    ("idx_issue_tracking_project_created", "issue_tracking", "project_id, created_at", ()),
+    ("idx_issue_tracking_target_date", "issue_tracking", "target_resolution_date", ()),
+    ("idx_issue_status_history_issue", "issue_status_history", "issue_id, change_date", ()),
+
+    # Pending lists (latest task date first), overdue lists and dashboard due dates
+    ("idx_pending_items_task_date", "pending_items", "task_date, created_at", ()),
+    ("idx_pending_items_project_task_date", "pending_items", "project_id, task_date, created_at", ()),
+    ("idx_pending_items_completion_date", "pending_items", "expected_completion_date",
+     ("expected_completion_date",)),
+
+    # Dependency lists (newest first)
+    ("idx_dependencies_created", "item_dependencies", "created_at", ()),
+
+    # Project lists (newest first)
+    ("idx_projects_created", "projects", "created_at, project_id", ()),
+]
+
+# Prefixes of the composite indexes above, and indexes they (or the
+# project_stats counters) replace
+REDUNDANT_INDEXES = [
+    "idx_tracking_items_project",
+    "idx_tracking_items_type_wbs",
+    "idx_tracking_items_project_type_wbs",
+    "idx_tracking_items_parent",
+    "idx_issue_tracking_project",
+    "idx_pending_items_project",
+    "idx_tracking_items_project_type_status",
+]
+
+
+def create_query_indexes(conn: sqlite3.Connection) -> int:
+    """Create missing indexes (skipping ones whose columns don't exist yet)"""
+    created = 0
+    for name, table, columns, required in QUERY_INDEXES:
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if not set(required) <= existing:
+            continue
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (name,)).fetchone():
+            continue
+        conn.execute(f"CREATE INDEX {name} ON {table}({columns})")
+        created += 1
+
+    for name in REDUNDANT_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+    return created
+
+
+def migrate():
+    """Create the query indexes"""
+    conn = sqlite3.connect(str(settings.database_path))
+
+    try:
+        created = create_query_indexes(conn)
+        print(f"✓ Created {created} index(es)")
+
+        conn.commit()
+        print("\n✅ Migration completed successfully")
+
+    except Exception as e:
+        conn.rollback()
+        print(f"\n❌ Migration failed: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,62 @@
+"""
+Migration: Add wbs_sort_key column to tracking_items table
+
+wbs_id is TEXT, so ORDER BY wbs_id puts "10" before "2" and "2.10" before
+"2.9". wbs_sort_key holds the same id with every number zero-padded
+("2.10" -> "00000002.00000010"), which sorts in hierarchical order and is
+indexed together with item_type for the WBS lists.
+"""
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.config import settings
+from backend.services.wbs_service import wbs_sort_key
+
+
+def add_wbs_sort_key(conn: sqlite3.Connection, refresh: bool = False) -> int:
+    """Add the column if missing and fill keys that are unset (or all with refresh)
+
+    Returns the number of rows updated.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(tracking_items)")}
+    if 'wbs_sort_key' not in columns:
+        conn.execute("ALTER TABLE tracking_items ADD COLUMN wbs_sort_key TEXT")
+
+    query = "SELECT item_id, wbs_id FROM tracking_items WHERE wbs_id IS NOT NULL"
+    if not refresh:
+        query += " AND wbs_sort_key IS NULL"
+    rows = conn.execute(query).fetchall()
+
+    conn.executemany(
+        "UPDATE tracking_items SET wbs_sort_key = ? WHERE item_id = ?",
+        [(wbs_sort_key(wbs_id), item_id) for item_id, wbs_id in rows]
+    )
+    return len(rows)
+
+
+def migrate():
+    """Add and backfill the wbs_sort_key column"""
+    conn = sqlite3.connect(str(settings.database_path))
+
+    try:
+        updated = add_wbs_sort_key(conn, refresh=True)
+        print(f"✓ Computed wbs_sort_key for {updated} item(s)")
+
+        conn.commit()
+        print("\n✅ Migration completed successfully")
+
+    except Exception as e:
+        conn.rollback()
+        print(f"\n❌ Migration failed: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    migrate()
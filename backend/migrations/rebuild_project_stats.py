@@ -0,0 +1,63 @@
+"""
+Migration: Create or rebuild the materialized project statistics
+
+Usage:
+    python -m backend.migrations.rebuild_project_stats          # rebuild counters
+    python -m backend.migrations.rebuild_project_stats --check  # report drift only
+"""
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.config import settings
+from backend.project_stats import check_project_stats, create_project_stats, rebuild_project_stats
+
+
+def check() -> bool:
+    """Compare stored counters with the item tables; True if consistent"""
+    conn = sqlite3.connect(str(settings.database_path))
+
+    try:
+        mismatches = check_project_stats(conn)
+    finally:
+        conn.close()
+
+    for m in mismatches:
+        print(f"✗ {m['project_id'] or '(no project)'} {m['metric']}[{m['bucket']}]: "
+              f"expected {m['expected']}, stored {m['stored']}")
+
+    if mismatches:
+        print(f"\n❌ {len(mismatches)} counters out of date; run without --check to rebuild")
+        return False
+    print("✅ Project statistics are consistent")
+    return True
+
+
+def migrate():
+    """Create the stats table and triggers and recompute every counter"""
+    conn = sqlite3.connect(str(settings.database_path))
+
+    try:
+        if not create_project_stats(conn):
+            rebuild_project_stats(conn)
+        conn.commit()
+        count = conn.execute("SELECT COUNT(*) FROM project_stats").fetchone()[0]
+        print(f"✓ Rebuilt project statistics ({count} counters)")
+        print("\n✅ Migration completed successfully")
+
+    except Exception as e:
+        conn.rollback()
+        print(f"\n❌ Migration failed: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    if "--check" in sys.argv[1:]:
+        sys.exit(0 if check() else 1)
+    migrate()
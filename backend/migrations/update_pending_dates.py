@@ -10,6 +10,8 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from backend.config import settings
+from backend.project_stats import create_project_stats
+from backend.migrations.add_query_indexes import create_query_indexes
 
 
 def migrate():
@@ -61,6 +63,12 @@ def migrate():
         """)
         print("✓ Copied actual_reply_date to actual_completion_date")
 
+        # 3. Count the new due dates in the project statistics and index them
+        create_project_stats(conn)
+        print("✓ Updated project statistics triggers")
+        create_query_indexes(conn)
+        print("✓ Indexed expected_completion_date")
+
         conn.commit()
         print("\n✅ Migration completed successfully")
         print("\nNote: Old columns (expected_reply_date, actual_reply_date) are kept for compatibility")
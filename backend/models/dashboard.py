@@ -0,0 +1,78 @@
+"""
+Pydantic models for the dashboard summary
+"""
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import date
+
+
+class ProjectCounts(BaseModel):
+    """Project counts"""
+    total: int = 0
+    active: int = 0
+
+
+class WBSCounts(BaseModel):
+    """WBS item counts"""
+    total: int = 0
+    completed: int = 0
+    in_progress: int = 0
+    not_started: int = 0
+    overdue: int = 0
+
+
+class PendingCounts(BaseModel):
+    """Pending item counts"""
+    total: int = 0
+    pending: int = 0
+    in_progress: int = 0
+    completed: int = 0
+    overdue: int = 0
+
+
+class IssueCounts(BaseModel):
+    """Issue counts"""
+    total: int = 0
+    open: int = 0
+    in_progress: int = 0
+    resolved: int = 0
+    critical: int = Field(default=0, description="Unresolved Critical or Urgent issues")
+
+
+class DependencyCounts(BaseModel):
+    """Dependency counts"""
+    total: int = 0
+    active: int = 0
+
+
+class DashboardItem(BaseModel):
+    """WBS item, pending item or issue shown in a dashboard list"""
+    type: str = Field(..., description="WBS/Pending/Issue")
+    id: str
+    code: Optional[str] = None
+    name: Optional[str] = None
+    status: Optional[str] = None
+    project_id: Optional[str] = None
+    date: Optional[str] = Field(None, description="Due date (planned start for should_start)")
+    days_until_due: Optional[int] = None
+
+
+class DashboardItemList(BaseModel):
+    """First items of a dashboard list and the size of the whole list"""
+    total: int = 0
+    items: List[DashboardItem] = Field(default_factory=list)
+
+
+class DashboardSummary(BaseModel):
+    """Model for the dashboard summary response"""
+    as_of: date
+    projects: ProjectCounts
+    wbs: WBSCounts
+    pending: PendingCounts
+    issues: IssueCounts
+    dependencies: DependencyCounts
+
+    overdue: DashboardItemList
+    should_start: DashboardItemList
+    due_today: DashboardItemList
+    due_soon: DashboardItemList
@@ -51,6 +51,7 @@ class DependencyListResponse(BaseModel):
     """Model for dependency list response"""
     total: int
     items: List[DependencyResponse]
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor to fetch the next page")
 
 
 class ScheduleAdjustmentSuggestion(BaseModel):
@@ -76,3 +77,66 @@ class ScheduleImpactAnalysis(BaseModel):
     affected_items: List[ScheduleAdjustmentSuggestion]
     total_affected: int
     critical_path_affected: bool
+
+
+class ScheduleChangeRequest(BaseModel):
+    """Model for applying a date change and its impact on dependent items"""
+    field: str = Field(..., description="Changed date field, e.g. revised_planned_end")
+    old_value: Optional[str] = None
+    new_value: str
+    change_by: Optional[str] = None
+    change_reason: Optional[str] = None
+
+
+class ScheduledItem(BaseModel):
+    """Model for one rescheduled item"""
+    item_id: str
+    wbs_id: Optional[str] = None
+    task_name: Optional[str] = None
+    old_start: Optional[date] = None
+    old_end: Optional[date] = None
+    new_start: Optional[date] = None
+    new_end: Optional[date] = None
+
+
+class ScheduleChangeResult(BaseModel):
+    """Model for an applied schedule change"""
+    change_id: int
+    source_item_id: str
+    change_date: datetime
+    updated_items: List[ScheduledItem]
+    total_updated: int
+
+
+class CriticalPathItem(BaseModel):
+    """Model for one item's CPM dates"""
+    item_id: str
+    project_id: Optional[str] = None
+    wbs_id: Optional[str] = None
+    task_name: Optional[str] = None
+    duration_days: int
+    early_start: date
+    early_finish: date
+    late_start: date
+    late_finish: date
+    total_float: int = Field(..., description="Days the item can slip without delaying the project")
+    is_critical: bool
+
+
+class CriticalPathResponse(BaseModel):
+    """Model for a project's critical path analysis"""
+    project_id: str
+    project_start: date
+    project_finish: date
+    critical_path: List[str] = Field(..., description="Item IDs without float, by early start")
+    items: List[CriticalPathItem]
+    cyclic_items: List[str] = Field([], description="Items on a dependency cycle (not scheduled)")
+
+
+class DependencyValidationResponse(BaseModel):
+    """Model for a project dependency graph audit"""
+    project_id: str
+    total_dependencies: int
+    is_valid: bool
+    cycles: List[List[str]] = Field([], description="One closed path of item IDs per group of items depending on each other")
+    dangling_dependencies: List[int] = Field([], description="Dependency IDs pointing at items that no longer exist")
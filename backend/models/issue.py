@@ -112,6 +112,7 @@ class IssueListResponse(BaseModel):
     """Model for issue list response"""
     total: int
     items: List[IssueResponse]
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor to fetch the next page")
 
 
 class IssueStatusHistory(BaseModel):
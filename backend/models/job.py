@@ -0,0 +1,39 @@
+"""
+Pydantic models for background jobs
+"""
+from pydantic import BaseModel, Field
+from typing import Optional, Any, Dict, List
+from datetime import datetime
+
+
+class JobCreate(BaseModel):
+    """Model for submitting a background job"""
+    job_type: str = Field(..., description="export_wbs/export_pending/export_issues/create_backup")
+    params: Dict[str, Any] = Field(default_factory=dict, description="Job parameters (e.g. project_id)")
+
+
+class JobResponse(BaseModel):
+    """Model for background job response"""
+    job_id: str
+    job_type: str
+    status: str = Field(..., description="queued/running/completed/failed/cancelled")
+    progress: int = Field(default=0, ge=0, le=100, description="Progress percentage")
+    message: Optional[str] = None
+    cancel_requested: bool = False
+    params: Dict[str, Any] = Field(default_factory=dict)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    has_file: bool = Field(default=False, description="Result file available for download")
+
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class JobListResponse(BaseModel):
+    """Model for job list response"""
+    total: int
+    items: List[JobResponse]
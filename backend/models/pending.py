@@ -74,6 +74,7 @@ class PendingListResponse(BaseModel):
     """Model for pending list response"""
     total: int
     items: list[PendingResponse]
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor to fetch the next page")
 
 
 class PendingStats(BaseModel):
@@ -46,6 +46,7 @@ class ProjectListResponse(BaseModel):
     """Model for project list response"""
     total: int
     items: list[ProjectResponse]
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor to fetch the next page")
 
 
 class ProjectStats(BaseModel):
@@ -101,12 +101,14 @@ class WBSListResponse(BaseModel):
     """Model for WBS list response"""
     total: int
     items: list[WBSResponse]
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor to fetch the next page")
 
 
 class WBSTreeNode(WBSResponse):
     """Model for WBS tree structure"""
     children: list['WBSTreeNode'] = []
     level: int = 0
+    has_children: bool = False
 
 
 class WBSInsertBetween(BaseModel):
@@ -0,0 +1,92 @@
+"""
+Keyset (cursor) pagination for list queries
+
+A cursor is an opaque token holding the sort-key values of the last row of
+a page. The next page continues with ``WHERE (sort keys) > (cursor values)``
+instead of ``OFFSET``, so with an index on the sort keys every page costs
+the same as the first and rows inserted meanwhile never shift a page.
+"""
+import base64
+import json
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+
+
+class Page(NamedTuple):
+    """Rows of one page and the cursor of the next one (None on the last page)"""
+    items: List[Any]
+    next_cursor: Optional[str]
+
+
+class SortKey(NamedTuple):
+    """One ORDER BY column; ``name`` is the column as it appears in result rows"""
+    column: str
+    descending: bool = False
+
+    @property
+    def name(self) -> str:
+        return self.column.rsplit(".", 1)[-1]
+
+
+class Keyset:
+    """Sort order of a list query, ending in a unique column"""
+
+    def __init__(self, *keys: SortKey):
+        self.keys = keys
+
+    def order_by(self) -> str:
+        """ORDER BY clause body"""
+        return ", ".join(
+            f"{key.column} DESC" if key.descending else key.column for key in self.keys
+        )
+
+    def encode(self, row) -> str:
+        """Cursor pointing just after ``row``"""
+        values = [row[key.name] for key in self.keys]
+        raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    def decode(self, cursor: str) -> List[Any]:
+        """Sort-key values stored in a cursor"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            values = json.loads(raw)
+        except (ValueError, TypeError):
+            raise ValueError("Invalid cursor")
+        if not isinstance(values, list) or len(values) != len(self.keys):
+            raise ValueError("Invalid cursor")
+        return values
+
+    def after(self, cursor: str) -> Tuple[str, List[Any]]:
+        """WHERE condition (and its parameters) selecting rows after the cursor"""
+        return self._after(self.keys, self.decode(cursor))
+
+    def _after(self, keys: Sequence[SortKey], values: Sequence[Any]) -> Tuple[str, List[Any]]:
+        key, value = keys[0], values[0]
+        col = key.column
+        op = "<" if key.descending else ">"
+
+        # SQLite sorts NULL first (last in descending order). Sort columns are
+        # filled in practice, but a NULL in a cursor must not skip rows
+        if value is None:
+            if len(keys) == 1:
+                return ("0" if key.descending else f"{col} IS NOT NULL"), []
+            inner, params = self._after(keys[1:], values[1:])
+            if key.descending:
+                return f"({col} IS NULL AND {inner})", params
+            return f"({col} IS NOT NULL OR ({col} IS NULL AND {inner}))", params
+
+        if len(keys) == 1:
+            return f"{col} {op} ?", [value]
+
+        # "a >= ? AND (a > ? OR ...)" keeps a plain range on the leading
+        # column, so SQLite can seek the index instead of filtering rows
+        inner, params = self._after(keys[1:], values[1:])
+        return f"({col} {op}= ? AND ({col} {op} ? OR {inner}))", [value, value] + params
+
+
+def paginate(rows: List, limit: int, keyset: Keyset) -> Page:
+    """Trim rows fetched with ``LIMIT limit + 1`` and build the next cursor"""
+    if len(rows) <= limit:
+        return Page(rows, None)
+    rows = rows[:limit]
+    return Page(rows, keyset.encode(rows[-1]))
@@ -0,0 +1,270 @@
+"""
+Materialized per-project statistics
+
+Counters in the ``project_stats`` table are kept current by triggers on
+tracking_items, issue_tracking and pending_items, so the stats endpoints read
+a handful of rows instead of scanning the item tables. Every counter is a
+(project_id, metric, bucket) row holding a row count and a running total
+(used for averages).
+
+Overdue counts depend on today's date, so they cannot be stored as a single
+number. Open items are instead counted per due date, and "overdue" is the sum
+of the buckets dated before today.
+"""
+import sqlite3
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class Metric(NamedTuple):
+    """One counter family; expressions use ``{row}`` for the item row"""
+    table: str
+    name: str
+    bucket: str
+    value: str = "0"
+    condition: str = "1"
+    columns: Tuple[str, ...] = ()
+
+
+_WBS = "{row}.item_type = 'WBS'"
+_RESOLUTION_DAYS = "julianday({row}.actual_resolution_date) - julianday({row}.reported_date)"
+
+METRICS: List[Metric] = [
+    # Project WBS statistics
+    Metric("tracking_items", "wbs_status", "{row}.status", condition=_WBS,
+           columns=("item_type", "status")),
+    Metric("tracking_items", "wbs_overdue", "''", condition=f"{_WBS} AND {{row}}.is_overdue = 1",
+           columns=("item_type", "is_overdue")),
+    Metric("tracking_items", "wbs_progress", "''", value="{row}.actual_progress",
+           condition=f"{_WBS} AND {{row}}.actual_progress IS NOT NULL",
+           columns=("item_type", "actual_progress")),
+
+    # Issue statistics
+    Metric("issue_tracking", "issue_status", "{row}.status", columns=("status",)),
+    Metric("issue_tracking", "issue_severity", "{row}.severity", columns=("severity",)),
+    Metric("issue_tracking", "issue_type", "{row}.issue_type", columns=("issue_type",)),
+    Metric("issue_tracking", "issue_category", "{row}.issue_category", columns=("issue_category",)),
+    Metric("issue_tracking", "issue_owner", "{row}.owner_type", columns=("owner_type",)),
+    Metric("issue_tracking", "issue_escalated", "''", condition="{row}.is_escalated = 1",
+           columns=("is_escalated",)),
+    Metric("issue_tracking", "issue_open_due", "{row}.target_resolution_date",
+           condition="{row}.target_resolution_date IS NOT NULL AND {row}.status NOT IN ('Resolved', 'Closed')",
+           columns=("target_resolution_date", "status")),
+    Metric("issue_tracking", "issue_open_critical", "''",
+           condition="({row}.severity = 'Critical' OR {row}.priority = 'Urgent')"
+                     " AND COALESCE({row}.status, '') NOT IN ('Resolved', 'Closed')",
+           columns=("severity", "priority", "status")),
+    Metric("issue_tracking", "issue_resolution", "''", value=_RESOLUTION_DAYS,
+           condition=f"{{row}}.actual_resolution_date IS NOT NULL AND {_RESOLUTION_DAYS} IS NOT NULL",
+           columns=("actual_resolution_date", "reported_date")),
+
+    # Pending item statistics
+    Metric("pending_items", "pending_status", "{row}.status", columns=("status",)),
+    Metric("pending_items", "pending_priority", "{row}.priority", columns=("priority",)),
+    Metric("pending_items", "pending_source", "{row}.source_type", columns=("source_type",)),
+    Metric("pending_items", "pending_replied", "{row}.is_replied", columns=("is_replied",)),
+    Metric("pending_items", "pending_reply_due", "{row}.expected_reply_date",
+           condition="{row}.expected_reply_date IS NOT NULL AND {row}.is_replied = 0",
+           columns=("expected_reply_date", "is_replied")),
+    Metric("pending_items", "pending_completion_due", "{row}.expected_completion_date",
+           condition="{row}.expected_completion_date IS NOT NULL AND {row}.is_replied = 0",
+           columns=("expected_completion_date", "is_replied")),
+]
+
+TRACKED_TABLES = ("tracking_items", "issue_tracking", "pending_items")
+
+_UPSERT_SQL = """INSERT INTO project_stats (project_id, metric, bucket, count, total)
+        SELECT COALESCE({row}.project_id, ''), '{metric}', COALESCE({bucket}, ''), {sign}1, {sign}({value})
+        WHERE {condition}
+        ON CONFLICT (project_id, metric, bucket) DO UPDATE SET
+            count = count + excluded.count,
+            total = total + excluded.total;"""
+
+
+def _table_columns(conn: sqlite3.Connection, table: str) -> set:
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def active_metrics(conn: sqlite3.Connection) -> List[Metric]:
+    """Metrics whose columns exist (some are added by migrations)"""
+    columns = {table: _table_columns(conn, table) for table in TRACKED_TABLES}
+    return [m for m in METRICS if set(m.columns) <= columns[m.table]]
+
+
+def _upsert(metric: Metric, row: str, sign: str) -> str:
+    return _UPSERT_SQL.format(
+        row=row,
+        metric=metric.name,
+        sign=sign,
+        bucket=metric.bucket.format(row=row),
+        value=metric.value.format(row=row),
+        condition=metric.condition.format(row=row),
+    )
+
+
+def _trigger_statements(metrics: List[Metric]) -> Dict[str, str]:
+    """CREATE TRIGGER statement for each trigger name"""
+    triggers = {}
+    for table in TRACKED_TABLES:
+        table_metrics = [m for m in metrics if m.table == table]
+        if not table_metrics:
+            continue
+
+        columns = ["project_id"]
+        for metric in table_metrics:
+            columns += [c for c in metric.columns if c not in columns]
+
+        added = "\n    ".join(_upsert(m, "NEW", "") for m in table_metrics)
+        removed = "\n    ".join(_upsert(m, "OLD", "-") for m in table_metrics)
+
+        name = f"trg_project_stats_{table}_insert"
+        triggers[name] = f"CREATE TRIGGER {name} AFTER INSERT ON {table}\nBEGIN\n    {added}\nEND"
+        name = f"trg_project_stats_{table}_delete"
+        triggers[name] = f"CREATE TRIGGER {name} AFTER DELETE ON {table}\nBEGIN\n    {removed}\nEND"
+        name = f"trg_project_stats_{table}_update"
+        triggers[name] = (
+            f"CREATE TRIGGER {name} AFTER UPDATE OF {', '.join(columns)} ON {table}\n"
+            f"BEGIN\n    {removed}\n    {added}\nEND"
+        )
+    return triggers
+
+
+def create_project_stats(conn: sqlite3.Connection) -> bool:
+    """
+    Create the stats table and its triggers, rebuilding the counters when
+    the table is new or the triggers changed (e.g. after a column was added)
+
+    Returns True if the counters were rebuilt. The caller commits.
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'project_stats'"
+    ).fetchone()
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS project_stats (
+            project_id TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            total REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (project_id, metric, bucket)
+        ) WITHOUT ROWID
+    """)
+
+    wanted = _trigger_statements(active_metrics(conn))
+    current = dict(conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_project_stats_%'"
+    ).fetchall())
+    if exists and current == wanted:
+        return False
+
+    for name in current:
+        conn.execute(f"DROP TRIGGER {name}")
+    for sql in wanted.values():
+        conn.execute(sql)
+    rebuild_project_stats(conn)
+    return True
+
+
+def _computed_counters(conn: sqlite3.Connection, metrics: Iterable[Metric]):
+    """Counters recomputed from the item tables"""
+    for metric in metrics:
+        cursor = conn.execute(f"""
+            SELECT COALESCE(t.project_id, ''), '{metric.name}',
+                   CAST(COALESCE({metric.bucket.format(row='t')}, '') AS TEXT),
+                   COUNT(*), TOTAL({metric.value.format(row='t')})
+            FROM {metric.table} AS t
+            WHERE {metric.condition.format(row='t')}
+            GROUP BY 1, 3
+        """)
+        yield from cursor
+
+
+def rebuild_project_stats(conn: sqlite3.Connection) -> int:
+    """Recompute every counter from scratch; returns the number of rows written"""
+    conn.execute("DELETE FROM project_stats")
+    rows = list(_computed_counters(conn, active_metrics(conn)))
+    conn.executemany(
+        "INSERT INTO project_stats (project_id, metric, bucket, count, total) VALUES (?, ?, ?, ?, ?)",
+        rows,
+    )
+    return len(rows)
+
+
+def check_project_stats(conn: sqlite3.Connection) -> List[Dict]:
+    """Compare stored counters with recomputed ones; returns the mismatches"""
+    expected = {
+        (project_id, metric, bucket): (count, total)
+        for project_id, metric, bucket, count, total in _computed_counters(conn, active_metrics(conn))
+    }
+    stored = {
+        (row[0], row[1], row[2]): (row[3], row[4])
+        for row in conn.execute(
+            "SELECT project_id, metric, bucket, count, total FROM project_stats WHERE count != 0 OR total != 0"
+        )
+    }
+
+    mismatches = []
+    for key in sorted(set(expected) | set(stored)):
+        want = expected.get(key, (0, 0.0))
+        have = stored.get(key, (0, 0.0))
+        if want[0] != have[0] or abs(want[1] - have[1]) > 1e-6:
+            mismatches.append({
+                "project_id": key[0], "metric": key[1], "bucket": key[2],
+                "expected": want, "stored": have,
+            })
+    return mismatches
+
+
+class StatsSnapshot:
+    """Counters of one project (or all projects) grouped by metric"""
+
+    def __init__(self, rows: Iterable):
+        self._metrics: Dict[str, Dict[str, Tuple[int, float]]] = {}
+        for metric, bucket, count, total in rows:
+            if count:
+                self._metrics.setdefault(metric, {})[bucket] = (count, total)
+
+    def buckets(self, metric: str) -> Dict[str, int]:
+        """Row count per bucket"""
+        return {bucket: count for bucket, (count, _) in self._metrics.get(metric, {}).items()}
+
+    def count(self, metric: str, *buckets: str) -> int:
+        """Rows in the given buckets (all buckets if none given)"""
+        counts = self.buckets(metric)
+        if not buckets:
+            return sum(counts.values())
+        return sum(counts.get(bucket, 0) for bucket in buckets)
+
+    def count_before(self, metric: str, bound: str) -> int:
+        """Rows whose (date) bucket sorts before ``bound``"""
+        return sum(count for bucket, count in self.buckets(metric).items() if bucket < bound)
+
+    def average(self, metric: str) -> Optional[float]:
+        """Mean of the metric's values, or None if it has no rows"""
+        count = total = 0
+        for bucket_count, bucket_total in self._metrics.get(metric, {}).values():
+            count += bucket_count
+            total += bucket_total
+        return total / count if count else None
+
+
+def today() -> str:
+    """Today's date as SQLite's date('now') returns it"""
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+def load_project_stats(conn: sqlite3.Connection, project_id: Optional[str], prefix: str) -> StatsSnapshot:
+    """Read the counters whose metric starts with ``prefix``"""
+    if project_id:
+        cursor = conn.execute("""
+            SELECT metric, bucket, count, total FROM project_stats
+            WHERE project_id = ? AND metric LIKE ?
+        """, (project_id, prefix + "%"))
+    else:
+        cursor = conn.execute("""
+            SELECT metric, bucket, SUM(count), SUM(total) FROM project_stats
+            WHERE metric LIKE ?
+            GROUP BY metric, bucket
+        """, (prefix + "%",))
+    return StatsSnapshot(cursor.fetchall())
@@ -2,10 +2,13 @@
 API routes for Backup management
 """
 from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
+from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel
 from backend.services.backup_service import BackupService
+from backend.executor import run_sync
+from backend.routers.jobs import submit_job_response
 
 router = APIRouter()
 backup_service = BackupService()
@@ -18,18 +21,26 @@ class BackupCreateRequest(BaseModel):
 
 class BackupRestoreRequest(BaseModel):
     """Request model for restoring backup"""
-    filename: str
+    filename: Optional[str] = None
+    to_time: Optional[datetime] = None
 
 
 @router.post("/create")
-async def create_backup(request: BackupCreateRequest):
+async def create_backup(
+    request: BackupCreateRequest,
+    background: bool = Query(False, description="Run as a background job and return its job record")
+):
     """
     Create a new database backup
 
     - **description**: Optional description for this backup
+    - **background**: Return a job (202) immediately instead of waiting
     """
+    if background:
+        return await submit_job_response('create_backup', {'description': request.description})
+
     try:
-        backup_info = backup_service.create_backup(description=request.description)
+        backup_info = await run_sync(backup_service.create_backup, description=request.description)
         return {
             "success": True,
             "message": "Backup created successfully",
@@ -47,7 +58,7 @@ async def list_backups():
     Returns list of backups sorted by creation date (newest first)
     """
     try:
-        backups = backup_service.list_backups()
+        backups = await run_sync(backup_service.list_backups)
         return {
             "success": True,
             "count": len(backups),
@@ -62,14 +73,25 @@ async def download_backup(filename: str):
     """
     Download a backup file
 
+    Chunked backups stream as their compressed database file (.db.gz or
+    .db.zst); the X-Checksum-SHA256 header holds the SHA-256 of the
+    decompressed file.
+
     - **filename**: Name of the backup file to download
     """
     try:
-        backup_path = backup_service.get_backup(filename)
+        backup_path = await run_sync(backup_service.get_backup, filename)
 
         if not backup_path:
             raise HTTPException(status_code=404, detail="Backup not found")
 
+        if backup_path.suffix == '.manifest':
+            name, content, checksum = await run_sync(backup_service.open_download, filename)
+            headers = {"Content-Disposition": f'attachment; filename="{name}"'}
+            if checksum:
+                headers["X-Checksum-SHA256"] = checksum
+            return StreamingResponse(content, media_type="application/octet-stream", headers=headers)
+
         return FileResponse(
             path=str(backup_path),
             filename=filename,
@@ -89,7 +111,7 @@ async def delete_backup(filename: str):
     - **filename**: Name of the backup file to delete
     """
     try:
-        success = backup_service.delete_backup(filename)
+        success = await run_sync(backup_service.delete_backup, filename)
 
         if not success:
             raise HTTPException(status_code=404, detail="Backup not found")
@@ -111,11 +133,31 @@ async def restore_backup(request: BackupRestoreRequest):
 
     **WARNING**: This will replace the current database!
     A backup of the current database will be created automatically before restore.
+    Returns 400 if the backup fails its integrity check.
+
+    With **to_time**, the database is restored as it was then: tracked items,
+    dependencies, issues and pending items get the changes up to that time
+    replayed on top of the nearest backup before it (or of **filename**).
+    Returns 400 if no backup can be the base.
 
     - **filename**: Name of the backup file to restore from
+    - **to_time**: Point in time to restore to (local time unless it has an offset)
     """
     try:
-        success = backup_service.restore_backup(request.filename)
+        if request.to_time is not None:
+            result = await run_sync(backup_service.restore_to_time, request.to_time, request.filename)
+            if result is None:
+                raise HTTPException(status_code=404, detail="Backup not found")
+            return {
+                "success": True,
+                "message": f"Database restored to {result['to_time']}",
+                "restore": result
+            }
+
+        if not request.filename:
+            raise HTTPException(status_code=400, detail="filename or to_time is required")
+
+        success = await run_sync(backup_service.restore_backup, request.filename)
 
         if not success:
             raise HTTPException(status_code=404, detail="Backup not found")
@@ -126,6 +168,8 @@ async def restore_backup(request: BackupRestoreRequest):
         }
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to restore backup: {str(e)}")
 
@@ -138,7 +182,7 @@ async def get_database_stats():
     Returns information about database size and table counts
     """
     try:
-        stats = backup_service.get_database_stats()
+        stats = await run_sync(backup_service.get_database_stats)
         return {
             "success": True,
             "stats": stats
@@ -155,7 +199,7 @@ async def cleanup_old_backups(keep_count: int = Query(10, ge=1, le=100)):
     - **keep_count**: Number of recent backups to keep (default: 10)
     """
     try:
-        deleted_count = backup_service.cleanup_old_backups(keep_count=keep_count)
+        deleted_count = await run_sync(backup_service.cleanup_old_backups, keep_count=keep_count)
         return {
             "success": True,
             "message": f"Cleaned up {deleted_count} old backup(s)",
@@ -0,0 +1,44 @@
+"""
+API routes for the dashboard summary
+"""
+import hashlib
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from typing import Optional
+from backend.config import settings
+from backend.models.dashboard import DashboardSummary
+from backend.services.dashboard_service import DashboardService
+from backend.executor import run_sync
+
+router = APIRouter()
+dashboard_service = DashboardService()
+
+
+@router.get("/summary", response_model=DashboardSummary)
+async def get_dashboard_summary(
+    request: Request,
+    project_id: Optional[str] = Query(None, description="Limit the summary to one project"),
+    limit: int = Query(settings.dashboard_list_limit, ge=1, le=50, description="Items per list"),
+):
+    """
+    Get dashboard counts and the first items of the overdue, should-start,
+    due-today and due-this-week lists
+
+    The response carries an ETag; a request whose If-None-Match matches it
+    gets 304 Not Modified without a body.
+    """
+    try:
+        summary = await run_sync(dashboard_service.get_summary, project_id=project_id, limit=limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    body = summary.model_dump_json().encode()
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={settings.dashboard_cache_max_age}",
+    }
+
+    if_none_match = [tag.strip().removeprefix("W/") for tag in request.headers.get("if-none-match", "").split(",")]
+    if etag in if_none_match or "*" in if_none_match:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -8,9 +8,14 @@ from backend.models.dependency import (
     DependencyUpdate,
     DependencyResponse,
     DependencyListResponse,
-    ScheduleImpactAnalysis
+    ScheduleImpactAnalysis,
+    CriticalPathResponse,
+    DependencyValidationResponse,
+    ScheduleChangeRequest,
+    ScheduleChangeResult
 )
 from backend.services.dependency_service import DependencyService
+from backend.executor import run_sync
 
 router = APIRouter()
 dependency_service = DependencyService()
@@ -25,9 +30,11 @@ async def create_dependency(dep_data: DependencyCreate):
     - **successor_id**: Item that depends on predecessor
     - **dependency_type**: FS (Finish-to-Start) / SS / FF / SF
     - **lag_days**: Lag or lead time in days
+
+    Returns 400 with the offending path if the dependency would create a cycle.
     """
     try:
-        return dependency_service.create_dependency(dep_data)
+        return await run_sync(dependency_service.create_dependency, dep_data)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -39,6 +46,7 @@ async def get_dependencies_list(
     active_only: bool = Query(True, description="Show only active dependencies"),
     skip: int = Query(0, ge=0, description="Number of items to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of items to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (replaces skip)"),
 ):
     """
     Get list of dependencies with optional filters
@@ -47,20 +55,26 @@ async def get_dependencies_list(
     - **item_id**: Filter dependencies related to specific item
     - **active_only**: Show only active dependencies
     """
-    items = dependency_service.get_dependencies_list(
-        project_id=project_id,
-        item_id=item_id,
-        active_only=active_only,
-        skip=skip,
-        limit=limit
-    )
-    total = dependency_service.get_dependencies_count(
+    try:
+        page = await run_sync(
+            dependency_service.get_dependencies_list,
+            project_id=project_id,
+            item_id=item_id,
+            active_only=active_only,
+            skip=skip,
+            limit=limit,
+            page_cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total = await run_sync(
+        dependency_service.get_dependencies_count,
         project_id=project_id,
         item_id=item_id,
         active_only=active_only
     )
 
-    return DependencyListResponse(total=total, items=items)
+    return DependencyListResponse(total=total, items=page.items, next_cursor=page.next_cursor)
 
 
 @router.get("/{dependency_id}", response_model=DependencyResponse)
@@ -68,7 +82,7 @@ async def get_dependency(dependency_id: int):
     """
     Get a specific dependency by ID
     """
-    dependency = dependency_service.get_dependency_by_id(dependency_id)
+    dependency = await run_sync(dependency_service.get_dependency_by_id, dependency_id)
     if not dependency:
         raise HTTPException(status_code=404, detail="Dependency not found")
     return dependency
@@ -81,12 +95,12 @@ async def update_dependency(dependency_id: int, dep_update: DependencyUpdate):
 
     Only provided fields will be updated. All fields are optional.
     """
-    dependency = dependency_service.get_dependency_by_id(dependency_id)
+    dependency = await run_sync(dependency_service.get_dependency_by_id, dependency_id)
     if not dependency:
         raise HTTPException(status_code=404, detail="Dependency not found")
 
     try:
-        updated_dependency = dependency_service.update_dependency(dependency_id, dep_update)
+        updated_dependency = await run_sync(dependency_service.update_dependency, dependency_id, dep_update)
         return updated_dependency
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -97,7 +111,7 @@ async def delete_dependency(dependency_id: int):
     """
     Delete a dependency
     """
-    success = dependency_service.delete_dependency(dependency_id)
+    success = await run_sync(dependency_service.delete_dependency, dependency_id)
     if not success:
         raise HTTPException(status_code=404, detail="Dependency not found")
 
@@ -107,7 +121,7 @@ async def get_item_successors(item_id: str, active_only: bool = Query(True)):
     """
     Get all items that depend on this item (successors)
     """
-    return dependency_service.get_successors(item_id, active_only=active_only)
+    return await run_sync(dependency_service.get_successors, item_id, active_only=active_only)
 
 
 @router.get("/item/{item_id}/predecessors", response_model=List[DependencyResponse])
@@ -115,7 +129,30 @@ async def get_item_predecessors(item_id: str, active_only: bool = Query(True)):
     """
     Get all items that this item depends on (predecessors)
     """
-    return dependency_service.get_predecessors(item_id, active_only=active_only)
+    return await run_sync(dependency_service.get_predecessors, item_id, active_only=active_only)
+
+
+@router.get("/project/{project_id}/critical-path", response_model=CriticalPathResponse)
+async def get_critical_path(project_id: str):
+    """
+    Get the critical path of a project
+
+    Returns early/late start and finish dates and total float for every item
+    connected by dependencies (FS/SS/FF/SF with lag), and the items without
+    float in order. Results are cached until an item or dependency changes.
+    """
+    return await run_sync(dependency_service.get_critical_path, project_id)
+
+
+@router.get("/project/{project_id}/validate", response_model=DependencyValidationResponse)
+async def validate_project_dependencies(project_id: str):
+    """
+    Audit a project's active dependencies
+
+    Reports every dependency cycle (one closed path per group of items that
+    depend on each other) and dependencies pointing at deleted items.
+    """
+    return await run_sync(dependency_service.validate_project_graph, project_id)
 
 
 @router.post("/item/{item_id}/analyze-impact", response_model=ScheduleImpactAnalysis)
@@ -135,9 +172,27 @@ async def analyze_schedule_impact(item_id: str, date_changes: dict):
     ```
     """
     try:
-        analysis = dependency_service.analyze_schedule_impact(item_id, date_changes)
+        analysis = await run_sync(dependency_service.analyze_schedule_impact, item_id, date_changes)
         return analysis
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/item/{item_id}/apply-impact", response_model=ScheduleChangeResult)
+async def apply_schedule_change(item_id: str, change: ScheduleChangeRequest):
+    """
+    Apply a schedule change together with the adjustments of dependent items
+
+    Sets the changed field, moves every affected item to the dates suggested
+    by analyze-impact and records the change in the schedule history, all in
+    one transaction. Takes the same body as analyze-impact.
+    """
+    try:
+        result = await run_sync(dependency_service.apply_schedule_change, item_id, change)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return result
@@ -2,21 +2,33 @@
 API routes for Excel import/export operations
 """
 from fastapi import APIRouter, HTTPException, UploadFile, File, Query
-from fastapi.responses import FileResponse
-from typing import Dict, Any
-from pathlib import Path
-import tempfile
-import os
+from fastapi.responses import StreamingResponse
+from typing import Dict, Any, Callable
+from urllib.parse import quote
 from backend.services.excel_service import ExcelService
+from backend.executor import run_sync
+from backend.streaming import stream_worker_output
+from backend.routers.jobs import submit_job_response
 
 router = APIRouter()
 excel_service = ExcelService()
 
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def _export_or_raise(output, export: Callable, *args) -> Dict[str, Any]:
+    """Write an export to output, raising ValueError if the service reports failure"""
+    result = export(*args, output)
+    if not result['success']:
+        raise ValueError(result.get('error', 'Export failed'))
+    return result
+
 
 @router.post("/import/wbs", response_model=Dict[str, Any])
 async def import_wbs_from_excel(
     file: UploadFile = File(...),
-    project_id: str = Query(..., description="Project ID to import WBS into")
+    project_id: str = Query(..., description="Project ID to import WBS into"),
+    background: bool = Query(False, description="Run as a background job and return its job record")
 ):
     """
     Import WBS items from Excel file
@@ -26,7 +38,8 @@ async def import_wbs_from_excel(
     - Required columns: 項目 (WBS ID), 任務說明 (Task Name)
     - Supports multiple date formats: mm/dd/yyyy, yyyy-mm-dd, etc.
 
-    Returns import summary with success/failure counts
+    Returns import summary with success/failure counts, or with
+    `background=true` a job (202) to poll at /api/jobs/{job_id}
     """
     if not file.filename.endswith(('.xlsx', '.xls')):
         raise HTTPException(
@@ -34,18 +47,17 @@ async def import_wbs_from_excel(
             detail="Invalid file format. Only Excel files (.xlsx, .xls) are supported."
         )
 
-    try:
-        # Save uploaded file to temporary location
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_path = tmp_file.name
-
-        # Import from Excel
-        result = excel_service.import_wbs_from_excel(tmp_path, project_id)
+    if background:
+        file.file.seek(0)
+        return await submit_job_response(
+            'import_wbs', {'project_id': project_id, 'filename': file.filename}, file.file
+        )
 
-        # Clean up temporary file
-        os.unlink(tmp_path)
+    try:
+        # The upload is already spooled by the server; read it in place
+        # instead of copying it into memory and then to another temp file
+        file.file.seek(0)
+        result = await run_sync(excel_service.import_wbs_from_excel, file.file, project_id)
 
         if not result['success']:
             raise HTTPException(status_code=400, detail=result.get('error', 'Import failed'))
@@ -55,14 +67,14 @@ async def import_wbs_from_excel(
     except HTTPException:
         raise
     except Exception as e:
-        # Clean up on error
-        if 'tmp_path' in locals() and os.path.exists(tmp_path):
-            os.unlink(tmp_path)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/export/wbs/{project_id}")
-async def export_wbs_to_excel(project_id: str):
+async def export_wbs_to_excel(
+    project_id: str,
+    background: bool = Query(False, description="Run as a background job and return its job record")
+):
     """
     Export WBS items to Excel file
 
@@ -73,37 +85,28 @@ async def export_wbs_to_excel(project_id: str):
     - Red highlighting for overdue items
     - All WBS data for the specified project
 
-    Returns downloadable Excel file
+    Returns downloadable Excel file, or with `background=true` a job (202)
+    whose file is fetched from /api/jobs/{job_id}/download
     """
-    try:
-        # Create temporary file for export
-        tmp_dir = tempfile.mkdtemp()
-        output_path = os.path.join(tmp_dir, f"WBS_{project_id}.xlsx")
-
-        # Export to Excel
-        result = excel_service.export_wbs_to_excel(project_id, output_path)
-
-        if not result['success']:
-            raise HTTPException(status_code=400, detail=result.get('error', 'Export failed'))
-
-        if not os.path.exists(output_path):
-            raise HTTPException(status_code=500, detail="Export file was not created")
-
-        # Return file for download
-        return FileResponse(
-            path=output_path,
-            filename=f"WBS_{project_id}.xlsx",
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={
-                "Content-Disposition": f"attachment; filename=WBS_{project_id}.xlsx"
-            }
-        )
+    if background:
+        return await submit_job_response('export_wbs', {'project_id': project_id})
 
-    except HTTPException:
-        raise
+    try:
+        chunks = await stream_worker_output(_export_or_raise, excel_service.export_wbs_to_excel, project_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    # Stream the finished workbook from its spool
+    return StreamingResponse(
+        chunks,
+        media_type=XLSX_MEDIA_TYPE,
+        headers={
+            "Content-Disposition": f"attachment; filename=WBS_{project_id}.xlsx"
+        }
+    )
+
 
 @router.get("/template/wbs")
 async def download_wbs_template():
@@ -119,37 +122,26 @@ async def download_wbs_template():
     Use this template to prepare your WBS data for import
     """
     try:
-        # Create temporary file for template
-        tmp_dir = tempfile.mkdtemp()
-        output_path = os.path.join(tmp_dir, "WBS_Template.xlsx")
-
-        # Create template
-        result = excel_service.create_wbs_template(output_path)
-
-        if not result['success']:
-            raise HTTPException(status_code=400, detail=result.get('error', 'Template creation failed'))
-
-        if not os.path.exists(output_path):
-            raise HTTPException(status_code=500, detail="Template file was not created")
-
-        # Return file for download
-        return FileResponse(
-            path=output_path,
-            filename="WBS_Template.xlsx",
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={
-                "Content-Disposition": "attachment; filename=WBS_Template.xlsx"
-            }
-        )
-
-    except HTTPException:
-        raise
+        chunks = await stream_worker_output(_export_or_raise, excel_service.create_wbs_template)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    return StreamingResponse(
+        chunks,
+        media_type=XLSX_MEDIA_TYPE,
+        headers={
+            "Content-Disposition": "attachment; filename=WBS_Template.xlsx"
+        }
+    )
+
 
 @router.get("/export/pending/{project_id}")
-async def export_pending_to_excel(project_id: str):
+async def export_pending_to_excel(
+    project_id: str,
+    background: bool = Query(False, description="Run as a background job and return its job record")
+):
     """
     Export Pending items to Excel file
 
@@ -159,46 +151,36 @@ async def export_pending_to_excel(project_id: str):
     - Auto-adjusted column widths
     - All pending items data for the specified project
 
-    Returns downloadable Excel file
+    Returns downloadable Excel file, or with `background=true` a job (202)
+    whose file is fetched from /api/jobs/{job_id}/download
     """
-    try:
-        from urllib.parse import quote
-
-        # Create temporary file for export
-        tmp_dir = tempfile.mkdtemp()
-        output_path = os.path.join(tmp_dir, f"pending_{project_id}.xlsx")
-
-        # Export to Excel
-        result = excel_service.export_pending_to_excel(project_id, output_path)
-
-        if not result['success']:
-            raise HTTPException(status_code=400, detail=result.get('error', 'Export failed'))
-
-        if not os.path.exists(output_path):
-            raise HTTPException(status_code=500, detail="Export file was not created")
-
-        # Use URL-encoded filename for Chinese characters
-        chinese_filename = f"待辦事項_{project_id}.xlsx"
-        encoded_filename = quote(chinese_filename)
-
-        # Return file for download
-        return FileResponse(
-            path=output_path,
-            filename=chinese_filename,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={
-                "Content-Disposition": f"attachment; filename*=UTF-8''{encoded_filename}"
-            }
-        )
+    if background:
+        return await submit_job_response('export_pending', {'project_id': project_id})
 
-    except HTTPException:
-        raise
+    try:
+        chunks = await stream_worker_output(_export_or_raise, excel_service.export_pending_to_excel, project_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    # Use URL-encoded filename for Chinese characters
+    encoded_filename = quote(f"待辦事項_{project_id}.xlsx")
+
+    return StreamingResponse(
+        chunks,
+        media_type=XLSX_MEDIA_TYPE,
+        headers={
+            "Content-Disposition": f"attachment; filename*=UTF-8''{encoded_filename}"
+        }
+    )
+
 
 @router.get("/export/issues/{project_id}")
-async def export_issues_to_excel(project_id: str):
+async def export_issues_to_excel(
+    project_id: str,
+    background: bool = Query(False, description="Run as a background job and return its job record")
+):
     """
     Export Issues to Excel file
 
@@ -209,39 +191,26 @@ async def export_issues_to_excel(project_id: str):
     - Orange highlighting for escalated items
     - All issue tracking data for the specified project
 
-    Returns downloadable Excel file
+    Returns downloadable Excel file, or with `background=true` a job (202)
+    whose file is fetched from /api/jobs/{job_id}/download
     """
-    try:
-        from urllib.parse import quote
-
-        # Create temporary file for export
-        tmp_dir = tempfile.mkdtemp()
-        output_path = os.path.join(tmp_dir, f"issues_{project_id}.xlsx")
-
-        # Export to Excel
-        result = excel_service.export_issues_to_excel(project_id, output_path)
-
-        if not result['success']:
-            raise HTTPException(status_code=400, detail=result.get('error', 'Export failed'))
-
-        if not os.path.exists(output_path):
-            raise HTTPException(status_code=500, detail="Export file was not created")
-
-        # Use URL-encoded filename for Chinese characters
-        chinese_filename = f"問題追蹤_{project_id}.xlsx"
-        encoded_filename = quote(chinese_filename)
-
-        # Return file for download
-        return FileResponse(
-            path=output_path,
-            filename=chinese_filename,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={
-                "Content-Disposition": f"attachment; filename*=UTF-8''{encoded_filename}"
-            }
-        )
+    if background:
+        return await submit_job_response('export_issues', {'project_id': project_id})
 
-    except HTTPException:
-        raise
+    try:
+        chunks = await stream_worker_output(_export_or_raise, excel_service.export_issues_to_excel, project_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+    # Use URL-encoded filename for Chinese characters
+    encoded_filename = quote(f"問題追蹤_{project_id}.xlsx")
+
+    return StreamingResponse(
+        chunks,
+        media_type=XLSX_MEDIA_TYPE,
+        headers={
+            "Content-Disposition": f"attachment; filename*=UTF-8''{encoded_filename}"
+        }
+    )
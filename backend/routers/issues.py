@@ -14,6 +14,7 @@ from backend.models.issue import (
     ResolveIssue,
 )
 from backend.services.issue_service import IssueService
+from backend.executor import run_sync
 
 router = APIRouter()
 issue_service = IssueService()
@@ -33,7 +34,7 @@ async def create_issue(issue_data: IssueCreate):
     - **reported_by**: Reporter name
     """
     try:
-        return issue_service.create_issue(issue_data)
+        return await run_sync(issue_service.create_issue, issue_data)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -49,6 +50,7 @@ async def get_issue_list(
     is_escalated: Optional[bool] = Query(None, description="Filter by escalation status"),
     skip: int = Query(0, ge=0, description="Number of items to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of items to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (replaces skip)"),
 ):
     """
     Get list of issues with optional filters
@@ -62,18 +64,24 @@ async def get_issue_list(
     - **assigned_to**: Assignee name
     - **is_escalated**: Escalation status
     """
-    items = issue_service.get_issue_list(
-        project_id=project_id,
-        status=status,
-        severity=severity,
-        priority=priority,
-        issue_type=issue_type,
-        assigned_to=assigned_to,
-        is_escalated=is_escalated,
-        skip=skip,
-        limit=limit
-    )
-    total = issue_service.get_issue_count(
+    try:
+        page = await run_sync(
+            issue_service.get_issue_list,
+            project_id=project_id,
+            status=status,
+            severity=severity,
+            priority=priority,
+            issue_type=issue_type,
+            assigned_to=assigned_to,
+            is_escalated=is_escalated,
+            skip=skip,
+            limit=limit,
+            page_cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total = await run_sync(
+        issue_service.get_issue_count,
         project_id=project_id,
         status=status,
         severity=severity,
@@ -83,7 +91,7 @@ async def get_issue_list(
         is_escalated=is_escalated
     )
 
-    return IssueListResponse(total=total, items=items)
+    return IssueListResponse(total=total, items=page.items, next_cursor=page.next_cursor)
 
 
 @router.get("/stats", response_model=IssueStats)
@@ -100,7 +108,7 @@ async def get_issue_statistics(
     - Type and category breakdown
     - Average resolution time
     """
-    return issue_service.get_issue_stats(project_id=project_id)
+    return await run_sync(issue_service.get_issue_stats, project_id=project_id)
 
 
 @router.get("/{issue_id}", response_model=IssueResponse)
@@ -108,7 +116,7 @@ async def get_issue(issue_id: int):
     """
     Get a specific issue by ID
     """
-    issue = issue_service.get_issue_by_id(issue_id)
+    issue = await run_sync(issue_service.get_issue_by_id, issue_id)
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
     return issue
@@ -119,11 +127,11 @@ async def get_issue_history(issue_id: int):
     """
     Get issue status change history
     """
-    issue = issue_service.get_issue_by_id(issue_id)
+    issue = await run_sync(issue_service.get_issue_by_id, issue_id)
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
 
-    return issue_service.get_issue_history(issue_id)
+    return await run_sync(issue_service.get_issue_history, issue_id)
 
 
 @router.put("/{issue_id}", response_model=IssueResponse)
@@ -137,12 +145,12 @@ async def update_issue(
 
     Only provided fields will be updated. All fields are optional.
     """
-    issue = issue_service.get_issue_by_id(issue_id)
+    issue = await run_sync(issue_service.get_issue_by_id, issue_id)
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
 
     try:
-        updated_issue = issue_service.update_issue(issue_id, issue_update, changed_by)
+        updated_issue = await run_sync(issue_service.update_issue, issue_id, issue_update, changed_by)
         return updated_issue
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -157,12 +165,12 @@ async def escalate_issue(issue_id: int, escalate_data: EscalateIssue):
     - **escalation_reason**: Reason for escalation
     - **changed_by**: Person who escalated
     """
-    issue = issue_service.get_issue_by_id(issue_id)
+    issue = await run_sync(issue_service.get_issue_by_id, issue_id)
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
 
     try:
-        escalated_issue = issue_service.escalate_issue(issue_id, escalate_data)
+        escalated_issue = await run_sync(issue_service.escalate_issue, issue_id, escalate_data)
         return escalated_issue
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -179,12 +187,12 @@ async def resolve_issue(issue_id: int, resolve_data: ResolveIssue):
     - **root_cause**: Root cause analysis (optional)
     - **resolved_by**: Person who resolved
     """
-    issue = issue_service.get_issue_by_id(issue_id)
+    issue = await run_sync(issue_service.get_issue_by_id, issue_id)
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
 
     try:
-        resolved_issue = issue_service.resolve_issue(issue_id, resolve_data)
+        resolved_issue = await run_sync(issue_service.resolve_issue, issue_id, resolve_data)
         return resolved_issue
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -200,12 +208,12 @@ async def close_issue(
 
     Sets status to 'Closed' and records close date
     """
-    issue = issue_service.get_issue_by_id(issue_id)
+    issue = await run_sync(issue_service.get_issue_by_id, issue_id)
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
 
     try:
-        closed_issue = issue_service.close_issue(issue_id, changed_by)
+        closed_issue = await run_sync(issue_service.close_issue, issue_id, changed_by)
         return closed_issue
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -218,6 +226,6 @@ async def delete_issue(issue_id: int):
 
     This will also delete all related status history.
     """
-    success = issue_service.delete_issue(issue_id)
+    success = await run_sync(issue_service.delete_issue, issue_id)
     if not success:
         raise HTTPException(status_code=404, detail="Issue not found")
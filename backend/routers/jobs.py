@@ -0,0 +1,125 @@
+"""
+API routes for background jobs
+"""
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, JSONResponse
+from typing import Optional, Dict, Any, BinaryIO
+from backend.models.job import JobCreate, JobResponse, JobListResponse
+from backend.services.job_service import JobService
+from backend.executor import run_sync
+
+router = APIRouter()
+job_service = JobService()
+
+
+async def submit_job_response(
+    job_type: str,
+    params: Dict[str, Any],
+    input_file: Optional[BinaryIO] = None
+) -> JSONResponse:
+    """Queue a job and answer 202 with its record (used by routes offering ?background=true)"""
+    try:
+        job = await run_sync(job_service.submit, job_type, params, input_file)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return JSONResponse(status_code=202, content=jsonable_encoder(job))
+
+
+@router.post("/", response_model=JobResponse, status_code=202)
+async def submit_job(job_data: JobCreate):
+    """
+    Submit a background job
+
+    - **job_type**: export_wbs / export_pending / export_issues / create_backup
+    - **params**: Job parameters, e.g. {"project_id": "P001"} for exports or
+      {"description": "..."} for backups
+
+    WBS imports need an uploaded file and are submitted with
+    `POST /api/excel/import/wbs?background=true`.
+    """
+    try:
+        return await run_sync(job_service.submit, job_data.job_type, job_data.params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/", response_model=JobListResponse)
+async def get_job_list(
+    status: Optional[str] = Query(None, description="Filter by status"),
+    job_type: Optional[str] = Query(None, description="Filter by job type"),
+    skip: int = Query(0, ge=0, description="Number of items to skip"),
+    limit: int = Query(50, ge=1, le=500, description="Number of items to return"),
+):
+    """
+    Get background jobs, newest first
+
+    - **status**: queued / running / completed / failed / cancelled
+    - **job_type**: Filter by job type
+    """
+    items = await run_sync(job_service.get_job_list, status=status, job_type=job_type, skip=skip, limit=limit)
+    total = await run_sync(job_service.get_job_count, status=status, job_type=job_type)
+
+    return JobListResponse(total=total, items=items)
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    """
+    Get job status, progress and result
+    """
+    job = await run_sync(job_service.get_job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+@router.post("/{job_id}/cancel", response_model=JobResponse)
+async def cancel_job(job_id: str):
+    """
+    Cancel a queued or running job
+
+    Running jobs stop at their next progress check, so the returned job may
+    still be running with cancel_requested set.
+    """
+    try:
+        job = await run_sync(job_service.cancel_job, job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+@router.get("/{job_id}/download")
+async def download_job_result(job_id: str):
+    """
+    Download the file produced by a completed job (Excel exports)
+    """
+    path = await run_sync(job_service.get_result_file, job_id)
+    if not path:
+        raise HTTPException(status_code=404, detail="No result file for this job")
+
+    return FileResponse(
+        path=str(path),
+        filename=path.name,
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        if path.suffix == '.xlsx' else "application/octet-stream"
+    )
+
+
+@router.delete("/{job_id}", status_code=204)
+async def delete_job(job_id: str):
+    """
+    Delete a finished job and its result file
+    """
+    try:
+        success = await run_sync(job_service.delete_job, job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    if not success:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return None
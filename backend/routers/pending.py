@@ -14,6 +14,7 @@ from backend.models.pending import (
     PendingWithReplies,
 )
 from backend.services.pending_service import PendingService
+from backend.executor import run_sync
 
 router = APIRouter()
 pending_service = PendingService()
@@ -32,7 +33,7 @@ async def create_pending(pending_data: PendingCreate):
     - **priority**: Priority level (High/Medium/Low)
     """
     try:
-        return pending_service.create_pending(pending_data)
+        return await run_sync(pending_service.create_pending, pending_data)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -46,6 +47,7 @@ async def get_pending_list(
     priority: Optional[str] = Query(None, description="Filter by priority"),
     skip: int = Query(0, ge=0, description="Number of items to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of items to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (replaces skip)"),
 ):
     """
     Get list of pending items with optional filters
@@ -57,17 +59,24 @@ async def get_pending_list(
     - **priority**: Filter by priority (High/Medium/Low)
     - **skip**: Pagination offset
     - **limit**: Number of items per page
+    - **cursor**: Continue after the page that returned this next_cursor
     """
-    items = pending_service.get_pending_list(
-        project_id=project_id,
-        status=status,
-        source_type=source_type,
-        is_replied=is_replied,
-        priority=priority,
-        skip=skip,
-        limit=limit
-    )
-    total = pending_service.get_pending_count(
+    try:
+        page = await run_sync(
+            pending_service.get_pending_list,
+            project_id=project_id,
+            status=status,
+            source_type=source_type,
+            is_replied=is_replied,
+            priority=priority,
+            skip=skip,
+            limit=limit,
+            page_cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total = await run_sync(
+        pending_service.get_pending_count,
         project_id=project_id,
         status=status,
         source_type=source_type,
@@ -75,7 +84,7 @@ async def get_pending_list(
         priority=priority
     )
 
-    return PendingListResponse(total=total, items=items)
+    return PendingListResponse(total=total, items=page.items, next_cursor=page.next_cursor)
 
 
 @router.get("/stats", response_model=PendingStats)
@@ -91,7 +100,7 @@ async def get_pending_statistics(
     - Priority distribution
     - Source breakdown
     """
-    return pending_service.get_pending_stats(project_id=project_id)
+    return await run_sync(pending_service.get_pending_stats, project_id=project_id)
 
 
 @router.get("/overdue", response_model=List[PendingResponse])
@@ -103,7 +112,7 @@ async def get_overdue_items(
 
     Returns items where expected_reply_date < today and is_replied = false
     """
-    return pending_service.get_overdue_items(project_id=project_id)
+    return await run_sync(pending_service.get_overdue_items, project_id=project_id)
 
 
 @router.get("/{pending_id}", response_model=PendingResponse)
@@ -111,7 +120,7 @@ async def get_pending(pending_id: int):
     """
     Get a specific pending item by ID
     """
-    pending = pending_service.get_pending_by_id(pending_id)
+    pending = await run_sync(pending_service.get_pending_by_id, pending_id)
     if not pending:
         raise HTTPException(status_code=404, detail="Pending item not found")
     return pending
@@ -124,12 +133,12 @@ async def update_pending(pending_id: int, pending_update: PendingUpdate):
 
     Only provided fields will be updated. All fields are optional.
     """
-    pending = pending_service.get_pending_by_id(pending_id)
+    pending = await run_sync(pending_service.get_pending_by_id, pending_id)
     if not pending:
         raise HTTPException(status_code=404, detail="Pending item not found")
 
     try:
-        updated_pending = pending_service.update_pending(pending_id, pending_update)
+        updated_pending = await run_sync(pending_service.update_pending, pending_id, pending_update)
         return updated_pending
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -142,12 +151,12 @@ async def mark_as_replied(pending_id: int):
 
     Sets is_replied=true, actual_reply_date=today, status='已完成'
     """
-    pending = pending_service.get_pending_by_id(pending_id)
+    pending = await run_sync(pending_service.get_pending_by_id, pending_id)
     if not pending:
         raise HTTPException(status_code=404, detail="Pending item not found")
 
     try:
-        updated_pending = pending_service.mark_as_replied(pending_id)
+        updated_pending = await run_sync(pending_service.mark_as_replied, pending_id)
         return updated_pending
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -158,7 +167,7 @@ async def delete_pending(pending_id: int):
     """
     Delete a pending item
     """
-    success = pending_service.delete_pending(pending_id)
+    success = await run_sync(pending_service.delete_pending, pending_id)
     if not success:
         raise HTTPException(status_code=404, detail="Pending item not found")
 
@@ -173,7 +182,7 @@ async def add_reply(pending_id: int, reply_data: PendingReplyCreate):
     - **reply_date**: Reply date (defaults to today)
     """
     try:
-        return pending_service.add_reply(pending_id, reply_data)
+        return await run_sync(pending_service.add_reply, pending_id, reply_data)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -188,7 +197,7 @@ async def get_replies(pending_id: int):
     Returns list of replies ordered by date (newest first)
     """
     try:
-        return pending_service.get_replies(pending_id)
+        return await run_sync(pending_service.get_replies, pending_id)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -200,7 +209,7 @@ async def get_pending_with_replies(pending_id: int):
     
     Returns the pending item along with all replies
     """
-    pending_with_replies = pending_service.get_pending_with_replies(pending_id)
+    pending_with_replies = await run_sync(pending_service.get_pending_with_replies, pending_id)
     if not pending_with_replies:
         raise HTTPException(status_code=404, detail="Pending item not found")
     return pending_with_replies
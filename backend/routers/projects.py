@@ -11,6 +11,7 @@ from backend.models.project import (
     ProjectStats,
 )
 from backend.services.project_service import ProjectService
+from backend.executor import run_sync
 
 router = APIRouter()
 project_service = ProjectService()
@@ -27,7 +28,7 @@ async def create_project(project_data: ProjectCreate):
     - **status**: Active/Completed/On Hold/Cancelled (default: Active)
     """
     try:
-        return project_service.create_project(project_data)
+        return await run_sync(project_service.create_project, project_data)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -39,6 +40,7 @@ async def get_project_list(
     status: Optional[str] = Query(None, description="Filter by status"),
     skip: int = Query(0, ge=0, description="Number of items to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of items to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (replaces skip)"),
 ):
     """
     Get list of projects with optional filters
@@ -46,16 +48,21 @@ async def get_project_list(
     - **status**: Filter by status (Active/Completed/On Hold/Cancelled)
     - **skip**: Pagination offset
     - **limit**: Number of items per page
+    - **cursor**: Continue after the page that returned this next_cursor
     """
     try:
-        items = project_service.get_project_list(
+        page = await run_sync(
+            project_service.get_project_list,
             status=status,
             skip=skip,
-            limit=limit
+            limit=limit,
+            page_cursor=cursor
         )
-        total = project_service.get_project_count(status=status)
+        total = await run_sync(project_service.get_project_count, status=status)
 
-        return ProjectListResponse(total=total, items=items)
+        return ProjectListResponse(total=total, items=page.items, next_cursor=page.next_cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except FileNotFoundError as e:
         raise HTTPException(
             status_code=500,
@@ -80,7 +87,7 @@ async def get_project(project_id: str):
 
     - **project_id**: Project identifier
     """
-    project = project_service.get_project_by_id(project_id)
+    project = await run_sync(project_service.get_project_by_id, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     return project
@@ -97,7 +104,7 @@ async def get_project_statistics(project_id: str):
     - Pending items status
     - Overall health status
     """
-    stats = project_service.get_project_stats(project_id)
+    stats = await run_sync(project_service.get_project_stats, project_id)
     if not stats:
         raise HTTPException(status_code=404, detail="Project not found")
     return stats
@@ -110,12 +117,12 @@ async def update_project(project_id: str, project_update: ProjectUpdate):
 
     Only provided fields will be updated. All fields are optional.
     """
-    project = project_service.get_project_by_id(project_id)
+    project = await run_sync(project_service.get_project_by_id, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
     try:
-        updated_project = project_service.update_project(project_id, project_update)
+        updated_project = await run_sync(project_service.update_project, project_id, project_update)
         return updated_project
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -133,6 +140,6 @@ async def delete_project(project_id: str):
 
     This operation cannot be undone.
     """
-    success = project_service.delete_project(project_id)
+    success = await run_sync(project_service.delete_project, project_id)
     if not success:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -10,6 +10,7 @@ from backend.models.wbs import (
     WBSListResponse,
 )
 from backend.services.wbs_service import WBSService
+from backend.executor import run_sync
 
 router = APIRouter()
 wbs_service = WBSService()
@@ -28,7 +29,7 @@ async def create_wbs(wbs_data: WBSCreate):
     - All date fields are optional
     """
     try:
-        return wbs_service.create_wbs(wbs_data)
+        return await run_sync(wbs_service.create_wbs, wbs_data)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -39,6 +40,7 @@ async def get_wbs_list(
     status: Optional[str] = Query(None, description="Filter by status"),
     skip: int = Query(0, ge=0, description="Number of items to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of items to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (replaces skip)"),
 ):
     """
     Get list of WBS items with optional filters
@@ -47,30 +49,44 @@ async def get_wbs_list(
     - **status**: Filter by status (未開始/進行中/已完成)
     - **skip**: Pagination offset
     - **limit**: Number of items per page
+    - **cursor**: Continue after the page that returned this next_cursor
     """
-    items = wbs_service.get_wbs_list(
-        project_id=project_id,
-        status=status,
-        skip=skip,
-        limit=limit
-    )
-    total = wbs_service.get_wbs_count(project_id=project_id)
+    try:
+        page = await run_sync(
+            wbs_service.get_wbs_list,
+            project_id=project_id,
+            status=status,
+            skip=skip,
+            limit=limit,
+            page_cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total = await run_sync(wbs_service.get_wbs_count, project_id=project_id)
 
-    return WBSListResponse(total=total, items=items)
+    return WBSListResponse(total=total, items=page.items, next_cursor=page.next_cursor)
 
 
 @router.get("/tree/{project_id}")
-async def get_wbs_tree(project_id: str):
+async def get_wbs_tree(
+    project_id: str,
+    root_id: Optional[str] = Query(None, description="Only return this item's subtree"),
+    depth: Optional[int] = Query(None, ge=1, description="Number of levels to return")
+):
     """
     Get WBS items in tree structure for a project
 
-    Returns hierarchical tree based on parent-child relationships
+    Returns hierarchical tree based on parent-child relationships. Nodes
+    below the depth limit are left out; ``has_children`` marks the nodes
+    that can be expanded with another request using ``root_id``.
     """
     try:
-        tree = wbs_service.get_wbs_tree(project_id)
-        return {"project_id": project_id, "tree": tree}
+        tree = await run_sync(wbs_service.get_wbs_tree, project_id, root_id, depth)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    if root_id and not tree:
+        raise HTTPException(status_code=404, detail="WBS item not found")
+    return {"project_id": project_id, "tree": tree}
 
 
 @router.get("/{item_id}", response_model=WBSResponse)
@@ -80,7 +96,7 @@ async def get_wbs(item_id: str):
 
     - **item_id**: Format: {project_id}_{wbs_id}
     """
-    wbs = wbs_service.get_wbs_by_id(item_id)
+    wbs = await run_sync(wbs_service.get_wbs_by_id, item_id)
     if not wbs:
         raise HTTPException(status_code=404, detail="WBS item not found")
     return wbs
@@ -93,12 +109,12 @@ async def update_wbs(item_id: str, wbs_update: WBSUpdate):
 
     Only provided fields will be updated. All fields are optional.
     """
-    wbs = wbs_service.get_wbs_by_id(item_id)
+    wbs = await run_sync(wbs_service.get_wbs_by_id, item_id)
     if not wbs:
         raise HTTPException(status_code=404, detail="WBS item not found")
 
     try:
-        updated_wbs = wbs_service.update_wbs(item_id, wbs_update)
+        updated_wbs = await run_sync(wbs_service.update_wbs, item_id, wbs_update)
         return updated_wbs
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -111,7 +127,7 @@ async def delete_wbs(item_id: str):
 
     This will also delete all related dependencies.
     """
-    success = wbs_service.delete_wbs(item_id)
+    success = await run_sync(wbs_service.delete_wbs, item_id)
     if not success:
         raise HTTPException(status_code=404, detail="WBS item not found")
 
@@ -121,11 +137,11 @@ async def get_wbs_children(item_id: str):
     """
     Get all direct children of a WBS item
     """
-    wbs = wbs_service.get_wbs_by_id(item_id)
+    wbs = await run_sync(wbs_service.get_wbs_by_id, item_id)
     if not wbs:
         raise HTTPException(status_code=404, detail="WBS item not found")
 
-    children = wbs_service.get_children(item_id)
+    children = await run_sync(wbs_service.get_children, item_id)
     return children
 
 
@@ -141,7 +157,7 @@ async def create_wbs_batch(wbs_items: List[WBSCreate]):
 
     for idx, wbs_data in enumerate(wbs_items):
         try:
-            item = wbs_service.create_wbs(wbs_data)
+            item = await run_sync(wbs_service.create_wbs, wbs_data)
             created_items.append(item)
         except Exception as e:
             errors.append({"index": idx, "wbs_id": wbs_data.wbs_id, "error": str(e)})
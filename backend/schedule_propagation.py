@@ -0,0 +1,94 @@
+"""
+Propagation of a date change through a project's dependency graph
+
+Items reachable from the changed item are visited once, in topological order,
+after all of their predecessors. Each dependency gives a bound on its
+successor's start or finish (dates are inclusive days):
+
+    FS  start  >= predecessor finish + lag + 1
+    SS  start  >= predecessor start + lag
+    FF  finish >= predecessor finish + lag
+    SF  finish >= predecessor start + lag - 1
+
+(the same constraints as the critical path, whose finishes are exclusive),
+and an item moves to the latest of its bounds and its current dates, keeping
+its duration (finish bounds become start bounds by subtracting it). Bounds
+use the new dates of predecessors that moved, so a delay carries down the
+whole chain. Items only ever move later.
+"""
+from datetime import date, timedelta
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from backend.dependency_graph import DependencyGraph, Edge
+
+
+class Shift(NamedTuple):
+    """New dates of an item and the dependency that set them"""
+    start: Optional[date]
+    end: Optional[date]
+    edge: Optional[int]
+
+
+def edge_bounds(
+    edge: Edge,
+    start: Optional[date],
+    end: Optional[date]
+) -> Tuple[Optional[date], Optional[date]]:
+    """Earliest (start, finish) an edge allows its successor, given the predecessor's dates"""
+    lag = timedelta(days=edge.lag_days)
+    kind = edge.dependency_type
+    if kind == 'SS':
+        return (start + lag if start else None), None
+    if kind == 'FF':
+        return None, (end + lag if end else None)
+    if kind == 'SF':
+        return None, (start + lag - timedelta(days=1) if start else None)
+    return (end + lag + timedelta(days=1) if end else None), None
+
+
+def propagate(
+    graph: DependencyGraph,
+    source: int,
+    start: Optional[date],
+    end: Optional[date]
+) -> Dict[int, Shift]:
+    """Items that have to move when ``source`` gets the given dates
+
+    Returns the new dates of each moved item (the source included when its
+    dates differ), keyed by item index.
+    """
+    items = graph.items
+    dates = {source: (start, end)}
+    shifts: Dict[int, Shift] = {}
+    if (start, end) != (items[source].start, items[source].end):
+        shifts[source] = Shift(start, end, None)
+
+    # Items on a cycle have no topological order; visit them last
+    order, blocked = graph.topological_order(graph.reachable(source))
+    for node in order + blocked:
+        if node == source:
+            continue
+        item = items[node]
+        duration = item.end - item.start if item.start and item.end and item.end >= item.start else None
+
+        new_start, new_end = item.start, item.end
+        binding = None
+        for e in graph.in_edges[node]:
+            edge = graph.edges[e]
+            p = edge.predecessor
+            p_start, p_end = dates[p] if p in dates else (items[p].start, items[p].end)
+            start_bound, end_bound = edge_bounds(edge, p_start, p_end)
+            if end_bound and duration is not None:
+                start_bound, end_bound = end_bound - duration, None
+            if start_bound and (new_start is None or start_bound > new_start):
+                new_start, binding = start_bound, e
+            if end_bound and (new_end is None or end_bound > new_end):
+                new_end, binding = end_bound, e
+
+        if duration is not None:
+            new_end = new_start + duration
+        dates[node] = (new_start, new_end)
+        if binding is not None:
+            shifts[node] = Shift(new_start, new_end, binding)
+
+    return shifts
@@ -1,12 +1,54 @@
 """
 Backup service for database management
+
+Backups and restores go through SQLite's online backup API, which copies
+pages inside read transactions. Backups are copied a few pages at a time with
+a short sleep in between, so live requests keep running while they are taken.
+
+The snapshot is then split into chunks of whole pages kept, compressed, in a
+content-addressed store (see backend.backup_store): a backup is a
+``backup_<timestamp>.manifest`` listing its chunks, and only chunks that no
+earlier backup stored are written. Only the storage is incremental: every
+backup still copies the whole database to a temporary file and reads and
+hashes all of it (SQLite offers no consistent way to read just the pages
+that changed; sqlite_dbpage isn't compiled in), so taking one takes time in
+proportion to the database size, not to what changed. Full
+``backup_<timestamp>.db`` copies from before can still be listed,
+downloaded and restored. Backups are recorded in
+a catalog (see backend.backup_catalog) that listing, retention and garbage
+collection read instead of the directory.
+
+Each backup records the position of the change journal it contains (see
+backend.change_journal), so the database can also be restored to any time
+after the oldest backup: the journal entries up to then are replayed on top
+of the nearest backup before it.
 """
-import shutil
+import hashlib
+import json
 import sqlite3
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Tuple
+from backend.backup_catalog import BackupCatalog, retained_backups
+from backend.backup_store import COMPRESSION_SUFFIXES, ChunkStore
+from backend.change_journal import follows, journal_position, journal_time, prune_journal, read_changes, replay_changes
 from backend.config import settings
+from backend.db_pool import get_pool
+from backend.db_writer import get_writer, stop_all_writers
+from backend.dependency_graph import clear_cached_graphs
+
+# Restarts of a stepwise copy before it is finished in one step
+_MAX_RESTARTS = 3
+
+# Held while chunks are written and collected, so garbage collection never removes
+# chunks of a backup whose manifest isn't written yet
+_store_lock = threading.Lock()
+
+
+class _BackupRestarted(Exception):
+    """Raised from the progress callback to abandon a stepwise copy"""
 
 
 class BackupService:
@@ -15,117 +57,317 @@ class BackupService:
     def __init__(self):
         self.db_path = settings.database_path
         self.backup_dir = settings.database_path.parent / "backups"
-        self.backup_dir.mkdir(exist_ok=True)
-
-    def create_backup(self, description: Optional[str] = None) -> Dict:
-        """Create a new database backup"""
+        self.store = ChunkStore(self.backup_dir / "chunks", settings.backup_compression)
+        self.catalog = BackupCatalog(self.backup_dir)
+
+    def create_backup(
+        self,
+        description: Optional[str] = None,
+        kind: str = "manual",
+        skip_unchanged: bool = False
+    ) -> Optional[Dict]:
+        """Create a new database backup
+
+        ``kind`` is manual, scheduled or pre-restore; retention only prunes
+        scheduled backups. With ``skip_unchanged``, nothing is recorded (and
+        None returned) when the database is identical to the latest backup
+        of the same kind.
+
+        The whole database is copied and hashed each time; only the chunks
+        not stored before are written.
+
+        Raises RuntimeError (and keeps nothing) if the snapshot fails its
+        integrity check.
+        """
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_filename = f"backup_{timestamp}.db"
+        # Backups within the same second (e.g. the one before a restore) get a suffix
+        name, n = f"backup_{timestamp}", 1
+        while (self.backup_dir / f"{name}.manifest").exists():
+            n += 1
+            name = f"backup_{timestamp}_{n}"
+        backup_filename = f"{name}.manifest"
         backup_path = self.backup_dir / backup_filename
-
-        # Create backup by copying database file
-        shutil.copy2(self.db_path, backup_path)
-
-        # Get database stats
-        file_size = backup_path.stat().st_size
-
-        # Store metadata in a separate file
-        metadata_path = self.backup_dir / f"backup_{timestamp}.meta"
-        metadata = {
-            "filename": backup_filename,
-            "created_at": datetime.now().isoformat(),
-            "description": description or "Manual backup",
-            "size": file_size,
-            "original_path": str(self.db_path)
-        }
-
-        with open(metadata_path, 'w') as f:
-            import json
-            json.dump(metadata, f, indent=2)
+        temp_path = self.backup_dir / f"{name}.tmp"
+
+        try:
+            self._copy(self.db_path, temp_path, pages=settings.backup_pages_per_step)
+            conn = sqlite3.connect(str(temp_path))
+            try:
+                # A standalone file: no -wal/-shm next to it
+                conn.execute("PRAGMA journal_mode=DELETE")
+                integrity = self._integrity_check(conn)
+                page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+                position = journal_position(conn)
+            finally:
+                conn.close()
+            if integrity != "ok":
+                raise RuntimeError(f"Backup failed integrity check: {integrity}")
+
+            with _store_lock:
+                with open(temp_path, 'rb') as f:
+                    stored = self.store.write_file(f, page_size * settings.backup_chunk_pages)
+                if skip_unchanged:
+                    latest = self.catalog.latest(kind)
+                    if latest and latest["sha256"] == stored.sha256:
+                        return None
+                manifest = {
+                    "filename": backup_filename,
+                    "created_at": datetime.now().isoformat(),
+                    "kind": kind,
+                    "description": description or "Manual backup",
+                    "size": stored.size,
+                    "sha256": stored.sha256,
+                    "compression": self.store.compression,
+                    "compressed_size": stored.stored_size,
+                    "compression_ratio": round(stored.size / max(stored.stored_size, 1), 2),
+                    "stored_size": stored.written,
+                    "original_path": str(self.db_path),
+                    "integrity_check": integrity,
+                    "page_size": page_size,
+                    "journal_id": position[0] if position else None,
+                    "journal_at": position[1] if position else None,
+                    "chunks": stored.chunks
+                }
+                self._write_manifest(backup_path, manifest)
+                self.catalog.add(manifest, stored.chunks)
+        finally:
+            temp_path.unlink(missing_ok=True)
 
         return {
             "filename": backup_filename,
             "path": str(backup_path),
-            "size": file_size,
-            "created_at": metadata["created_at"],
-            "description": metadata["description"]
+            "size": manifest["size"],
+            "stored_size": manifest["stored_size"],
+            "compression_ratio": manifest["compression_ratio"],
+            "created_at": manifest["created_at"],
+            "kind": kind,
+            "description": manifest["description"]
         }
 
-    def list_backups(self) -> List[Dict]:
-        """List all available backups"""
-        backups = []
-
-        for backup_file in sorted(self.backup_dir.glob("backup_*.db"), reverse=True):
-            # Try to load metadata
-            meta_file = backup_file.with_suffix('.meta')
-            metadata = {}
-
-            if meta_file.exists():
-                try:
-                    import json
-                    with open(meta_file, 'r') as f:
-                        metadata = json.load(f)
-                except Exception:
-                    pass
+    def _write_manifest(self, path: Path, manifest: Dict):
+        temp_path = path.with_suffix('.manifest-tmp')
+        with open(temp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        temp_path.replace(path)
 
-            # Get file stats
-            stat = backup_file.stat()
+    def _read_manifest(self, path: Path) -> Dict:
+        with open(path, 'r') as f:
+            return json.load(f)
 
-            backups.append({
-                "filename": backup_file.name,
-                "path": str(backup_file),
-                "size": metadata.get("size", stat.st_size),
-                "created_at": metadata.get("created_at", datetime.fromtimestamp(stat.st_mtime).isoformat()),
-                "description": metadata.get("description", "Backup"),
-                "can_restore": True
-            })
-
-        return backups
+    def list_backups(self) -> List[Dict]:
+        """List all available backups (newest first)"""
+        return [
+            {**backup, "path": str(self.backup_dir / backup["filename"]), "can_restore": True}
+            for backup in self.catalog.list()
+        ]
 
     def get_backup(self, filename: str) -> Optional[Path]:
-        """Get backup file path"""
+        """Get backup file path (a full copy or a manifest)"""
         backup_path = self.backup_dir / filename
 
-        if backup_path.exists() and backup_path.suffix == '.db':
+        if (Path(filename).name == filename and backup_path.exists()
+                and backup_path.suffix in ('.db', '.manifest')):
             return backup_path
 
         return None
 
+    def open_download(self, filename: str) -> Tuple[str, Iterator[bytes], Optional[str]]:
+        """Download name, compressed contents and SHA-256 (of the database
+        file) of a chunked backup
+        """
+        backup_path = self.get_backup(filename)
+        if backup_path is None or backup_path.suffix != '.manifest':
+            raise ValueError(f"Backup {filename} not found")
+
+        manifest = self._read_manifest(backup_path)
+        compression = manifest.get("compression", "none")
+        name = f"{backup_path.stem}.db{COMPRESSION_SUFFIXES[compression]}"
+        return name, self.store.read_compressed(manifest["chunks"], compression), manifest.get("sha256")
+
     def delete_backup(self, filename: str) -> bool:
-        """Delete a backup file"""
-        backup_path = self.backup_dir / filename
-        meta_path = backup_path.with_suffix('.meta')
+        """Delete a backup and the chunks only it used"""
+        if not self._delete(filename):
+            return False
+        self.collect_garbage()
+        return True
 
-        if not backup_path.exists():
+    def _delete(self, filename: str) -> bool:
+        backup_path = self.get_backup(filename)
+
+        if backup_path is None:
             return False
 
         # Delete backup file
         backup_path.unlink()
 
         # Delete metadata if exists
+        meta_path = backup_path.with_suffix('.meta')
         if meta_path.exists():
             meta_path.unlink()
 
+        self.catalog.remove([filename])
         return True
 
+    def collect_garbage(self) -> Dict:
+        """Delete chunks no cataloged backup uses"""
+        with _store_lock:
+            chunks, size = self.store.collect_garbage(self.catalog.referenced_chunks())
+        return {"deleted_chunks": chunks, "freed_size": size}
+
     def restore_backup(self, filename: str) -> bool:
-        """Restore database from backup"""
-        backup_path = self.backup_dir / filename
+        """Restore database from backup
+
+        Raises ValueError if the backup is incomplete or fails its integrity
+        check.
+        """
+        backup_path = self.get_backup(filename)
 
-        if not backup_path.exists():
+        if backup_path is None:
             return False
 
-        # Create a backup of current database before restore
-        self.create_backup(description="Auto-backup before restore")
+        # Reassemble chunked backups into a database file first
+        source_path = backup_path
+        if backup_path.suffix == '.manifest':
+            source_path = backup_path.with_suffix('.restore-tmp')
 
-        # Restore by copying backup over current database
-        shutil.copy2(backup_path, self.db_path)
+        try:
+            if source_path != backup_path:
+                self._reassemble(backup_path, source_path)
+            self._replace_database(source_path, filename)
+        finally:
+            if source_path != backup_path:
+                source_path.unlink(missing_ok=True)
 
         return True
 
+    def restore_to_time(self, to_time: datetime, filename: Optional[str] = None) -> Optional[Dict]:
+        """Restore the database as it was at ``to_time``
+
+        The journaled tables get the write jobs finished by ``to_time``
+        replayed on top of the newest backup before it, or of backup
+        ``filename``; other tables are as in that backup. Returns None if
+        ``filename`` doesn't exist.
+
+        Raises ValueError if there is no backup to start from, or it is
+        incomplete or fails its integrity check.
+        """
+        until = journal_time(to_time)
+        if filename is None:
+            candidates = self.catalog.recovery_bases(until)
+        else:
+            backup_path = self.get_backup(filename)
+            if backup_path is None:
+                return None
+            candidates = [self._read_manifest(backup_path)] if backup_path.suffix == '.manifest' else []
+
+        base = changes = None
+        conn = get_pool(self.db_path).acquire()
+        try:
+            for candidate in candidates:
+                journal_id, journal_at = candidate.get("journal_id"), candidate.get("journal_at")
+                if (journal_id is not None and (journal_at or '') <= until
+                        and follows(conn, journal_id, journal_at)):
+                    base = candidate["filename"]
+                    changes = read_changes(conn, journal_id, until)
+                    break
+        finally:
+            conn.close()
+        if base is None:
+            raise ValueError(f"No backup to restore the database at {until} from")
+
+        backup_path = self.backup_dir / base
+        source_path = backup_path.with_suffix('.restore-tmp')
+        try:
+            self._reassemble(backup_path, source_path)
+            conn = sqlite3.connect(str(source_path))
+            try:
+                replay_changes(conn, changes)
+                conn.commit()
+            finally:
+                conn.close()
+            self._replace_database(source_path, base)
+        finally:
+            source_path.unlink(missing_ok=True)
+
+        return {"base": base, "to_time": until, "replayed": len(changes)}
+
+    def _reassemble(self, manifest_path: Path, target: Path):
+        """Write the database file of a chunked backup"""
+        # Chunks are decompressed one at a time as they are written
+        manifest = self._read_manifest(manifest_path)
+        file_hash = hashlib.sha256()
+        with open(target, 'wb') as f:
+            for data in self.store.read_file(manifest["chunks"]):
+                file_hash.update(data)
+                f.write(data)
+        if target.stat().st_size != manifest["size"]:
+            raise ValueError(f"Backup {manifest_path.name} is incomplete")
+        if manifest.get("sha256", file_hash.hexdigest()) != file_hash.hexdigest():
+            raise ValueError(f"Backup {manifest_path.name} does not match its checksum")
+
+    def _replace_database(self, source_path: Path, filename: str):
+        """Copy a database file over the live database"""
+        conn = sqlite3.connect(str(source_path))
+        try:
+            integrity = self._integrity_check(conn)
+        finally:
+            conn.close()
+        if integrity != "ok":
+            raise ValueError(f"Backup {filename} failed integrity check: {integrity}")
+
+        # Create a backup of current database before restore
+        self.create_backup(description="Auto-backup before restore", kind="pre-restore")
+
+        # Let queued writes finish, then copy every page in one step so
+        # connections still open never see a half-restored database
+        stop_all_writers()
+        self._copy(source_path, self.db_path, pages=-1)
+        clear_cached_graphs()
+
+    def _copy(self, source: Path, target: Path, pages: int):
+        """Copy a database with the SQLite backup API, ``pages`` pages per step
+
+        Writes from other connections restart a stepwise copy; after a few
+        restarts the rest is copied in one step, which under WAL holds only
+        a read snapshot of the source and doesn't block writers either.
+        """
+        timeout = settings.sqlite_busy_timeout_ms / 1000
+        src = sqlite3.connect(str(source), timeout=timeout)
+        dst = sqlite3.connect(str(target), timeout=timeout)
+        remaining_before = None
+        restarts = 0
+
+        def step(status, remaining, total):
+            nonlocal remaining_before, restarts
+            if remaining_before is not None and remaining > remaining_before:
+                restarts += 1
+                if restarts > _MAX_RESTARTS:
+                    raise _BackupRestarted()
+            remaining_before = remaining
+            if remaining:
+                time.sleep(settings.backup_step_sleep)
+
+        try:
+            try:
+                src.backup(dst, pages=pages, progress=step)
+            except _BackupRestarted:
+                src.backup(dst)
+        finally:
+            dst.close()
+            src.close()
+
+    def _integrity_check(self, conn: sqlite3.Connection) -> str:
+        """'ok', or the problems PRAGMA integrity_check reports"""
+        try:
+            rows = conn.execute("PRAGMA integrity_check").fetchall()
+        except sqlite3.DatabaseError as e:
+            return str(e)
+        return "; ".join(row[0] for row in rows)
+
     def get_database_stats(self) -> Dict:
         """Get current database statistics"""
-        conn = sqlite3.connect(str(self.db_path))
+        conn = get_pool(self.db_path).acquire()
         cursor = conn.cursor()
 
         stats = {
@@ -160,7 +402,37 @@ class BackupService:
 
         deleted_count = 0
         for backup in backups[keep_count:]:
-            if self.delete_backup(backup["filename"]):
+            if self._delete(backup["filename"]):
                 deleted_count += 1
 
+        self.collect_garbage()
+
         return deleted_count
+
+    def apply_retention(self, now: Optional[datetime] = None) -> int:
+        """Delete scheduled backups outside the daily/weekly/monthly retention"""
+        scheduled = self.catalog.list(kind="scheduled")
+        keep = retained_backups(
+            scheduled, now or datetime.now(),
+            days=settings.backup_daily_retention_days,
+            weeks=settings.backup_weekly_retention_weeks,
+            months=settings.backup_monthly_retention_months
+        )
+
+        deleted_count = 0
+        for backup in scheduled:
+            if backup["filename"] not in keep and self._delete(backup["filename"]):
+                deleted_count += 1
+
+        if deleted_count:
+            self.collect_garbage()
+
+        return deleted_count
+
+    def prune_journal(self) -> int:
+        """Delete change journal entries older than every backup, which no
+        restore can replay any more"""
+        oldest = self.catalog.oldest_journal_id()
+        if not oldest:
+            return 0
+        return get_writer(self.db_path).execute(prune_journal, oldest)
@@ -0,0 +1,183 @@
+"""
+Business logic service for the dashboard summary
+"""
+from datetime import date, timedelta
+from typing import Optional
+from backend.config import settings
+from backend.db_pool import get_pool
+from backend.project_stats import load_project_stats
+from backend.models.dashboard import (
+    DashboardSummary, DashboardItem, DashboardItemList,
+    ProjectCounts, WBSCounts, PendingCounts, IssueCounts, DependencyCounts
+)
+
+_WBS_END = "COALESCE(NULLIF(revised_planned_end, ''), original_planned_end)"
+_WBS_START = "COALESCE(NULLIF(revised_planned_start, ''), original_planned_start)"
+
+# Open WBS items, pending items and issues with their due dates; the lists
+# below filter this on the due date
+_OPEN_ITEMS_QUERY = f"""
+    SELECT 'WBS' AS type, item_id AS id, wbs_id AS code, task_name AS name,
+           status, project_id, {_WBS_END} AS date
+    FROM tracking_items
+    WHERE item_type = 'WBS' AND status IS NOT '已完成'
+      {{project_filter}}
+    UNION ALL
+    SELECT 'Pending', CAST(pending_id AS TEXT), CAST(pending_id AS TEXT), description,
+           status, project_id, expected_completion_date
+    FROM pending_items
+    WHERE status IS NOT '已完成'
+      {{project_filter}}
+    UNION ALL
+    SELECT 'Issue', CAST(issue_id AS TEXT), issue_number, issue_title,
+           status, project_id, target_resolution_date
+    FROM issue_tracking
+    WHERE COALESCE(status, '') NOT IN ('Resolved', 'Closed')
+      {{project_filter}}
+"""
+
+_SHOULD_START_QUERY = f"""
+    SELECT 'WBS' AS type, item_id AS id, wbs_id AS code, task_name AS name,
+           status, project_id, {_WBS_START} AS date
+    FROM tracking_items
+    WHERE item_type = 'WBS' AND status IS NOT '已完成'
+      {{project_filter}}
+      AND (actual_start_date IS NULL OR actual_start_date = '' OR status = '未開始')
+"""
+
+
+class DashboardService:
+    """Service for building the dashboard summary with aggregate queries"""
+
+    def __init__(self):
+        self.db_path = str(settings.database_path)
+
+    def _get_connection(self):
+        """Get database connection from the shared pool"""
+        return get_pool(self.db_path).acquire()
+
+    def _item_list(self, cursor, query: str, condition: str, params: dict, order: str) -> DashboardItemList:
+        """First ``limit`` matching rows of query plus the number of matches"""
+        cursor.execute(f"""
+            SELECT *, COUNT(*) OVER () AS total
+            FROM ({query})
+            WHERE date > '' AND {condition}
+            ORDER BY {order}
+            LIMIT :limit
+        """, params)
+        rows = cursor.fetchall()
+
+        today = params['today']
+        items = []
+        for row in rows:
+            item = DashboardItem(**{k: row[k] for k in row.keys() if k != 'total'})
+            if row['date'] and row['date'] > today:
+                try:
+                    item.days_until_due = (date.fromisoformat(row['date']) - date.fromisoformat(today)).days
+                except ValueError:
+                    pass
+            items.append(item)
+
+        return DashboardItemList(total=rows[0]['total'] if rows else 0, items=items)
+
+    def get_summary(self, project_id: Optional[str] = None, limit: Optional[int] = None) -> DashboardSummary:
+        """Get counts and the first items of the overdue/should-start/due lists"""
+        today = date.today()
+        params = {
+            'project_id': project_id,
+            'today': today.isoformat(),
+            'week_end': (today + timedelta(days=7)).isoformat(),
+            'limit': limit or settings.dashboard_list_limit,
+        }
+
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        # Status counts come from the materialized project statistics
+        wbs = load_project_stats(conn, project_id, "wbs_")
+        pending = load_project_stats(conn, project_id, "pending_")
+        issues = load_project_stats(conn, project_id, "issue_")
+
+        project_filter = "AND project_id = :project_id" if project_id else ""
+        open_items = _OPEN_ITEMS_QUERY.format(project_filter=project_filter)
+        should_start_items = _SHOULD_START_QUERY.format(project_filter=project_filter)
+
+        cursor.execute(f"""
+            SELECT COUNT(*) AS total,
+                   SUM(CASE WHEN status IN ('Active', '進行中') THEN 1 ELSE 0 END) AS active
+            FROM projects
+            WHERE 1=1 {project_filter}
+        """, params)
+        project_row = cursor.fetchone()
+
+        if project_id:
+            cursor.execute("""
+                SELECT COUNT(*) AS total,
+                       SUM(CASE WHEN d.is_active = 1 THEN 1 ELSE 0 END) AS active
+                FROM item_dependencies d
+                JOIN tracking_items t ON t.item_id = d.predecessor_id
+                WHERE t.project_id = :project_id
+            """, params)
+        else:
+            cursor.execute("""
+                SELECT COUNT(*) AS total,
+                       SUM(CASE WHEN is_active = 1 THEN 1 ELSE 0 END) AS active
+                FROM item_dependencies
+            """)
+        dependency_row = cursor.fetchone()
+
+        overdue = self._item_list(
+            cursor, open_items, "date < :today", params, "date, type, id"
+        )
+        should_start = self._item_list(
+            cursor, should_start_items, "date <= :today", params, "date, id"
+        )
+        due_today = self._item_list(
+            cursor, open_items, "date = :today", params, "type, id"
+        )
+        due_soon = self._item_list(
+            cursor, open_items, "date > :today AND date <= :week_end", params, "date, type, id"
+        )
+
+        cursor.execute(f"""
+            SELECT type, COUNT(*) FROM ({open_items})
+            WHERE date > '' AND date < :today
+            GROUP BY type
+        """, params)
+        overdue_by_type = {row[0]: row[1] for row in cursor.fetchall()}
+
+        conn.close()
+
+        return DashboardSummary(
+            as_of=today,
+            projects=ProjectCounts(total=project_row['total'], active=project_row['active'] or 0),
+            wbs=WBSCounts(
+                total=wbs.count('wbs_status'),
+                completed=wbs.count('wbs_status', '已完成'),
+                in_progress=wbs.count('wbs_status', '進行中'),
+                not_started=wbs.count('wbs_status', '未開始'),
+                overdue=overdue_by_type.get('WBS', 0),
+            ),
+            pending=PendingCounts(
+                total=pending.count('pending_status'),
+                pending=pending.count('pending_status', '待處理'),
+                in_progress=pending.count('pending_status', '處理中'),
+                completed=pending.count('pending_status', '已完成'),
+                overdue=overdue_by_type.get('Pending', 0),
+            ),
+            issues=IssueCounts(
+                total=issues.count('issue_status'),
+                open=issues.count('issue_status', 'Open'),
+                in_progress=issues.count('issue_status', 'In Progress'),
+                resolved=issues.count('issue_status', 'Resolved', 'Closed'),
+                critical=issues.count('issue_open_critical'),
+            ),
+            dependencies=DependencyCounts(
+                total=dependency_row['total'],
+                active=dependency_row['active'] or 0,
+            ),
+            overdue=overdue,
+            should_start=should_start,
+            due_today=due_today,
+            due_soon=due_soon,
+        )
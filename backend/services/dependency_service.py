@@ -1,19 +1,53 @@
 """
 Business logic service for Item Dependencies
 """
-import sqlite3
-from datetime import date, datetime, timedelta
-from typing import List, Optional, Dict, Any, Set
+import json
+from datetime import date, datetime
+from typing import List, Optional, Dict, Any
 from backend.config import settings
+from backend.db_pool import get_pool
+from backend.db_writer import get_writer
+from backend.pagination import Keyset, Page, SortKey, paginate
+from backend.dependency_graph import (
+    DependencyGraph, GraphItem, get_dependency_graph, graph_revisions,
+    load_cached_graph, load_dependency_graph, parse_date, replace_cached_graph
+)
+from backend.critical_path import CriticalPath, get_critical_path
+from backend.schedule_propagation import propagate
 from backend.models.dependency import (
     DependencyCreate,
     DependencyUpdate,
     DependencyResponse,
     ScheduleAdjustmentSuggestion,
-    ScheduleImpactAnalysis
+    ScheduleImpactAnalysis,
+    CriticalPathItem,
+    CriticalPathResponse,
+    DependencyValidationResponse,
+    ScheduleChangeRequest,
+    ScheduledItem,
+    ScheduleChangeResult
 )
 
 
+# Sort order of dependency lists (newest first)
+DEPENDENCY_KEYSET = Keyset(SortKey("d.created_at", descending=True), SortKey("d.dependency_id", descending=True))
+
+# Date fields a schedule change may set (they take precedence over the original plan)
+SCHEDULE_FIELDS = ('revised_planned_start', 'revised_planned_end')
+
+
+def _iso(value: Optional[date]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+class DependencyCycleError(ValueError):
+    """Raised when a dependency would make an item depend on itself"""
+
+    def __init__(self, path: List[str]):
+        self.path = path
+        super().__init__(f"Dependency would create a cycle: {' → '.join(path)}")
+
+
 class DependencyService:
     """Service for managing item dependencies"""
 
@@ -21,30 +55,105 @@ class DependencyService:
         self.db_path = str(settings.database_path)
 
     def _get_connection(self):
-        """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get database connection from the shared pool"""
+        return get_pool(self.db_path).acquire()
+
+    def _graph_for_write(self, conn, item_id: str):
+        """Graph of the item's project as seen inside the write transaction
+
+        Returns (project_id, revisions, graph), or Nones for an unknown item.
+        """
+        row = conn.execute("SELECT project_id FROM tracking_items WHERE item_id = ?", (item_id,)).fetchone()
+        if not row:
+            return None, None, None
+        project_id = row[0] or ''
+        revisions, graph = load_cached_graph(conn, project_id, store=False)
+        return project_id, revisions, graph
+
+    def _check_cycle(self, conn, graph: DependencyGraph, predecessor_id: str, successor_id: str):
+        """Raise DependencyCycleError if the successor already leads back to the predecessor
+
+        Searches the predecessor's project graph, or the dependencies
+        themselves when the successor's dependencies lead into other projects,
+        whose edges among their own items the graph doesn't hold.
+        """
+        if predecessor_id == successor_id:
+            raise DependencyCycleError([predecessor_id, successor_id])
+        source = graph.index.get(successor_id)
+        target = graph.index.get(predecessor_id)
+        if target is None:
+            return
+
+        project_id = graph.items[target].project_id or ''
+        if source is not None and all(
+            (graph.items[i].project_id or '') == project_id for i in graph.reachable(source)
+        ):
+            path = [graph.items[i].item_id for i in graph.find_path(source, target) or []]
+        else:
+            path = self._find_path_across_projects(conn, successor_id, predecessor_id)
+        if path:
+            raise DependencyCycleError([predecessor_id] + path)
+
+    def _find_path_across_projects(self, conn, source_id: str, target_id: str) -> Optional[List[str]]:
+        """Item ids along active dependencies from source to target, in any project"""
+        parents = {source_id: None}
+        frontier = [source_id]
+        while frontier:
+            rows = conn.execute("""
+                SELECT predecessor_id, successor_id FROM item_dependencies
+                WHERE predecessor_id IN (SELECT value FROM json_each(?)) AND +is_active = 1
+            """, (json.dumps(frontier),)).fetchall()
+            frontier = []
+            for predecessor, successor in rows:
+                if successor in parents:
+                    continue
+                parents[successor] = predecessor
+                if successor == target_id:
+                    path = [successor]
+                    while parents[path[-1]] is not None:
+                        path.append(parents[path[-1]])
+                    return path[::-1]
+                frontier.append(successor)
+        return None
 
     def create_dependency(self, dep_data: DependencyCreate) -> DependencyResponse:
-        """Create a new dependency"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        """Create a new dependency
 
-        cursor.execute("""
-            INSERT INTO item_dependencies (
-                predecessor_id, successor_id, dependency_type,
-                lag_days, impact_level, impact_description, is_active
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            dep_data.predecessor_id, dep_data.successor_id, dep_data.dependency_type,
-            dep_data.lag_days, dep_data.impact_level, dep_data.impact_description,
-            dep_data.is_active
-        ))
-
-        dependency_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        Raises DependencyCycleError if the new dependency would close a cycle.
+        """
+        def _insert(conn):
+            cursor = conn.cursor()
+
+            project_id, revisions, graph = None, None, None
+            if dep_data.is_active:
+                project_id, revisions, graph = self._graph_for_write(conn, dep_data.predecessor_id)
+                if graph is not None:
+                    self._check_cycle(conn, graph, dep_data.predecessor_id, dep_data.successor_id)
+                elif dep_data.predecessor_id == dep_data.successor_id:
+                    raise DependencyCycleError([dep_data.predecessor_id, dep_data.successor_id])
+
+            cursor.execute("""
+                INSERT INTO item_dependencies (
+                    predecessor_id, successor_id, dependency_type,
+                    lag_days, impact_level, impact_description, is_active
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (
+                dep_data.predecessor_id, dep_data.successor_id, dep_data.dependency_type,
+                dep_data.lag_days, dep_data.impact_level, dep_data.impact_description,
+                dep_data.is_active
+            ))
+
+            after = graph_revisions(conn, revisions) if graph is not None else None
+            return cursor.lastrowid, project_id, revisions, after, graph
+
+        dependency_id, project_id, revisions, after, graph = get_writer(self.db_path).execute(_insert)
+
+        # Hand the next check the graph with this edge instead of a reload
+        if graph is not None and dep_data.successor_id in graph.index:
+            replace_cached_graph(project_id, revisions, after, graph.with_dependency(
+                dependency_id, dep_data.predecessor_id, dep_data.successor_id,
+                dep_data.dependency_type, dep_data.lag_days, dep_data.impact_level
+            ))
 
         return self.get_dependency_by_id(dependency_id)
 
@@ -80,9 +189,14 @@ class DependencyService:
         item_id: Optional[str] = None,
         active_only: bool = True,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[DependencyResponse]:
-        """Get list of dependencies with filters"""
+        limit: int = 100,
+        page_cursor: Optional[str] = None
+    ) -> Page:
+        """Get list of dependencies with filters
+
+        ``page_cursor`` (a previous page's next_cursor) continues after that
+        page and takes precedence over ``skip``.
+        """
         conn = self._get_connection()
         cursor = conn.cursor()
 
@@ -111,14 +225,20 @@ class DependencyService:
             query += " AND (d.predecessor_id = ? OR d.successor_id = ?)"
             params.extend([item_id, item_id])
 
-        query += " ORDER BY d.created_at DESC LIMIT ? OFFSET ?"
-        params.extend([limit, skip])
+        if page_cursor:
+            condition, cursor_params = DEPENDENCY_KEYSET.after(page_cursor)
+            query += f" AND {condition}"
+            params.extend(cursor_params)
+            skip = 0
+
+        query += f" ORDER BY {DEPENDENCY_KEYSET.order_by()} LIMIT ? OFFSET ?"
+        params.extend([limit + 1, skip])
 
         cursor.execute(query, params)
-        rows = cursor.fetchall()
+        rows, next_cursor = paginate(cursor.fetchall(), limit, DEPENDENCY_KEYSET)
         conn.close()
 
-        return [DependencyResponse(**dict(row)) for row in rows]
+        return Page([DependencyResponse(**dict(row)) for row in rows], next_cursor)
 
     def get_dependencies_count(
         self,
@@ -156,9 +276,6 @@ class DependencyService:
 
     def update_dependency(self, dependency_id: int, dep_update: DependencyUpdate) -> Optional[DependencyResponse]:
         """Update dependency"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
         update_fields = []
         params = []
 
@@ -178,28 +295,37 @@ class DependencyService:
 
         query = f"UPDATE item_dependencies SET {', '.join(update_fields)} WHERE dependency_id = ?"
 
-        cursor.execute(query, params)
-        conn.commit()
-        conn.close()
+        def _update(conn):
+            # Reactivating a dependency adds it back to the graph
+            if update_data.get('is_active'):
+                row = conn.execute("""
+                    SELECT predecessor_id, successor_id, is_active
+                    FROM item_dependencies WHERE dependency_id = ?
+                """, (dependency_id,)).fetchone()
+                if row and not row[2]:
+                    _, _, graph = self._graph_for_write(conn, row[0])
+                    if graph is not None:
+                        self._check_cycle(conn, graph, row[0], row[1])
+            conn.execute(query, params)
+
+        get_writer(self.db_path).execute(_update)
 
         return self.get_dependency_by_id(dependency_id)
 
     def delete_dependency(self, dependency_id: int) -> bool:
         """Delete dependency"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        def _delete(conn):
+            cursor = conn.cursor()
 
-        cursor.execute("SELECT dependency_id FROM item_dependencies WHERE dependency_id = ?", (dependency_id,))
-        if not cursor.fetchone():
-            conn.close()
-            return False
+            cursor.execute("SELECT dependency_id FROM item_dependencies WHERE dependency_id = ?", (dependency_id,))
+            if not cursor.fetchone():
+                return False
 
-        cursor.execute("DELETE FROM item_dependencies WHERE dependency_id = ?", (dependency_id,))
+            cursor.execute("DELETE FROM item_dependencies WHERE dependency_id = ?", (dependency_id,))
 
-        conn.commit()
-        conn.close()
+            return True
 
-        return True
+        return get_writer(self.db_path).execute(_delete)
 
     def get_successors(self, item_id: str, active_only: bool = True) -> List[DependencyResponse]:
         """Get all items that depend on this item (successors)"""
@@ -268,119 +394,154 @@ class DependencyService:
 
         return dict(row) if row else None
 
-    def _calculate_suggested_date(
-        self,
-        dependency: DependencyResponse,
-        predecessor_item: Dict[str, Any]
-    ) -> tuple[Optional[date], Optional[date]]:
-        """Calculate suggested dates based on dependency type"""
-        dep_type = dependency.dependency_type
-        lag = dependency.lag_days
-
-        # Get effective dates (use revised if available, otherwise original)
-        pred_start = predecessor_item.get('revised_planned_start') or predecessor_item.get('original_planned_start')
-        pred_end = predecessor_item.get('revised_planned_end') or predecessor_item.get('original_planned_end')
-
-        if not pred_start or not pred_end:
-            return None, None
-
-        # Parse dates
-        if isinstance(pred_start, str):
-            pred_start = datetime.strptime(pred_start, '%Y-%m-%d').date()
-        if isinstance(pred_end, str):
-            pred_end = datetime.strptime(pred_end, '%Y-%m-%d').date()
-
-        suggested_start = None
-        suggested_end = None
-
-        if dep_type == 'FS':  # Finish-to-Start
-            suggested_start = pred_end + timedelta(days=lag + 1)
-        elif dep_type == 'SS':  # Start-to-Start
-            suggested_start = pred_start + timedelta(days=lag)
-        elif dep_type == 'FF':  # Finish-to-Finish
-            # Need to know successor duration to calculate start
-            pass
-        elif dep_type == 'SF':  # Start-to-Finish
-            suggested_end = pred_start + timedelta(days=lag)
-
-        return suggested_start, suggested_end
+    def load_graph(self, project_id: str) -> DependencyGraph:
+        """Load the dependency graph of a project"""
+        conn = self._get_connection()
+        try:
+            return load_dependency_graph(conn, project_id)
+        finally:
+            conn.close()
+
+    def _critical_path(self, project_id: str) -> CriticalPath:
+        """CPM result of a project (cached until its graph changes)"""
+        conn = self._get_connection()
+        try:
+            return get_critical_path(conn, project_id)
+        finally:
+            conn.close()
+
+    def get_critical_path(self, project_id: str) -> CriticalPathResponse:
+        """Get early/late dates, float and the critical path of a project"""
+        cpm = self._critical_path(project_id)
+        graph = cpm.graph
+
+        items = []
+        for i in cpm.order:
+            item = graph.items[i]
+            items.append(CriticalPathItem(
+                item_id=item.item_id,
+                project_id=item.project_id,
+                wbs_id=item.wbs_id,
+                task_name=item.task_name,
+                duration_days=cpm.duration[i],
+                early_start=cpm.start_date(cpm.early_start[i]),
+                early_finish=cpm.finish_date(i, cpm.early_finish[i]),
+                late_start=cpm.start_date(cpm.late_start[i]),
+                late_finish=cpm.finish_date(i, cpm.late_finish[i]),
+                total_float=cpm.total_float(i),
+                is_critical=cpm.is_critical(i)
+            ))
+
+        return CriticalPathResponse(
+            project_id=project_id,
+            project_start=cpm.origin,
+            project_finish=cpm.start_date(max(cpm.finish - 1, 0)),
+            critical_path=[graph.items[i].item_id for i in cpm.critical_path()],
+            items=items,
+            cyclic_items=[graph.items[i].item_id for i in cpm.blocked]
+        )
+
+    def validate_project_graph(self, project_id: str) -> DependencyValidationResponse:
+        """Audit a project's active dependencies for cycles and missing items"""
+        conn = self._get_connection()
+        try:
+            graph = get_dependency_graph(conn, project_id)
+        finally:
+            conn.close()
+
+        cycles = graph.cache.get('cycles')
+        if cycles is None:
+            cycles = graph.cache['cycles'] = graph.cycles()
+
+        return DependencyValidationResponse(
+            project_id=project_id,
+            total_dependencies=len(graph.edges) + len(graph.dangling),
+            is_valid=not cycles and not graph.dangling,
+            cycles=[[graph.items[i].item_id for i in cycle] for cycle in cycles],
+            dangling_dependencies=graph.dangling
+        )
+
+    def _changed_dates(self, item: GraphItem, date_changes: Dict[str, Any]):
+        """Start and end of an item with date_changes ({'field', 'new_value'}) applied"""
+        start, end = item.start, item.end
+        field = date_changes.get('field') or ''
+        if field and date_changes.get('new_value'):
+            if field not in SCHEDULE_FIELDS:
+                raise ValueError(f"Unknown date field: {field}")
+            new_value = parse_date(date_changes['new_value'])
+            if not new_value:
+                raise ValueError(f"Invalid date: {date_changes['new_value']}")
+            if field.endswith('_start'):
+                start = new_value
+            else:
+                end = new_value
+        return start, end
 
     def analyze_schedule_impact(
         self,
         item_id: str,
         date_changes: Dict[str, Any]
     ) -> ScheduleImpactAnalysis:
-        """Analyze impact of schedule changes on dependent items"""
+        """Analyze impact of schedule changes on dependent items
+
+        Propagates the changed dates through the project's dependency graph
+        in topological order (see backend.schedule_propagation), so each
+        affected item gets one suggestion for the binding constraint among
+        all of its predecessors.
+        """
         source_item = self._get_item(item_id)
         if not source_item:
             raise ValueError(f"Item {item_id} not found")
 
-        affected_items = []
-        visited = set()
-
-        def analyze_successors(current_id: str, chain: List[str]):
-            """Recursively analyze all successors"""
-            if current_id in visited:
-                return
-            visited.add(current_id)
+        cpm = self._critical_path(source_item['project_id'])
+        graph = cpm.graph
+        source = graph.index[item_id]
+        start, end = self._changed_dates(graph.items[source], date_changes)
+        shifts = propagate(graph, source, start, end)
 
-            successors = self.get_successors(current_id, active_only=True)
+        # Chain of WBS ids from the source along the binding dependencies
+        chains = {}
 
-            for dep in successors:
-                successor_item = self._get_item(dep.successor_id)
-                if not successor_item:
-                    continue
-
-                # Get current dates
-                current_start = successor_item.get('revised_planned_start') or successor_item.get('original_planned_start')
-                current_end = successor_item.get('revised_planned_end') or successor_item.get('original_planned_end')
-
-                # Get predecessor item for calculation
-                pred_item = self._get_item(dep.predecessor_id)
-                if not pred_item:
-                    continue
+        def chain(node: int) -> List[str]:
+            if node not in chains:
+                shift = shifts.get(node)
+                parent = graph.edges[shift.edge].predecessor if shift and shift.edge is not None else None
+                chains[node] = (chain(parent) if parent is not None else []) + [graph.items[node].wbs_id]
+            return chains[node]
 
-                # Calculate suggested dates
-                suggested_start, suggested_end = self._calculate_suggested_date(dep, pred_item)
-
-                # Determine if there's a delay
-                delay_days = 0
-                reason = f"依賴於 {dep.predecessor_wbs_id} ({dep.dependency_type})"
-
-                if suggested_start and current_start:
-                    if isinstance(current_start, str):
-                        current_start = datetime.strptime(current_start, '%Y-%m-%d').date()
-                    if suggested_start > current_start:
-                        delay_days = (suggested_start - current_start).days
-                        reason += f" - 建議延後 {delay_days} 天"
-
-                if delay_days > 0 or suggested_start or suggested_end:
-                    affected_items.append(ScheduleAdjustmentSuggestion(
-                        item_id=successor_item['item_id'],
-                        wbs_id=successor_item['wbs_id'],
-                        task_name=successor_item['task_name'],
-                        current_start=current_start if isinstance(current_start, date) else
-                                     (datetime.strptime(current_start, '%Y-%m-%d').date() if current_start else None),
-                        current_end=current_end if isinstance(current_end, date) else
-                                   (datetime.strptime(current_end, '%Y-%m-%d').date() if current_end else None),
-                        suggested_start=suggested_start,
-                        suggested_end=suggested_end,
-                        delay_days=delay_days,
-                        reason=reason,
-                        dependency_chain=chain + [dep.predecessor_wbs_id]
-                    ))
-
-                # Recursively check successors
-                analyze_successors(dep.successor_id, chain + [dep.predecessor_wbs_id])
-
-        # Start analysis from the source item
-        analyze_successors(item_id, [source_item['wbs_id']])
-
-        # Check if any critical items are affected
-        critical_path_affected = any(
-            sug.delay_days > 5 or 'Critical' in sug.reason
-            for sug in affected_items
-        )
+        affected_items = []
+        critical_path_affected = False
+        for node, shift in shifts.items():
+            if node == source:
+                continue
+            item = graph.items[node]
+            edge = graph.edges[shift.edge]
+            predecessor = graph.items[edge.predecessor]
+
+            delay_days = max(
+                (shift.start - item.start).days if shift.start and item.start else 0,
+                (shift.end - item.end).days if shift.end and item.end else 0
+            )
+            reason = f"依賴於 {predecessor.wbs_id} ({edge.dependency_type})"
+            if delay_days > 0:
+                reason += f" - 建議延後 {delay_days} 天"
+
+            # A delay beyond the item's float moves the project finish
+            if delay_days > 0 and node in cpm.scheduled:
+                critical_path_affected |= delay_days > cpm.total_float(node)
+
+            affected_items.append(ScheduleAdjustmentSuggestion(
+                item_id=item.item_id,
+                wbs_id=item.wbs_id,
+                task_name=item.task_name,
+                current_start=item.start,
+                current_end=item.end,
+                suggested_start=shift.start,
+                suggested_end=shift.end,
+                delay_days=delay_days,
+                reason=reason,
+                dependency_chain=chain(edge.predecessor)
+            ))
 
         return ScheduleImpactAnalysis(
             source_item_id=source_item['item_id'],
@@ -391,3 +552,84 @@ class DependencyService:
             total_affected=len(affected_items),
             critical_path_affected=critical_path_affected
         )
+
+    def apply_schedule_change(self, item_id: str, change: ScheduleChangeRequest) -> Optional[ScheduleChangeResult]:
+        """Apply a date change and the adjustments it causes in one transaction
+
+        Sets the changed field of the item, moves every dependent item to
+        the dates analyze_schedule_impact suggests (revised_planned_start/end)
+        and records the change in schedule_changes. Returns None for an
+        unknown item.
+        """
+        if change.field not in SCHEDULE_FIELDS:
+            raise ValueError(f"Unknown date field: {change.field}")
+        new_value = parse_date(change.new_value)
+        if not new_value:
+            raise ValueError(f"Invalid date: {change.new_value}")
+        date_changes = change.model_dump()
+
+        def _apply(conn):
+            _, _, graph = self._graph_for_write(conn, item_id)
+            if graph is None:
+                return None
+            source = graph.index[item_id]
+            item = graph.items[source]
+            start, end = self._changed_dates(item, date_changes)
+            shifts = propagate(graph, source, start, end)
+            now = datetime.now()
+
+            conn.execute(
+                f"UPDATE tracking_items SET {change.field} = ?, updated_at = ? WHERE item_id = ?",
+                (new_value.isoformat(), now, item_id)
+            )
+            updated = [ScheduledItem(
+                item_id=item.item_id, wbs_id=item.wbs_id, task_name=item.task_name,
+                old_start=item.start, old_end=item.end, new_start=start, new_end=end
+            )]
+            for node, shift in shifts.items():
+                if node == source:
+                    continue
+                dependent = graph.items[node]
+                updated.append(ScheduledItem(
+                    item_id=dependent.item_id, wbs_id=dependent.wbs_id, task_name=dependent.task_name,
+                    old_start=dependent.start, old_end=dependent.end,
+                    new_start=shift.start, new_end=shift.end
+                ))
+
+            conn.executemany("""
+                UPDATE tracking_items
+                SET revised_planned_start = COALESCE(?, revised_planned_start),
+                    revised_planned_end = COALESCE(?, revised_planned_end),
+                    updated_at = ?
+                WHERE item_id = ?
+            """, [
+                (_iso(u.new_start), _iso(u.new_end), now, u.item_id) for u in updated[1:]
+            ])
+
+            affected = [u.model_dump(mode='json') for u in updated[1:]]
+            cursor = conn.execute("""
+                INSERT INTO schedule_changes (
+                    item_id, change_date, change_by, change_type, change_reason,
+                    old_start_date, old_end_date, new_start_date, new_end_date,
+                    affected_items_count, affected_items, impact_summary
+                ) VALUES (?, ?, ?, 'Dependency Impact', ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                item_id, now, change.change_by, change.change_reason,
+                _iso(item.start), _iso(item.end), _iso(start), _iso(end),
+                len(affected), json.dumps(affected, ensure_ascii=False),
+                f"{change.field} → {change.new_value}; {len(affected)} dependent item(s) rescheduled"
+            ))
+            return cursor.lastrowid, now, updated
+
+        result = get_writer(self.db_path).execute(_apply)
+        if result is None:
+            return None
+        change_id, change_date, updated = result
+
+        return ScheduleChangeResult(
+            change_id=change_id,
+            source_item_id=item_id,
+            change_date=change_date,
+            updated_items=updated,
+            total_updated=len(updated)
+        )
@@ -1,15 +1,18 @@
 """
 Service for Excel import/export operations
 """
-import pandas as pd
+import itertools
 import sqlite3
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+import pandas as pd
+from datetime import date, datetime
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator, Union, BinaryIO, Callable
 from pathlib import Path
 import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+from openpyxl.utils import get_column_letter
 from backend.config import settings
-from backend.models.wbs import WBSCreate
+from backend.db_pool import get_pool
 from backend.services.wbs_service import WBSService
 
 
@@ -20,39 +23,168 @@ class ExcelService:
         self.db_path = str(settings.database_path)
         self.wbs_service = WBSService()
 
-    def _parse_date(self, date_str: Any) -> Optional[str]:
-        """Parse date from various formats to YYYY-MM-DD"""
-        if pd.isna(date_str) or date_str is None or date_str == '':
-            return None
+    # Tried in priority order (prioritize yyyy/mm/dd format)
+    DATE_FORMATS = ['%Y/%m/%d', '%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y']
 
-        try:
-            # If already a datetime object
-            if isinstance(date_str, datetime):
-                return date_str.strftime('%Y-%m-%d')
-
-            # If string, try to parse
-            date_str = str(date_str).strip()
-            if not date_str:
-                return None
-
-            # Try different formats (prioritize yyyy/mm/dd format)
-            for fmt in ['%Y/%m/%d', '%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y']:
-                try:
-                    dt = datetime.strptime(date_str, fmt)
-                    return dt.strftime('%Y-%m-%d')
-                except ValueError:
-                    continue
-
-            # Try pandas to_datetime as fallback
-            dt = pd.to_datetime(date_str)
-            return dt.strftime('%Y-%m-%d')
-
-        except Exception:
-            return None
-
-    def import_wbs_from_excel(self, file_path: str, project_id: str) -> Dict[str, Any]:
+    def _parse_date_column(self, values: pd.Series) -> Tuple[pd.Series, pd.Series]:
+        """
+        Parse a whole column of dates to YYYY-MM-DD strings
+
+        Each format is applied to the cells still unparsed, then pandas'
+        mixed-format parser handles the rest.
+        Returns ``(dates, invalid)`` where dates holds strings or None and
+        invalid marks non-empty cells that could not be parsed.
         """
-        Import WBS items from Excel file
+        if pd.api.types.is_datetime64_any_dtype(values):
+            parsed = values
+        else:
+            parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+
+            # Cells that are already dates (Excel date cells) need no parsing
+            is_date = values.map(lambda v: isinstance(v, (datetime, date)))
+            if is_date.any():
+                parsed[is_date] = pd.to_datetime(values[is_date], errors='coerce')
+
+            text = values.where(values.notna() & ~is_date, '').astype(str).str.strip()
+            pending = (text != '') & parsed.isna()
+
+            for fmt in self.DATE_FORMATS:
+                if not pending.any():
+                    break
+                parsed[pending] = pd.to_datetime(text[pending], format=fmt, errors='coerce')
+                pending &= parsed.isna()
+
+            if pending.any():
+                parsed[pending] = pd.to_datetime(text[pending], format='mixed', errors='coerce')
+                pending &= parsed.isna()
+
+        dates = parsed.dt.strftime('%Y-%m-%d').astype(object)
+        dates = dates.where(parsed.notna(), None)
+
+        invalid = values.notna() & parsed.isna()
+        if values.dtype == object:
+            invalid &= values.astype(str).str.strip() != ''
+
+        return dates, invalid
+
+    @staticmethod
+    def _text_column(df: pd.DataFrame, column: str) -> pd.Series:
+        """Column as stripped strings, with missing cells (and the column itself) as ''"""
+        if column not in df.columns:
+            return pd.Series('', index=df.index, dtype=object)
+        return df[column].where(df[column].notna(), '').astype(str).str.strip()
+
+    @staticmethod
+    def _strip_integer_suffix(ids: pd.Series) -> pd.Series:
+        """Turn IDs that Excel stored as floats (1.0, 2.0) back into 1, 2
+
+        WBS IDs like 2.2 or 1.1.3 are left intact.
+        """
+        return ids.str.replace(r'^(\d+)\.0$', r'\1', regex=True)
+
+    def _prepare_wbs_rows(self, df: pd.DataFrame, project_id: str):
+        """
+        Normalize and validate the imported WBS sheet column by column
+
+        Returns ``(items, failed, warnings)``: items is a list of
+        ``(excel_row, wbs_data)`` ready for insertion, failed lists rows
+        rejected by validation and warnings lists unparseable date cells.
+        """
+        # Excel row number (1-indexed + header)
+        row_numbers = pd.Series(range(2, len(df) + 2), index=df.index)
+
+        wbs_ids = self._strip_integer_suffix(self._text_column(df, 'wbs_id'))
+        parent_ids = self._strip_integer_suffix(self._text_column(df, 'parent_id'))
+        parent_ids = parent_ids.where(parent_ids != 'nan', '')
+
+        # Skip rows without a WBS ID
+        present = wbs_ids != ''
+
+        errors = pd.Series('', index=df.index, dtype=object)
+
+        def _numeric(column: str) -> pd.Series:
+            if column not in df.columns:
+                return pd.Series(float('nan'), index=df.index)
+            values = pd.to_numeric(df[column], errors='coerce')
+            invalid = df[column].notna() & values.isna()
+            errors.loc[invalid & (errors == '')] = f'Invalid {column}: not a number'
+            return values
+
+        work_days = _numeric('work_days')
+        progress = _numeric('actual_progress')
+        out_of_range = progress.notna() & ((progress < 0) | (progress > 100))
+        errors.loc[out_of_range & (errors == '')] = 'actual_progress must be between 0 and 100'
+
+        category = self._text_column(df, 'category').replace('', 'Task')
+        status = self._text_column(df, 'status').replace('', '未開始')
+        owner_unit = self._text_column(df, 'owner_unit')
+        notes = self._text_column(df, 'notes')
+        task_names = self._text_column(df, 'task_name')
+
+        # Accept: 'yes', 'y', 'true', '1', '是', 'v', '✓', 'x'
+        # Default to False if column doesn't exist in the Excel file
+        is_internal = self._text_column(df, 'is_internal').str.lower().isin(
+            ['yes', 'y', 'true', '1', '是', 'v', '✓', 'x']
+        )
+
+        date_columns = [
+            'original_planned_start', 'original_planned_end',
+            'revised_planned_start', 'revised_planned_end',
+            'actual_start_date', 'actual_end_date',
+        ]
+        dates = {}
+        warnings = []
+        for col in date_columns:
+            if col not in df.columns:
+                dates[col] = pd.Series(None, index=df.index, dtype=object)
+                continue
+            dates[col], invalid = self._parse_date_column(df[col])
+            # Unparseable dates are imported as empty, but reported back
+            for idx in df.index[invalid & present]:
+                warnings.append({
+                    'row': int(row_numbers[idx]),
+                    'wbs_id': wbs_ids[idx],
+                    'column': col,
+                    'value': str(df.at[idx, col]),
+                    'warning': 'Unrecognized date format, left empty'
+                })
+
+        items = []
+        failed = []
+        for idx in df.index[present]:
+            if errors[idx]:
+                failed.append({
+                    'row': int(row_numbers[idx]),
+                    'wbs_id': wbs_ids[idx],
+                    'error': errors[idx]
+                })
+                continue
+
+            wbs_data = {
+                'project_id': project_id,
+                'wbs_id': wbs_ids[idx],
+                'parent_id': parent_ids[idx] or None,
+                'task_name': task_names[idx],
+                'category': category[idx],
+                'owner_unit': owner_unit[idx] or None,
+                'work_days': int(work_days[idx]) if pd.notna(work_days[idx]) else None,
+                'actual_progress': int(progress[idx]) if pd.notna(progress[idx]) else 0,
+                'status': status[idx],
+                'notes': notes[idx] or None,
+                'is_internal': bool(is_internal[idx]),
+            }
+            for col in date_columns:
+                wbs_data[col] = dates[col][idx]
+
+            items.append((int(row_numbers[idx]), wbs_data))
+
+        warnings.sort(key=lambda w: w['row'])
+
+        return items, failed, warnings
+
+    def import_wbs_from_excel(self, source: Union[str, BinaryIO], project_id: str) -> Dict[str, Any]:
+        """
+        Import WBS items from Excel file (a path or a readable binary file object)
 
         Expected columns (Chinese):
         - 項目 (WBS ID)
@@ -72,8 +204,8 @@ class ExcelService:
         - 備註說明 (Notes)
         """
         try:
-            # Read Excel file
-            df = pd.read_excel(file_path)
+            # Read Excel file; WBS IDs are read as text so 1 / 2.1 / 2.10 are kept as typed
+            df = pd.read_excel(source, dtype={'項目': str, '父項目': str})
 
             # Column mapping (Chinese to English)
             column_map = {
@@ -110,85 +242,35 @@ class ExcelService:
                     'failed': len(df)
                 }
 
-            # Import WBS items
-            imported = []
-            failed = []
-
-            for idx, row in df.iterrows():
-                try:
-                    # Skip if WBS ID is empty
-                    if pd.isna(row.get('wbs_id')) or str(row.get('wbs_id')).strip() == '':
-                        continue
-
-                    # Prepare WBS data
-                    # Handle parent_id - convert to string and clean up
-                    parent_id_value = None
-                    if pd.notna(row.get('parent_id')):
-                        parent_str = str(row.get('parent_id')).strip()
-                        # Only remove .0 suffix if it's purely numeric (like 1.0 -> 1, 2.0 -> 2)
-                        # But keep WBS IDs like 2.2, 1.1.3 intact
-                        if parent_str and parent_str != 'nan':
-                            # Check if it ends with .0 and has only one decimal point (purely numeric)
-                            if parent_str.endswith('.0'):
-                                # Check if removing .0 leaves a valid integer
-                                base = parent_str[:-2]  # Remove .0
-                                if base.isdigit():
-                                    parent_str = base
-                            if parent_str:
-                                parent_id_value = parent_str
-
-                    # Handle is_internal - convert various representations to boolean
-                    # Default to False if column doesn't exist in the Excel file
-                    is_internal_value = False
-                    if 'is_internal' in df.columns:
-                        if pd.notna(row.get('is_internal')):
-                            val = str(row.get('is_internal')).strip().lower()
-                            # Accept: 'yes', 'y', 'true', '1', '是', 'v', '✓'
-                            is_internal_value = val in ['yes', 'y', 'true', '1', '是', 'v', '✓', 'x']
-
-                    wbs_data = {
-                        'project_id': project_id,
-                        'wbs_id': str(row['wbs_id']).strip(),
-                        'parent_id': parent_id_value,
-                        'task_name': str(row.get('task_name', '')).strip(),
-                        'category': str(row.get('category', 'Task')).strip() or 'Task',
-                        'owner_unit': str(row.get('owner_unit', '')).strip() if pd.notna(row.get('owner_unit')) else None,
-                        'original_planned_start': self._parse_date(row.get('original_planned_start')),
-                        'original_planned_end': self._parse_date(row.get('original_planned_end')),
-                        'revised_planned_start': self._parse_date(row.get('revised_planned_start')),
-                        'revised_planned_end': self._parse_date(row.get('revised_planned_end')),
-                        'actual_start_date': self._parse_date(row.get('actual_start_date')),
-                        'actual_end_date': self._parse_date(row.get('actual_end_date')),
-                        'work_days': int(row.get('work_days', 0)) if pd.notna(row.get('work_days')) else None,
-                        'actual_progress': int(row.get('actual_progress', 0)) if pd.notna(row.get('actual_progress')) else 0,
-                        'status': str(row.get('status', '未開始')).strip() or '未開始',
-                        'notes': str(row.get('notes', '')).strip() if pd.notna(row.get('notes')) else None,
-                        'is_internal': is_internal_value,
-                    }
-
-                    # Create WBS item
-                    wbs_create = WBSCreate(**wbs_data)
-                    result = self.wbs_service.create_wbs(wbs_create)
+            items, failed, warnings = self._prepare_wbs_rows(df, project_id)
 
+            # Insert all valid rows in one transaction
+            errors = self.wbs_service.bulk_create_wbs([item for _, item in items])
+
+            imported = []
+            for (row_number, item), error in zip(items, errors):
+                if error is None:
                     imported.append({
-                        'row': idx + 2,  # Excel row number (1-indexed + header)
-                        'wbs_id': wbs_data['wbs_id'],
-                        'task_name': wbs_data['task_name']
+                        'row': row_number,
+                        'wbs_id': item['wbs_id'],
+                        'task_name': item['task_name']
                     })
-
-                except Exception as e:
+                else:
                     failed.append({
-                        'row': idx + 2,
-                        'wbs_id': str(row.get('wbs_id', 'N/A')),
-                        'error': str(e)
+                        'row': row_number,
+                        'wbs_id': item['wbs_id'],
+                        'error': error
                     })
 
+            failed.sort(key=lambda f: f['row'])
+
             return {
                 'success': len(imported) > 0,  # 至少要有一筆成功才算成功
                 'imported': len(imported),
                 'failed': len(failed),
                 'imported_items': imported,
-                'failed_items': failed
+                'failed_items': failed,
+                'warnings': warnings
             }
 
         except Exception as e:
@@ -199,17 +281,144 @@ class ExcelService:
                 'failed': 0
             }
 
-    def export_wbs_to_excel(self, project_id: str, output_path: str) -> Dict[str, Any]:
+    # Rows buffered to size columns before a streaming export starts writing
+    WIDTH_SAMPLE_ROWS = 500
+    EXPORT_FETCH_SIZE = 1000
+
+    def _query_rows(self, query: str, params: tuple) -> Iterator[sqlite3.Row]:
+        """Yield query rows in batches while holding one pooled connection"""
+        conn = get_pool(self.db_path).acquire()
+        try:
+            cursor = conn.execute(query, params)
+            while True:
+                batch = cursor.fetchmany(self.EXPORT_FETCH_SIZE)
+                if not batch:
+                    break
+                yield from batch
+        finally:
+            conn.close()
+
+    def _write_streaming_sheet(
+        self,
+        output: Union[str, BinaryIO],
+        sheet_name: str,
+        columns: Dict[str, str],
+        rows: Iterable,
+        header_color: str,
+        flag_columns: Optional[Dict[str, Tuple[str, str]]] = None,
+        highlight: Optional[Tuple[str, str]] = None,
+        on_progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Write rows to a write-only workbook without holding the sheet in memory
+
+        columns maps row keys to Chinese headers (in sheet order).
+        flag_columns maps 0/1 columns to their (true, false) display text.
+        highlight is ``(column, color)``: rows where that flag is set are filled.
+        on_progress is called with the running row count every
+        EXPORT_FETCH_SIZE rows; it may raise to abort the export.
+        Column widths come from the first WIDTH_SAMPLE_ROWS rows. Returns the
+        number of rows written; nothing is written when there are no rows.
+        """
+        flag_columns = flag_columns or {}
+        keys = list(columns)
+
+        def _values(row) -> list:
+            values = []
+            for key in keys:
+                value = row[key]
+                if key in flag_columns:
+                    value = flag_columns[key][0] if value == 1 else flag_columns[key][1]
+                values.append(value)
+            return values
+
+        rows = iter(rows)
+        sample = [(row, _values(row)) for row in itertools.islice(rows, self.WIDTH_SAMPLE_ROWS)]
+        if not sample:
+            return 0
+
+        workbook = openpyxl.Workbook(write_only=True)
+        worksheet = workbook.create_sheet(sheet_name)
+
+        # Styles are registered once and referenced by name from every cell
+        border = Border(
+            left=Side(style='thin'),
+            right=Side(style='thin'),
+            top=Side(style='thin'),
+            bottom=Side(style='thin')
+        )
+        header_style = NamedStyle(
+            name='export_header',
+            fill=PatternFill(start_color=header_color, end_color=header_color, fill_type='solid'),
+            font=Font(bold=True, color='FFFFFF'),
+            alignment=Alignment(horizontal='center', vertical='center'),
+            border=border,
+        )
+        cell_style = NamedStyle(name='export_cell', border=border)
+        workbook.add_named_style(header_style)
+        workbook.add_named_style(cell_style)
+        if highlight:
+            highlight_style = NamedStyle(
+                name='export_highlight',
+                fill=PatternFill(start_color=highlight[1], end_color=highlight[1], fill_type='solid'),
+                border=border,
+            )
+            workbook.add_named_style(highlight_style)
+
+        # Column widths must be set before the first row in write-only mode
+        for col_idx, header in enumerate(columns.values(), start=1):
+            max_length = max(
+                [len(header)] + [len(str(values[col_idx - 1])) for _, values in sample
+                                 if values[col_idx - 1] is not None]
+            )
+            worksheet.column_dimensions[get_column_letter(col_idx)].width = min(max_length + 2, 50)
+
+        def _cell(value, style):
+            cell = WriteOnlyCell(worksheet, value=value)
+            cell.style = style
+            return cell
+
+        worksheet.append([_cell(header, 'export_header') for header in columns.values()])
+
+        # One styled cell per column and style, reused for every row: a
+        # write-only sheet serializes each row as soon as it is appended
+        row_cells = {
+            style: [_cell(None, style) for _ in keys]
+            for style in (['export_cell', 'export_highlight'] if highlight else ['export_cell'])
+        }
+
+        written = 0
+        try:
+            for row, values in itertools.chain(sample, ((row, _values(row)) for row in rows)):
+                style = 'export_highlight' if highlight and row[highlight[0]] == 1 else 'export_cell'
+                cells = row_cells[style]
+                for cell, value in zip(cells, values):
+                    cell.value = value
+                worksheet.append(cells)
+                written += 1
+                if on_progress and written % self.EXPORT_FETCH_SIZE == 0:
+                    on_progress(written)
+        except BaseException:
+            # Finish the half-written sheet stream so it is not left open
+            worksheet.close()
+            raise
+
+        workbook.save(output)
+        return written
+
+    def export_wbs_to_excel(
+        self,
+        project_id: str,
+        output: Union[str, BinaryIO],
+        on_progress: Optional[Callable[[int], None]] = None,
+    ) -> Dict[str, Any]:
         """
         Export WBS items to Excel file
 
-        Returns styled Excel file with all WBS data
+        Returns styled Excel file with all WBS data; output is a path or a
+        writable binary file object
         """
         try:
-            # Get WBS data
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-
             query = """
                 SELECT
                     wbs_id,
@@ -233,21 +442,11 @@ class ExcelService:
                     is_overdue
                 FROM tracking_items
                 WHERE project_id = ? AND item_type = 'WBS'
-                ORDER BY wbs_id
+                ORDER BY wbs_sort_key
             """
 
-            df = pd.read_sql_query(query, conn, params=(project_id,))
-            conn.close()
-
-            if df.empty:
-                return {
-                    'success': False,
-                    'error': 'No WBS items found for this project',
-                    'exported': 0
-                }
-
-            # Rename columns to Chinese
-            df = df.rename(columns={
+            # Column headers in Chinese
+            columns = {
                 'wbs_id': '項目',
                 'parent_id': '父項目',
                 'task_name': '任務說明',
@@ -267,68 +466,31 @@ class ExcelService:
                 'notes': '備註說明',
                 'is_internal': '內部安排',
                 'is_overdue': '逾期'
-            })
-
-            # Convert boolean to Chinese
-            df['逾期'] = df['逾期'].apply(lambda x: '是' if x == 1 else '否')
-            df['內部安排'] = df['內部安排'].apply(lambda x: 'V' if x == 1 else '')
-
-            # Create Excel writer
-            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-                df.to_excel(writer, sheet_name='WBS', index=False)
-
-                # Get workbook and worksheet
-                workbook = writer.book
-                worksheet = writer.sheets['WBS']
-
-                # Style header
-                header_fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
-                header_font = Font(bold=True, color='FFFFFF')
-                border = Border(
-                    left=Side(style='thin'),
-                    right=Side(style='thin'),
-                    top=Side(style='thin'),
-                    bottom=Side(style='thin')
-                )
-
-                for cell in worksheet[1]:
-                    cell.fill = header_fill
-                    cell.font = header_font
-                    cell.alignment = Alignment(horizontal='center', vertical='center')
-                    cell.border = border
-
-                # Auto-adjust column widths
-                for column in worksheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 50)
-                    worksheet.column_dimensions[column_letter].width = adjusted_width
-
-                # Apply borders to all cells
-                for row in worksheet.iter_rows(min_row=2, max_row=worksheet.max_row,
-                                               min_col=1, max_col=worksheet.max_column):
-                    for cell in row:
-                        cell.border = border
-
-                # Highlight overdue items
-                overdue_fill = PatternFill(start_color='FFE6E6', end_color='FFE6E6', fill_type='solid')
-                overdue_col_idx = list(df.columns).index('逾期') + 1
+            }
 
-                for row_idx, row in enumerate(worksheet.iter_rows(min_row=2, max_row=worksheet.max_row), start=2):
-                    if row[overdue_col_idx - 1].value == '是':
-                        for cell in row:
-                            cell.fill = overdue_fill
+            # Highlight overdue items
+            exported = self._write_streaming_sheet(
+                output,
+                sheet_name='WBS',
+                columns=columns,
+                rows=self._query_rows(query, (project_id,)),
+                header_color='366092',
+                flag_columns={'is_overdue': ('是', '否'), 'is_internal': ('V', '')},
+                highlight=('is_overdue', 'FFE6E6'),
+                on_progress=on_progress,
+            )
+
+            if not exported:
+                return {
+                    'success': False,
+                    'error': 'No WBS items found for this project',
+                    'exported': 0
+                }
 
             return {
                 'success': True,
-                'exported': len(df),
-                'file_path': output_path
+                'exported': exported,
+                'file_path': output if isinstance(output, str) else None
             }
 
         except Exception as e:
@@ -338,9 +500,10 @@ class ExcelService:
                 'exported': 0
             }
 
-    def create_wbs_template(self, output_path: str) -> Dict[str, Any]:
+    def create_wbs_template(self, output: Union[str, BinaryIO]) -> Dict[str, Any]:
         """
-        Create WBS import template Excel file
+        Create WBS import template Excel file (output is a path or a writable
+        binary file object)
         """
         try:
             # Define template columns
@@ -374,7 +537,7 @@ class ExcelService:
             df = pd.DataFrame(sample_data, columns=columns)
 
             # Create Excel file
-            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+            with pd.ExcelWriter(output, engine='openpyxl') as writer:
                 df.to_excel(writer, sheet_name='WBS範本', index=False)
 
                 workbook = writer.book
@@ -404,7 +567,7 @@ class ExcelService:
 
             return {
                 'success': True,
-                'file_path': output_path,
+                'file_path': output if isinstance(output, str) else None,
                 'message': 'Template created successfully'
             }
 
@@ -414,17 +577,19 @@ class ExcelService:
                 'error': str(e)
             }
 
-    def export_pending_to_excel(self, project_id: str, output_path: str) -> Dict[str, Any]:
+    def export_pending_to_excel(
+        self,
+        project_id: str,
+        output: Union[str, BinaryIO],
+        on_progress: Optional[Callable[[int], None]] = None,
+    ) -> Dict[str, Any]:
         """
         Export Pending items to Excel file
 
-        Returns styled Excel file with all Pending data
+        Returns styled Excel file with all Pending data; output is a path or a
+        writable binary file object
         """
         try:
-            # Get Pending data
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-
             query = """
                 SELECT
                     pending_id,
@@ -446,18 +611,8 @@ class ExcelService:
                 ORDER BY task_date DESC
             """
 
-            df = pd.read_sql_query(query, conn, params=(project_id,))
-            conn.close()
-
-            if df.empty:
-                return {
-                    'success': False,
-                    'error': 'No pending items found for this project',
-                    'exported': 0
-                }
-
-            # Rename columns to Chinese
-            df = df.rename(columns={
+            # Column headers in Chinese
+            columns = {
                 'pending_id': '編號',
                 'task_date': '任務日期',
                 'source_type': '來源類型',
@@ -472,58 +627,29 @@ class ExcelService:
                 'related_action_item': '相關行動項目',
                 'status': '狀態',
                 'priority': '優先級'
-            })
-
-            # Convert boolean to Chinese
-            df['已回覆'] = df['已回覆'].apply(lambda x: '是' if x == 1 else '否')
-
-            # Create Excel writer
-            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-                df.to_excel(writer, sheet_name='待辦事項', index=False)
-
-                # Get workbook and worksheet
-                workbook = writer.book
-                worksheet = writer.sheets['待辦事項']
-
-                # Style header
-                header_fill = PatternFill(start_color='70AD47', end_color='70AD47', fill_type='solid')
-                header_font = Font(bold=True, color='FFFFFF')
-                border = Border(
-                    left=Side(style='thin'),
-                    right=Side(style='thin'),
-                    top=Side(style='thin'),
-                    bottom=Side(style='thin')
-                )
-
-                for cell in worksheet[1]:
-                    cell.fill = header_fill
-                    cell.font = header_font
-                    cell.alignment = Alignment(horizontal='center', vertical='center')
-                    cell.border = border
-
-                # Auto-adjust column widths
-                for column in worksheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 50)
-                    worksheet.column_dimensions[column_letter].width = adjusted_width
+            }
 
-                # Apply borders to all cells
-                for row in worksheet.iter_rows(min_row=2, max_row=worksheet.max_row,
-                                               min_col=1, max_col=worksheet.max_column):
-                    for cell in row:
-                        cell.border = border
+            exported = self._write_streaming_sheet(
+                output,
+                sheet_name='待辦事項',
+                columns=columns,
+                rows=self._query_rows(query, (project_id,)),
+                header_color='70AD47',
+                flag_columns={'is_replied': ('是', '否')},
+                on_progress=on_progress,
+            )
+
+            if not exported:
+                return {
+                    'success': False,
+                    'error': 'No pending items found for this project',
+                    'exported': 0
+                }
 
             return {
                 'success': True,
-                'exported': len(df),
-                'file_path': output_path
+                'exported': exported,
+                'file_path': output if isinstance(output, str) else None
             }
 
         except Exception as e:
@@ -533,17 +659,19 @@ class ExcelService:
                 'exported': 0
             }
 
-    def export_issues_to_excel(self, project_id: str, output_path: str) -> Dict[str, Any]:
+    def export_issues_to_excel(
+        self,
+        project_id: str,
+        output: Union[str, BinaryIO],
+        on_progress: Optional[Callable[[int], None]] = None,
+    ) -> Dict[str, Any]:
         """
         Export Issues to Excel file
 
-        Returns styled Excel file with all Issue data
+        Returns styled Excel file with all Issue data; output is a path or a
+        writable binary file object
         """
         try:
-            # Get Issues data
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-
             query = """
                 SELECT
                     issue_number,
@@ -575,18 +703,8 @@ class ExcelService:
                 ORDER BY issue_number
             """
 
-            df = pd.read_sql_query(query, conn, params=(project_id,))
-            conn.close()
-
-            if df.empty:
-                return {
-                    'success': False,
-                    'error': 'No issues found for this project',
-                    'exported': 0
-                }
-
-            # Rename columns to Chinese
-            df = df.rename(columns={
+            # Column headers in Chinese
+            columns = {
                 'issue_number': '問題編號',
                 'issue_title': '問題標題',
                 'issue_description': '問題說明',
@@ -611,67 +729,31 @@ class ExcelService:
                 'escalation_level': '升級層級',
                 'escalation_date': '升級日期',
                 'escalation_reason': '升級原因'
-            })
-
-            # Convert boolean to Chinese
-            df['已升級'] = df['已升級'].apply(lambda x: '是' if x == 1 else '否')
-
-            # Create Excel writer
-            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-                df.to_excel(writer, sheet_name='問題追蹤', index=False)
-
-                # Get workbook and worksheet
-                workbook = writer.book
-                worksheet = writer.sheets['問題追蹤']
-
-                # Style header
-                header_fill = PatternFill(start_color='E74C3C', end_color='E74C3C', fill_type='solid')
-                header_font = Font(bold=True, color='FFFFFF')
-                border = Border(
-                    left=Side(style='thin'),
-                    right=Side(style='thin'),
-                    top=Side(style='thin'),
-                    bottom=Side(style='thin')
-                )
-
-                for cell in worksheet[1]:
-                    cell.fill = header_fill
-                    cell.font = header_font
-                    cell.alignment = Alignment(horizontal='center', vertical='center')
-                    cell.border = border
-
-                # Auto-adjust column widths
-                for column in worksheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 50)
-                    worksheet.column_dimensions[column_letter].width = adjusted_width
-
-                # Apply borders to all cells
-                for row in worksheet.iter_rows(min_row=2, max_row=worksheet.max_row,
-                                               min_col=1, max_col=worksheet.max_column):
-                    for cell in row:
-                        cell.border = border
-
-                # Highlight escalated items
-                escalated_fill = PatternFill(start_color='FFF4E6', end_color='FFF4E6', fill_type='solid')
-                escalated_col_idx = list(df.columns).index('已升級') + 1
+            }
 
-                for row_idx, row in enumerate(worksheet.iter_rows(min_row=2, max_row=worksheet.max_row), start=2):
-                    if row[escalated_col_idx - 1].value == '是':
-                        for cell in row:
-                            cell.fill = escalated_fill
+            # Highlight escalated items
+            exported = self._write_streaming_sheet(
+                output,
+                sheet_name='問題追蹤',
+                columns=columns,
+                rows=self._query_rows(query, (project_id,)),
+                header_color='E74C3C',
+                flag_columns={'is_escalated': ('是', '否')},
+                highlight=('is_escalated', 'FFF4E6'),
+                on_progress=on_progress,
+            )
+
+            if not exported:
+                return {
+                    'success': False,
+                    'error': 'No issues found for this project',
+                    'exported': 0
+                }
 
             return {
                 'success': True,
-                'exported': len(df),
-                'file_path': output_path
+                'exported': exported,
+                'file_path': output if isinstance(output, str) else None
             }
 
         except Exception as e:
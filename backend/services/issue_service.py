@@ -1,16 +1,23 @@
 """
 Business logic service for Issue Tracking
 """
-import sqlite3
 from datetime import date, datetime
 from typing import List, Optional, Dict, Any
 from backend.config import settings
+from backend.db_pool import get_pool
+from backend.db_writer import get_writer
+from backend.pagination import Keyset, Page, SortKey, paginate
+from backend.project_stats import load_project_stats, today
 from backend.models.issue import (
     IssueCreate, IssueUpdate, IssueResponse, IssueStats,
     IssueStatusHistory, EscalateIssue, ResolveIssue
 )
 
 
+# Sort order of issue lists (newest first)
+ISSUE_KEYSET = Keyset(SortKey("created_at", descending=True), SortKey("issue_id", descending=True))
+
+
 class IssueService:
     """Service for managing issues"""
 
@@ -18,22 +25,16 @@ class IssueService:
         self.db_path = str(settings.database_path)
 
     def _get_connection(self):
-        """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
-
-    def _generate_issue_number(self, project_id: str) -> str:
-        """Generate unique issue number"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        """Get database connection from the shared pool"""
+        return get_pool(self.db_path).acquire()
 
+    def _generate_issue_number(self, cursor, project_id: str) -> str:
+        """Generate unique issue number (runs on the writer so numbers can't collide)"""
         cursor.execute("""
             SELECT COUNT(*) FROM issue_tracking WHERE project_id = ?
         """, (project_id,))
 
         count = cursor.fetchone()[0]
-        conn.close()
 
         return f"ISS-{project_id}-{count + 1:03d}"
 
@@ -69,42 +70,43 @@ class IssueService:
 
     def create_issue(self, issue_data: IssueCreate) -> IssueResponse:
         """Create a new issue"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        def _insert(conn):
+            cursor = conn.cursor()
+
+            issue_number = self._generate_issue_number(cursor, issue_data.project_id)
+
+            cursor.execute("""
+                INSERT INTO issue_tracking (
+                    project_id, issue_number, issue_title, issue_description,
+                    issue_type, issue_category, severity, priority,
+                    reported_by, reported_date, assigned_to, owner_type,
+                    affected_wbs, impact_description, estimated_impact_days,
+                    status, resolution, root_cause,
+                    target_resolution_date, source, source_reference_id
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                issue_data.project_id, issue_number, issue_data.issue_title,
+                issue_data.issue_description, issue_data.issue_type, issue_data.issue_category,
+                issue_data.severity, issue_data.priority, issue_data.reported_by,
+                issue_data.reported_date, issue_data.assigned_to, issue_data.owner_type,
+                issue_data.affected_wbs, issue_data.impact_description,
+                issue_data.estimated_impact_days, issue_data.status,
+                issue_data.resolution, issue_data.root_cause,
+                issue_data.target_resolution_date, issue_data.source,
+                issue_data.source_reference_id
+            ))
+
+            issue_id = cursor.lastrowid
+
+            # Log status history
+            self._log_status_change(
+                cursor, issue_id, None, issue_data.status,
+                issue_data.reported_by, "Issue created"
+            )
 
-        issue_number = self._generate_issue_number(issue_data.project_id)
+            return issue_id
 
-        cursor.execute("""
-            INSERT INTO issue_tracking (
-                project_id, issue_number, issue_title, issue_description,
-                issue_type, issue_category, severity, priority,
-                reported_by, reported_date, assigned_to, owner_type,
-                affected_wbs, impact_description, estimated_impact_days,
-                status, resolution, root_cause,
-                target_resolution_date, source, source_reference_id
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            issue_data.project_id, issue_number, issue_data.issue_title,
-            issue_data.issue_description, issue_data.issue_type, issue_data.issue_category,
-            issue_data.severity, issue_data.priority, issue_data.reported_by,
-            issue_data.reported_date, issue_data.assigned_to, issue_data.owner_type,
-            issue_data.affected_wbs, issue_data.impact_description,
-            issue_data.estimated_impact_days, issue_data.status,
-            issue_data.resolution, issue_data.root_cause,
-            issue_data.target_resolution_date, issue_data.source,
-            issue_data.source_reference_id
-        ))
-
-        issue_id = cursor.lastrowid
-
-        # Log status history
-        self._log_status_change(
-            cursor, issue_id, None, issue_data.status,
-            issue_data.reported_by, "Issue created"
-        )
-
-        conn.commit()
-        conn.close()
+        issue_id = get_writer(self.db_path).execute(_insert)
 
         return self.get_issue_by_id(issue_id)
 
@@ -150,9 +152,14 @@ class IssueService:
         assigned_to: Optional[str] = None,
         is_escalated: Optional[bool] = None,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[IssueResponse]:
-        """Get list of issues with filters"""
+        limit: int = 100,
+        page_cursor: Optional[str] = None
+    ) -> Page:
+        """Get list of issues with filters
+
+        ``page_cursor`` (a previous page's next_cursor) continues after that
+        page and takes precedence over ``skip``.
+        """
         conn = self._get_connection()
         cursor = conn.cursor()
 
@@ -187,11 +194,17 @@ class IssueService:
             query += " AND is_escalated = ?"
             params.append(1 if is_escalated else 0)
 
-        query += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
-        params.extend([limit, skip])
+        if page_cursor:
+            condition, cursor_params = ISSUE_KEYSET.after(page_cursor)
+            query += f" AND {condition}"
+            params.extend(cursor_params)
+            skip = 0
+
+        query += f" ORDER BY {ISSUE_KEYSET.order_by()} LIMIT ? OFFSET ?"
+        params.extend([limit + 1, skip])
 
         cursor.execute(query, params)
-        rows = cursor.fetchall()
+        rows, next_cursor = paginate(cursor.fetchall(), limit, ISSUE_KEYSET)
         conn.close()
 
         items = []
@@ -201,7 +214,7 @@ class IssueService:
             item_dict.update(metrics)
             items.append(IssueResponse(**item_dict))
 
-        return items
+        return Page(items, next_cursor)
 
     def get_issue_count(
         self,
@@ -256,75 +269,73 @@ class IssueService:
 
     def update_issue(self, issue_id: int, issue_update: IssueUpdate, changed_by: str = "System") -> Optional[IssueResponse]:
         """Update issue"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        update_data = issue_update.model_dump(exclude_unset=True)
 
-        # Get current status
-        cursor.execute("SELECT status FROM issue_tracking WHERE issue_id = ?", (issue_id,))
-        current = cursor.fetchone()
-        if not current:
-            conn.close()
-            return None
+        def _update(conn):
+            cursor = conn.cursor()
 
-        old_status = current['status']
+            # Get current status
+            cursor.execute("SELECT status FROM issue_tracking WHERE issue_id = ?", (issue_id,))
+            current = cursor.fetchone()
+            if not current:
+                return False
 
-        # Build dynamic UPDATE query
-        update_fields = []
-        params = []
+            old_status = current['status']
 
-        update_data = issue_update.model_dump(exclude_unset=True)
+            # Build dynamic UPDATE query
+            update_fields = []
+            params = []
 
-        for field, value in update_data.items():
-            update_fields.append(f"{field} = ?")
-            params.append(value)
+            for field, value in update_data.items():
+                update_fields.append(f"{field} = ?")
+                params.append(value)
 
-        if not update_fields:
-            conn.close()
-            return self.get_issue_by_id(issue_id)
+            if not update_fields:
+                return True
 
-        # Add updated_at
-        update_fields.append("updated_at = ?")
-        params.append(datetime.now())
+            # Add updated_at
+            update_fields.append("updated_at = ?")
+            params.append(datetime.now())
 
-        params.append(issue_id)
+            params.append(issue_id)
 
-        query = f"UPDATE issue_tracking SET {', '.join(update_fields)} WHERE issue_id = ?"
+            query = f"UPDATE issue_tracking SET {', '.join(update_fields)} WHERE issue_id = ?"
 
-        cursor.execute(query, params)
+            cursor.execute(query, params)
 
-        # Log status change if status was updated
-        if 'status' in update_data and update_data['status'] != old_status:
-            self._log_status_change(
-                cursor, issue_id, old_status, update_data['status'],
-                changed_by, "Status updated"
-            )
+            # Log status change if status was updated
+            if 'status' in update_data and update_data['status'] != old_status:
+                self._log_status_change(
+                    cursor, issue_id, old_status, update_data['status'],
+                    changed_by, "Status updated"
+                )
 
-        conn.commit()
-        conn.close()
+            return True
+
+        if not get_writer(self.db_path).execute(_update):
+            return None
 
         return self.get_issue_by_id(issue_id)
 
     def delete_issue(self, issue_id: int) -> bool:
         """Delete issue"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        def _delete(conn):
+            cursor = conn.cursor()
 
-        # Check if issue exists
-        cursor.execute("SELECT issue_id FROM issue_tracking WHERE issue_id = ?", (issue_id,))
-        if not cursor.fetchone():
-            conn.close()
-            return False
+            # Check if issue exists
+            cursor.execute("SELECT issue_id FROM issue_tracking WHERE issue_id = ?", (issue_id,))
+            if not cursor.fetchone():
+                return False
 
-        # Delete status history
-        cursor.execute("DELETE FROM issue_status_history WHERE issue_id = ?", (issue_id,))
+            # Delete status history
+            cursor.execute("DELETE FROM issue_status_history WHERE issue_id = ?", (issue_id,))
 
-        # Delete the issue
-        cursor.execute("DELETE FROM issue_tracking WHERE issue_id = ?", (issue_id,))
+            # Delete the issue
+            cursor.execute("DELETE FROM issue_tracking WHERE issue_id = ?", (issue_id,))
 
-        conn.commit()
-        conn.close()
+            return True
 
-        return True
+        return get_writer(self.db_path).execute(_delete)
 
     def escalate_issue(self, issue_id: int, escalate_data: EscalateIssue) -> Optional[IssueResponse]:
         """Escalate an issue"""
@@ -334,35 +345,34 @@ class IssueService:
             escalation_reason=escalate_data.escalation_reason
         )
 
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        # Update escalation date
-        cursor.execute("""
-            UPDATE issue_tracking
-            SET is_escalated = 1,
-                escalation_level = ?,
-                escalation_reason = ?,
-                escalation_date = ?,
-                updated_at = ?
-            WHERE issue_id = ?
-        """, (
-            escalate_data.escalation_level,
-            escalate_data.escalation_reason,
-            date.today(),
-            datetime.now(),
-            issue_id
-        ))
-
-        # Log status change
-        self._log_status_change(
-            cursor, issue_id, None, "Escalated",
-            escalate_data.changed_by,
-            f"Escalated to {escalate_data.escalation_level}: {escalate_data.escalation_reason}"
-        )
+        def _escalate(conn):
+            cursor = conn.cursor()
+
+            # Update escalation date
+            cursor.execute("""
+                UPDATE issue_tracking
+                SET is_escalated = 1,
+                    escalation_level = ?,
+                    escalation_reason = ?,
+                    escalation_date = ?,
+                    updated_at = ?
+                WHERE issue_id = ?
+            """, (
+                escalate_data.escalation_level,
+                escalate_data.escalation_reason,
+                date.today(),
+                datetime.now(),
+                issue_id
+            ))
+
+            # Log status change
+            self._log_status_change(
+                cursor, issue_id, None, "Escalated",
+                escalate_data.changed_by,
+                f"Escalated to {escalate_data.escalation_level}: {escalate_data.escalation_reason}"
+            )
 
-        conn.commit()
-        conn.close()
+        get_writer(self.db_path).execute(_escalate)
 
         return self.get_issue_by_id(issue_id)
 
@@ -405,99 +415,28 @@ class IssueService:
     def get_issue_stats(self, project_id: Optional[str] = None) -> IssueStats:
         """Get issue statistics"""
         conn = self._get_connection()
-        cursor = conn.cursor()
-
-        where_clause = "WHERE 1=1"
-        params = []
-
-        if project_id:
-            where_clause += " AND project_id = ?"
-            params.append(project_id)
-
-        # Get status counts
-        cursor.execute(f"""
-            SELECT
-                COUNT(*) as total,
-                SUM(CASE WHEN status = 'Open' THEN 1 ELSE 0 END) as open,
-                SUM(CASE WHEN status = 'In Progress' THEN 1 ELSE 0 END) as in_progress,
-                SUM(CASE WHEN status = 'Pending' THEN 1 ELSE 0 END) as pending,
-                SUM(CASE WHEN status = 'Resolved' THEN 1 ELSE 0 END) as resolved,
-                SUM(CASE WHEN status = 'Closed' THEN 1 ELSE 0 END) as closed,
-                SUM(CASE WHEN status = 'Cancelled' THEN 1 ELSE 0 END) as cancelled,
-                SUM(CASE WHEN severity = 'Critical' THEN 1 ELSE 0 END) as critical,
-                SUM(CASE WHEN severity = 'High' THEN 1 ELSE 0 END) as high_severity,
-                SUM(CASE WHEN severity = 'Medium' THEN 1 ELSE 0 END) as medium_severity,
-                SUM(CASE WHEN severity = 'Low' THEN 1 ELSE 0 END) as low_severity,
-                SUM(CASE WHEN is_escalated = 1 THEN 1 ELSE 0 END) as escalated,
-                SUM(CASE WHEN target_resolution_date < date('now') AND status NOT IN ('Resolved', 'Closed') THEN 1 ELSE 0 END) as overdue
-            FROM issue_tracking
-            {where_clause}
-        """, params)
-
-        stats_row = cursor.fetchone()
-
-        # Get type counts
-        cursor.execute(f"""
-            SELECT issue_type, COUNT(*) as count
-            FROM issue_tracking
-            {where_clause}
-            GROUP BY issue_type
-        """, params)
-
-        type_rows = cursor.fetchall()
-        by_type = {row['issue_type']: row['count'] for row in type_rows}
-
-        # Get category counts
-        cursor.execute(f"""
-            SELECT issue_category, COUNT(*) as count
-            FROM issue_tracking
-            {where_clause}
-            GROUP BY issue_category
-        """, params)
-
-        category_rows = cursor.fetchall()
-        by_category = {row['issue_category']: row['count'] for row in category_rows}
-
-        # Get owner counts
-        cursor.execute(f"""
-            SELECT owner_type, COUNT(*) as count
-            FROM issue_tracking
-            {where_clause}
-            GROUP BY owner_type
-        """, params)
-
-        owner_rows = cursor.fetchall()
-        by_owner = {row['owner_type']: row['count'] for row in owner_rows if row['owner_type']}
-
-        # Calculate average resolution days
-        cursor.execute(f"""
-            SELECT AVG(julianday(actual_resolution_date) - julianday(reported_date)) as avg_days
-            FROM issue_tracking
-            {where_clause}
-            AND actual_resolution_date IS NOT NULL
-        """, params)
-
-        avg_row = cursor.fetchone()
-        avg_resolution_days = round(avg_row['avg_days'] or 0, 2)
-
+        stats = load_project_stats(conn, project_id, "issue_")
         conn.close()
 
+        by_owner = {owner: count for owner, count in stats.buckets('issue_owner').items() if owner}
+        avg_resolution_days = round(stats.average('issue_resolution') or 0, 2)
+
         return IssueStats(
-            total=stats_row['total'] or 0,
-            open=stats_row['open'] or 0,
-            in_progress=stats_row['in_progress'] or 0,
-            pending=stats_row['pending'] or 0,
-            resolved=stats_row['resolved'] or 0,
-            closed=stats_row['closed'] or 0,
-            cancelled=stats_row['cancelled'] or 0,
-            critical=stats_row['critical'] or 0,
-            high_severity=stats_row['high_severity'] or 0,
-            medium_severity=stats_row['medium_severity'] or 0,
-            low_severity=stats_row['low_severity'] or 0,
-            escalated=stats_row['escalated'] or 0,
-            overdue=stats_row['overdue'] or 0,
-            by_type=by_type,
-            by_category=by_category,
+            total=stats.count('issue_status'),
+            open=stats.count('issue_status', 'Open'),
+            in_progress=stats.count('issue_status', 'In Progress'),
+            pending=stats.count('issue_status', 'Pending'),
+            resolved=stats.count('issue_status', 'Resolved'),
+            closed=stats.count('issue_status', 'Closed'),
+            cancelled=stats.count('issue_status', 'Cancelled'),
+            critical=stats.count('issue_severity', 'Critical'),
+            high_severity=stats.count('issue_severity', 'High'),
+            medium_severity=stats.count('issue_severity', 'Medium'),
+            low_severity=stats.count('issue_severity', 'Low'),
+            escalated=stats.count('issue_escalated'),
+            overdue=stats.count_before('issue_open_due', today()),
+            by_type=stats.buckets('issue_type'),
+            by_category=stats.buckets('issue_category'),
             by_owner=by_owner,
             avg_resolution_days=avg_resolution_days
         )
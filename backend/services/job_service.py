@@ -0,0 +1,403 @@
+"""
+Background job service for long-running imports, exports and backups
+
+Jobs run in a small in-process worker pool. Each job is persisted in the
+background_jobs table so clients can poll progress, cancel it and download
+its result file after the submitting request has returned.
+"""
+import json
+import shutil
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+from backend.config import settings
+from backend.db_pool import get_pool
+from backend.db_writer import get_writer
+from backend.models.job import JobResponse
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job once cancellation has been requested"""
+
+
+class JobContext:
+    """Handle given to a running job for parameters, progress and cancellation"""
+
+    def __init__(self, service: "JobService", job_id: str, params: Dict[str, Any], work_dir: Path):
+        self.job_id = job_id
+        self.params = params
+        self.work_dir = work_dir
+        self.result_file: Optional[Path] = None
+        self._service = service
+
+    @property
+    def input_file(self) -> Path:
+        """Uploaded file stored with the job at submission"""
+        return self.work_dir / "input"
+
+    @property
+    def cancelled(self) -> bool:
+        return self._service._is_cancel_requested(self.job_id)
+
+    def check_cancelled(self):
+        """Stop the job if cancellation was requested"""
+        if self.cancelled:
+            raise JobCancelled("Job cancelled")
+
+    def report(self, progress: Optional[int] = None, message: Optional[str] = None):
+        """Record progress (0-100) and/or a status message"""
+        self._service._update_job(
+            self.job_id,
+            progress=None if progress is None else max(0, min(100, int(progress))),
+            message=message,
+        )
+
+
+# Job type -> handler(ctx) returning the job result dict
+_handlers: Dict[str, Callable[[JobContext], Dict[str, Any]]] = {}
+# Job types that need an uploaded input file
+_input_job_types = set()
+# Job type -> parameters it can't run without
+_required_params: Dict[str, Tuple[str, ...]] = {}
+
+
+def register_job_type(job_type: str, needs_input: bool = False, required: Tuple[str, ...] = ()):
+    """Decorator registering a background job handler"""
+    def decorator(handler: Callable[[JobContext], Dict[str, Any]]):
+        _handlers[job_type] = handler
+        if needs_input:
+            _input_job_types.add(job_type)
+        _required_params[job_type] = required
+        return handler
+    return decorator
+
+
+# Shared by every JobService instance (routers each create their own)
+_executor = ThreadPoolExecutor(max_workers=settings.job_workers, thread_name_prefix="job-worker")
+_futures: Dict[str, Future] = {}
+_cancel_events: Dict[str, threading.Event] = {}
+_state_lock = threading.Lock()
+
+FINISHED_STATUSES = ('completed', 'failed', 'cancelled')
+
+
+class JobService:
+    """Service for submitting and tracking background jobs"""
+
+    def __init__(self):
+        self.db_path = str(settings.database_path)
+        self.jobs_dir = settings.database_path.parent / "jobs"
+
+    def _get_connection(self):
+        """Get database connection from the shared pool"""
+        return get_pool(self.db_path).acquire()
+
+    def _row_to_job(self, row) -> JobResponse:
+        job = dict(row)
+        job['params'] = json.loads(job['params']) if job['params'] else {}
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        job['has_file'] = bool(job.pop('result_file')) and job['status'] == 'completed'
+        job['cancel_requested'] = bool(job['cancel_requested'])
+        return JobResponse(**job)
+
+    def _update_job(self, job_id: str, **fields):
+        fields = {k: v for k, v in fields.items() if v is not None}
+        if not fields:
+            return
+        assignments = ', '.join(f"{field} = ?" for field in fields)
+        query = f"UPDATE background_jobs SET {assignments} WHERE job_id = ?"
+        params = list(fields.values()) + [job_id]
+        get_writer(self.db_path).execute(lambda conn: conn.execute(query, params))
+
+    def _is_cancel_requested(self, job_id: str) -> bool:
+        with _state_lock:
+            event = _cancel_events.get(job_id)
+        return event is not None and event.is_set()
+
+    def submit(
+        self,
+        job_type: str,
+        params: Optional[Dict[str, Any]] = None,
+        input_file: Optional[BinaryIO] = None,
+    ) -> JobResponse:
+        """Persist a job and queue it on the worker pool
+
+        Raises ValueError for an unknown job type or a missing upload or
+        required parameter, before anything is stored.
+        """
+        if job_type not in _handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+        if job_type in _input_job_types and input_file is None:
+            raise ValueError(f"Job type {job_type} requires an uploaded file")
+
+        params = params or {}
+        missing = [name for name in _required_params[job_type] if not params.get(name)]
+        if missing:
+            raise ValueError(f"Job type {job_type} requires parameter(s): {', '.join(missing)}")
+        job_id = uuid.uuid4().hex
+        work_dir = self.jobs_dir / job_id
+        work_dir.mkdir(parents=True, exist_ok=True)
+
+        try:
+            if input_file is not None:
+                with open(work_dir / "input", 'wb') as f:
+                    shutil.copyfileobj(input_file, f)
+
+            get_writer(self.db_path).execute(lambda conn: conn.execute("""
+                INSERT INTO background_jobs (job_id, job_type, status, progress, message, params, created_at)
+                VALUES (?, ?, 'queued', 0, 'Queued', ?, ?)
+            """, (job_id, job_type, json.dumps(params, ensure_ascii=False), datetime.now())))
+        except BaseException:
+            # Without its job row nothing would ever remove the directory
+            shutil.rmtree(work_dir, ignore_errors=True)
+            raise
+
+        with _state_lock:
+            _cancel_events[job_id] = threading.Event()
+            _futures[job_id] = _executor.submit(self._run, job_id, job_type, params, work_dir)
+
+        return self.get_job(job_id)
+
+    def _run(self, job_id: str, job_type: str, params: Dict[str, Any], work_dir: Path):
+        """Execute one job on a worker thread and record its outcome"""
+        ctx = JobContext(self, job_id, params, work_dir)
+
+        try:
+            ctx.check_cancelled()
+            self._update_job(job_id, status='running', message='Running', started_at=datetime.now())
+
+            result = _handlers[job_type](ctx)
+
+            self._update_job(
+                job_id,
+                status='completed',
+                progress=100,
+                message='Completed',
+                result=json.dumps(result, ensure_ascii=False, default=str),
+                result_file=str(ctx.result_file) if ctx.result_file else None,
+                finished_at=datetime.now(),
+            )
+        except JobCancelled:
+            self._update_job(job_id, status='cancelled', message='Cancelled', finished_at=datetime.now())
+        except Exception as e:
+            self._update_job(job_id, status='failed', message='Failed', error=str(e), finished_at=datetime.now())
+        finally:
+            ctx.input_file.unlink(missing_ok=True)
+            with _state_lock:
+                _futures.pop(job_id, None)
+                _cancel_events.pop(job_id, None)
+
+    def get_job(self, job_id: str) -> Optional[JobResponse]:
+        """Get job by ID"""
+        conn = self._get_connection()
+        row = conn.execute("SELECT * FROM background_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        conn.close()
+
+        return self._row_to_job(row) if row else None
+
+    def _build_filters(self, status: Optional[str], job_type: Optional[str]):
+        where = []
+        params = []
+        if status:
+            where.append("status = ?")
+            params.append(status)
+        if job_type:
+            where.append("job_type = ?")
+            params.append(job_type)
+        return (" WHERE " + " AND ".join(where)) if where else "", params
+
+    def get_job_list(
+        self,
+        status: Optional[str] = None,
+        job_type: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 50
+    ) -> List[JobResponse]:
+        """Get jobs, newest first"""
+        where, params = self._build_filters(status, job_type)
+        query = f"SELECT * FROM background_jobs{where} ORDER BY created_at DESC LIMIT ? OFFSET ?"
+
+        conn = self._get_connection()
+        rows = conn.execute(query, params + [limit, skip]).fetchall()
+        conn.close()
+
+        return [self._row_to_job(row) for row in rows]
+
+    def get_job_count(self, status: Optional[str] = None, job_type: Optional[str] = None) -> int:
+        """Get total count of jobs"""
+        where, params = self._build_filters(status, job_type)
+
+        conn = self._get_connection()
+        count = conn.execute(f"SELECT COUNT(*) FROM background_jobs{where}", params).fetchone()[0]
+        conn.close()
+
+        return count
+
+    def cancel_job(self, job_id: str) -> Optional[JobResponse]:
+        """
+        Cancel a job
+
+        A queued job is cancelled immediately; a running job stops at its next
+        progress check. Raises ValueError if the job has already finished.
+        """
+        job = self.get_job(job_id)
+        if not job:
+            return None
+        if job.status in FINISHED_STATUSES:
+            raise ValueError(f"Job already {job.status}")
+
+        with _state_lock:
+            event = _cancel_events.get(job_id)
+            future = _futures.get(job_id)
+            if event is not None:
+                event.set()
+            dequeued = future is not None and future.cancel()
+            if dequeued:
+                # The job never started, so _run will not clean up after it
+                _futures.pop(job_id, None)
+                _cancel_events.pop(job_id, None)
+
+        if dequeued:
+            (self.jobs_dir / job_id / "input").unlink(missing_ok=True)
+            self._update_job(job_id, status='cancelled', message='Cancelled',
+                             cancel_requested=1, finished_at=datetime.now())
+        else:
+            # The job may have finished meanwhile; keep its final message then
+            get_writer(self.db_path).execute(lambda conn: conn.execute("""
+                UPDATE background_jobs SET cancel_requested = 1, message = 'Cancelling'
+                WHERE job_id = ? AND status IN ('queued', 'running')
+            """, (job_id,)))
+
+        return self.get_job(job_id)
+
+    def get_result_file(self, job_id: str) -> Optional[Path]:
+        """Get the file produced by a completed job"""
+        conn = self._get_connection()
+        row = conn.execute(
+            "SELECT result_file FROM background_jobs WHERE job_id = ? AND status = 'completed'",
+            (job_id,)
+        ).fetchone()
+        conn.close()
+
+        if not row or not row['result_file']:
+            return None
+        path = Path(row['result_file'])
+        return path if path.exists() else None
+
+    def delete_job(self, job_id: str) -> bool:
+        """Delete a finished job and its files"""
+        job = self.get_job(job_id)
+        if not job:
+            return False
+        if job.status not in FINISHED_STATUSES:
+            raise ValueError("Only finished jobs can be deleted")
+
+        get_writer(self.db_path).execute(
+            lambda conn: conn.execute("DELETE FROM background_jobs WHERE job_id = ?", (job_id,))
+        )
+        shutil.rmtree(self.jobs_dir / job_id, ignore_errors=True)
+        return True
+
+    def recover_jobs(self) -> int:
+        """
+        Tidy up job records on startup
+
+        Jobs left queued or running by a previous process are marked failed,
+        and finished jobs older than job_retention_days are removed together
+        with their files. Returns the number of interrupted jobs.
+        """
+        cutoff = datetime.now() - timedelta(days=settings.job_retention_days)
+
+        def _recover(conn):
+            interrupted = conn.execute("""
+                UPDATE background_jobs
+                SET status = 'failed', error = 'Interrupted by server restart',
+                    message = 'Failed', finished_at = ?
+                WHERE status IN ('queued', 'running')
+            """, (datetime.now(),)).rowcount
+            expired = [row[0] for row in conn.execute(
+                "SELECT job_id FROM background_jobs WHERE finished_at < ?", (cutoff,)
+            )]
+            conn.execute("DELETE FROM background_jobs WHERE finished_at < ?", (cutoff,))
+            return interrupted, expired
+
+        interrupted, expired = get_writer(self.db_path).execute(_recover)
+        for job_id in expired:
+            shutil.rmtree(self.jobs_dir / job_id, ignore_errors=True)
+        return interrupted
+
+
+def shutdown_jobs():
+    """Ask running jobs to stop, drop queued ones and wait for the workers"""
+    with _state_lock:
+        for event in _cancel_events.values():
+            event.set()
+    _executor.shutdown(wait=True, cancel_futures=True)
+
+
+# Built-in job types
+
+def _export_job(ctx: JobContext, export: Callable, count: Callable, filename: str) -> Dict[str, Any]:
+    """Run an Excel export into the job directory with row-based progress"""
+    project_id = ctx.params['project_id']
+    total = count(project_id=project_id)
+
+    def _on_progress(written: int):
+        ctx.check_cancelled()
+        ctx.report(progress=written * 100 // max(total, 1), message=f"{written} / {total} rows written")
+
+    output_path = ctx.work_dir / filename
+    result = export(project_id, str(output_path), on_progress=_on_progress)
+
+    # Exports report failures (including a cancel raised from on_progress) in the result
+    ctx.check_cancelled()
+    if not result['success']:
+        raise ValueError(result.get('error', 'Export failed'))
+
+    ctx.result_file = output_path
+    return {'exported': result['exported'], 'filename': filename}
+
+
+@register_job_type('export_wbs', required=('project_id',))
+def _export_wbs(ctx: JobContext) -> Dict[str, Any]:
+    from backend.services.excel_service import ExcelService
+    from backend.services.wbs_service import WBSService
+    return _export_job(ctx, ExcelService().export_wbs_to_excel, WBSService().get_wbs_count,
+                       f"WBS_{ctx.params['project_id']}.xlsx")
+
+
+@register_job_type('export_pending', required=('project_id',))
+def _export_pending(ctx: JobContext) -> Dict[str, Any]:
+    from backend.services.excel_service import ExcelService
+    from backend.services.pending_service import PendingService
+    return _export_job(ctx, ExcelService().export_pending_to_excel, PendingService().get_pending_count,
+                       f"待辦事項_{ctx.params['project_id']}.xlsx")
+
+
+@register_job_type('export_issues', required=('project_id',))
+def _export_issues(ctx: JobContext) -> Dict[str, Any]:
+    from backend.services.excel_service import ExcelService
+    from backend.services.issue_service import IssueService
+    return _export_job(ctx, ExcelService().export_issues_to_excel, IssueService().get_issue_count,
+                       f"問題追蹤_{ctx.params['project_id']}.xlsx")
+
+
+@register_job_type('import_wbs', needs_input=True, required=('project_id',))
+def _import_wbs(ctx: JobContext) -> Dict[str, Any]:
+    from backend.services.excel_service import ExcelService
+    ctx.report(progress=10, message="Importing WBS items")
+    result = ExcelService().import_wbs_from_excel(str(ctx.input_file), ctx.params['project_id'])
+    # Row-level failures stay in the result; only a sheet-level error fails the job
+    if 'error' in result:
+        raise ValueError(result['error'])
+    return result
+
+
+@register_job_type('create_backup')
+def _create_backup(ctx: JobContext) -> Dict[str, Any]:
+    from backend.services.backup_service import BackupService
+    ctx.report(progress=10, message="Creating backup")
+    return BackupService().create_backup(description=ctx.params.get('description'))
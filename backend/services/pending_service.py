@@ -1,16 +1,27 @@
 """
 Business logic service for Pending Items management
 """
-import sqlite3
 from datetime import date, datetime
 from typing import List, Optional, Dict, Any
 from backend.config import settings
+from backend.db_pool import get_pool
+from backend.db_writer import get_writer
+from backend.pagination import Keyset, Page, SortKey, paginate
+from backend.project_stats import load_project_stats, today
 from backend.models.pending import (
     PendingCreate, PendingUpdate, PendingResponse, PendingStats,
     PendingReplyCreate, PendingReplyResponse, PendingWithReplies
 )
 
 
+# Sort order of pending lists (latest task date first)
+PENDING_KEYSET = Keyset(
+    SortKey("task_date", descending=True),
+    SortKey("created_at", descending=True),
+    SortKey("pending_id", descending=True),
+)
+
+
 class PendingService:
     """Service for managing pending items"""
 
@@ -18,10 +29,8 @@ class PendingService:
         self.db_path = str(settings.database_path)
 
     def _get_connection(self):
-        """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get database connection from the shared pool"""
+        return get_pool(self.db_path).acquire()
 
     def _calculate_pending_metrics(self, item: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate is_overdue and days_until_due"""
@@ -45,35 +54,35 @@ class PendingService:
 
     def create_pending(self, pending_data: PendingCreate) -> PendingResponse:
         """Create a new pending item"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            INSERT INTO pending_items (
-                project_id, task_date, source_type, contact_info, description,
-                planned_start_date, expected_completion_date, handling_notes,
-                related_wbs, related_action_item, related_issue_id,
-                status, priority
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            pending_data.project_id,
-            pending_data.task_date,
-            pending_data.source_type,
-            pending_data.contact_info,
-            pending_data.description,
-            pending_data.planned_start_date,
-            pending_data.expected_completion_date,
-            pending_data.handling_notes,
-            pending_data.related_wbs,
-            pending_data.related_action_item,
-            pending_data.related_issue_id,
-            pending_data.status,
-            pending_data.priority
-        ))
-
-        pending_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        def _insert(conn):
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                INSERT INTO pending_items (
+                    project_id, task_date, source_type, contact_info, description,
+                    planned_start_date, expected_completion_date, handling_notes,
+                    related_wbs, related_action_item, related_issue_id,
+                    status, priority
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                pending_data.project_id,
+                pending_data.task_date,
+                pending_data.source_type,
+                pending_data.contact_info,
+                pending_data.description,
+                pending_data.planned_start_date,
+                pending_data.expected_completion_date,
+                pending_data.handling_notes,
+                pending_data.related_wbs,
+                pending_data.related_action_item,
+                pending_data.related_issue_id,
+                pending_data.status,
+                pending_data.priority
+            ))
+
+            return cursor.lastrowid
+
+        pending_id = get_writer(self.db_path).execute(_insert)
 
         return self.get_pending_by_id(pending_id)
 
@@ -106,9 +115,14 @@ class PendingService:
         is_replied: Optional[bool] = None,
         priority: Optional[str] = None,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[PendingResponse]:
-        """Get list of pending items with filters"""
+        limit: int = 100,
+        page_cursor: Optional[str] = None
+    ) -> Page:
+        """Get list of pending items with filters
+
+        ``page_cursor`` (a previous page's next_cursor) continues after that
+        page and takes precedence over ``skip``.
+        """
         conn = self._get_connection()
         cursor = conn.cursor()
 
@@ -135,11 +149,17 @@ class PendingService:
             query += " AND priority = ?"
             params.append(priority)
 
-        query += " ORDER BY task_date DESC, created_at DESC LIMIT ? OFFSET ?"
-        params.extend([limit, skip])
+        if page_cursor:
+            condition, cursor_params = PENDING_KEYSET.after(page_cursor)
+            query += f" AND {condition}"
+            params.extend(cursor_params)
+            skip = 0
+
+        query += f" ORDER BY {PENDING_KEYSET.order_by()} LIMIT ? OFFSET ?"
+        params.extend([limit + 1, skip])
 
         cursor.execute(query, params)
-        rows = cursor.fetchall()
+        rows, next_cursor = paginate(cursor.fetchall(), limit, PENDING_KEYSET)
         conn.close()
 
         items = []
@@ -149,7 +169,7 @@ class PendingService:
             item_dict.update(metrics)
             items.append(PendingResponse(**item_dict))
 
-        return items
+        return Page(items, next_cursor)
 
     def get_pending_count(
         self,
@@ -194,9 +214,6 @@ class PendingService:
 
     def update_pending(self, pending_id: int, pending_update: PendingUpdate) -> Optional[PendingResponse]:
         """Update pending item"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
         # Build dynamic UPDATE query
         update_fields = []
         params = []
@@ -208,7 +225,6 @@ class PendingService:
             params.append(value)
 
         if not update_fields:
-            conn.close()
             return self.get_pending_by_id(pending_id)
 
         # Add updated_at
@@ -219,29 +235,25 @@ class PendingService:
 
         query = f"UPDATE pending_items SET {', '.join(update_fields)} WHERE pending_id = ?"
 
-        cursor.execute(query, params)
-        conn.commit()
-        conn.close()
+        get_writer(self.db_path).execute(lambda conn: conn.execute(query, params))
 
         return self.get_pending_by_id(pending_id)
 
     def delete_pending(self, pending_id: int) -> bool:
         """Delete pending item"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        def _delete(conn):
+            cursor = conn.cursor()
 
-        # Check if item exists
-        cursor.execute("SELECT pending_id FROM pending_items WHERE pending_id = ?", (pending_id,))
-        if not cursor.fetchone():
-            conn.close()
-            return False
+            # Check if item exists
+            cursor.execute("SELECT pending_id FROM pending_items WHERE pending_id = ?", (pending_id,))
+            if not cursor.fetchone():
+                return False
 
-        cursor.execute("DELETE FROM pending_items WHERE pending_id = ?", (pending_id,))
+            cursor.execute("DELETE FROM pending_items WHERE pending_id = ?", (pending_id,))
 
-        conn.commit()
-        conn.close()
+            return True
 
-        return True
+        return get_writer(self.db_path).execute(_delete)
 
     def mark_as_replied(self, pending_id: int) -> Optional[PendingResponse]:
         """Mark pending item as replied"""
@@ -255,62 +267,22 @@ class PendingService:
     def get_pending_stats(self, project_id: Optional[str] = None) -> PendingStats:
         """Get pending items statistics"""
         conn = self._get_connection()
-        cursor = conn.cursor()
-
-        # Base query
-        where_clause = "WHERE 1=1"
-        params = []
-
-        if project_id:
-            where_clause += " AND project_id = ?"
-            params.append(project_id)
-
-        # Get status counts
-        cursor.execute(f"""
-            SELECT
-                COUNT(*) as total,
-                SUM(CASE WHEN status = '待處理' THEN 1 ELSE 0 END) as pending,
-                SUM(CASE WHEN status = '處理中' THEN 1 ELSE 0 END) as in_progress,
-                SUM(CASE WHEN status = '已完成' THEN 1 ELSE 0 END) as completed,
-                SUM(CASE WHEN status = '已取消' THEN 1 ELSE 0 END) as cancelled,
-                SUM(CASE WHEN is_replied = 1 THEN 1 ELSE 0 END) as replied,
-                SUM(CASE WHEN is_replied = 0 THEN 1 ELSE 0 END) as not_replied,
-                SUM(CASE WHEN expected_completion_date < date('now') AND is_replied = 0 THEN 1 ELSE 0 END) as overdue,
-                SUM(CASE WHEN priority = 'High' THEN 1 ELSE 0 END) as high_priority,
-                SUM(CASE WHEN priority = 'Medium' THEN 1 ELSE 0 END) as medium_priority,
-                SUM(CASE WHEN priority = 'Low' THEN 1 ELSE 0 END) as low_priority
-            FROM pending_items
-            {where_clause}
-        """, params)
-
-        stats_row = cursor.fetchone()
-
-        # Get source counts
-        cursor.execute(f"""
-            SELECT source_type, COUNT(*) as count
-            FROM pending_items
-            {where_clause}
-            GROUP BY source_type
-        """, params)
-
-        source_rows = cursor.fetchall()
-        by_source = {row['source_type']: row['count'] for row in source_rows}
-
+        stats = load_project_stats(conn, project_id, "pending_")
         conn.close()
 
         return PendingStats(
-            total=stats_row['total'] or 0,
-            pending=stats_row['pending'] or 0,
-            in_progress=stats_row['in_progress'] or 0,
-            completed=stats_row['completed'] or 0,
-            cancelled=stats_row['cancelled'] or 0,
-            replied=stats_row['replied'] or 0,
-            not_replied=stats_row['not_replied'] or 0,
-            overdue=stats_row['overdue'] or 0,
-            high_priority=stats_row['high_priority'] or 0,
-            medium_priority=stats_row['medium_priority'] or 0,
-            low_priority=stats_row['low_priority'] or 0,
-            by_source=by_source
+            total=stats.count('pending_status'),
+            pending=stats.count('pending_status', '待處理'),
+            in_progress=stats.count('pending_status', '處理中'),
+            completed=stats.count('pending_status', '已完成'),
+            cancelled=stats.count('pending_status', '已取消'),
+            replied=stats.count('pending_replied', '1'),
+            not_replied=stats.count('pending_replied', '0'),
+            overdue=stats.count_before('pending_completion_due', today()),
+            high_priority=stats.count('pending_priority', 'High'),
+            medium_priority=stats.count('pending_priority', 'Medium'),
+            low_priority=stats.count('pending_priority', 'Low'),
+            by_source=stats.buckets('pending_source')
         )
 
     def get_overdue_items(self, project_id: Optional[str] = None) -> List[PendingResponse]:
@@ -347,39 +319,42 @@ class PendingService:
 
     def add_reply(self, pending_id: int, reply_data: PendingReplyCreate) -> PendingReplyResponse:
         """Add a reply to a pending item"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        # Check if pending item exists
-        cursor.execute("SELECT pending_id FROM pending_items WHERE pending_id = ?", (pending_id,))
-        if not cursor.fetchone():
-            conn.close()
-            raise ValueError(f"Pending item {pending_id} not found")
-
-        # Insert reply
-        cursor.execute("""
-            INSERT INTO pending_replies (
-                pending_id, reply_date, reply_content, replied_by
-            ) VALUES (?, ?, ?, ?)
-        """, (
-            pending_id,
-            reply_data.reply_date,
-            reply_data.reply_content,
-            reply_data.replied_by
-        ))
-
-        reply_id = cursor.lastrowid
-
-        # Update pending_items to mark as replied (for backward compatibility)
-        cursor.execute("""
-            UPDATE pending_items
-            SET is_replied = 1, actual_completion_date = ?
-            WHERE pending_id = ?
-        """, (reply_data.reply_date, pending_id))
-
-        conn.commit()
+        def _insert(conn):
+            cursor = conn.cursor()
+
+            # Check if pending item exists
+            cursor.execute("SELECT pending_id FROM pending_items WHERE pending_id = ?", (pending_id,))
+            if not cursor.fetchone():
+                raise ValueError(f"Pending item {pending_id} not found")
+
+            # Insert reply
+            cursor.execute("""
+                INSERT INTO pending_replies (
+                    pending_id, reply_date, reply_content, replied_by
+                ) VALUES (?, ?, ?, ?)
+            """, (
+                pending_id,
+                reply_data.reply_date,
+                reply_data.reply_content,
+                reply_data.replied_by
+            ))
+
+            reply_id = cursor.lastrowid
+
+            # Update pending_items to mark as replied (for backward compatibility)
+            cursor.execute("""
+                UPDATE pending_items
+                SET is_replied = 1, actual_completion_date = ?
+                WHERE pending_id = ?
+            """, (reply_data.reply_date, pending_id))
+
+            return reply_id
+
+        reply_id = get_writer(self.db_path).execute(_insert)
 
         # Get the created reply
+        conn = self._get_connection()
+        cursor = conn.cursor()
         cursor.execute("SELECT * FROM pending_replies WHERE reply_id = ?", (reply_id,))
         row = cursor.fetchone()
         conn.close()
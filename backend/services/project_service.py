@@ -5,9 +5,17 @@ import sqlite3
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 from backend.config import settings
+from backend.db_pool import get_pool
+from backend.db_writer import get_writer
+from backend.pagination import Keyset, Page, SortKey, paginate
+from backend.project_stats import load_project_stats, today
 from backend.models.project import ProjectCreate, ProjectUpdate, ProjectResponse, ProjectStats
 
 
+# Sort order of project lists (newest first)
+PROJECT_KEYSET = Keyset(SortKey("created_at", descending=True), SortKey("project_id", descending=True))
+
+
 class ProjectService:
     """Service for managing projects"""
 
@@ -15,7 +23,7 @@ class ProjectService:
         self.db_path = str(settings.database_path)
 
     def _get_connection(self):
-        """Get database connection"""
+        """Get database connection from the shared pool"""
         try:
             # Check if database file exists
             from pathlib import Path
@@ -26,19 +34,14 @@ class ProjectService:
                     "Please ensure the database has been initialized."
                 )
 
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            return conn
+            return get_pool(self.db_path).acquire()
         except sqlite3.Error as e:
             raise RuntimeError(f"Failed to connect to database at {self.db_path}: {str(e)}")
 
     def create_project(self, project_data: ProjectCreate) -> ProjectResponse:
         """Create a new project"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
         try:
-            cursor.execute("""
+            get_writer(self.db_path).execute(lambda conn: conn.execute("""
                 INSERT INTO projects (
                     project_id, project_name, description, status
                 ) VALUES (?, ?, ?, ?)
@@ -47,102 +50,88 @@ class ProjectService:
                 project_data.project_name,
                 project_data.description,
                 project_data.status
-            ))
-
-            conn.commit()
-            return self.get_project_by_id(project_data.project_id)
+            )))
         except sqlite3.IntegrityError:
             raise ValueError(f"Project with ID '{project_data.project_id}' already exists")
-        finally:
-            conn.close()
-
-    def get_project_by_id(self, project_id: str) -> Optional[ProjectResponse]:
-        """Get project by ID with statistics"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        # Get project basic info
-        cursor.execute("""
-            SELECT * FROM projects WHERE project_id = ?
-        """, (project_id,))
-
-        row = cursor.fetchone()
-        if not row:
-            conn.close()
-            return None
 
-        project_dict = dict(row)
+        return self.get_project_by_id(project_data.project_id)
 
-        # Get WBS statistics
-        cursor.execute("""
+    # Counts come from the trigger-maintained project_stats rows (see
+    # backend.project_stats), three metrics per project on the page
+    _PROJECTS_WITH_STATS_QUERY = """
+        SELECT * FROM (
             SELECT
-                COUNT(*) as total,
-                SUM(CASE WHEN status = '已完成' THEN 1 ELSE 0 END) as completed,
-                SUM(CASE WHEN status = '進行中' THEN 1 ELSE 0 END) as in_progress
-            FROM tracking_items
-            WHERE project_id = ? AND item_type = 'WBS'
-        """, (project_id,))
-
-        wbs_stats = cursor.fetchone()
-        project_dict['total_wbs'] = wbs_stats['total'] or 0
-        project_dict['completed_wbs'] = wbs_stats['completed'] or 0
-        project_dict['in_progress_wbs'] = wbs_stats['in_progress'] or 0
-
-        # Get issue statistics
-        cursor.execute("""
-            SELECT COUNT(*) as total
-            FROM issue_tracking
-            WHERE project_id = ?
-        """, (project_id,))
-
-        issue_stats = cursor.fetchone()
-        project_dict['total_issues'] = issue_stats['total'] or 0
-
-        # Get pending items statistics
-        cursor.execute("""
-            SELECT COUNT(*) as total
-            FROM pending_items
-            WHERE project_id = ?
-        """, (project_id,))
-
-        pending_stats = cursor.fetchone()
-        project_dict['total_pending'] = pending_stats['total'] or 0
-
+                page.*,
+                SUM(CASE WHEN s.metric = 'wbs_status' THEN s.count ELSE 0 END) AS total_wbs,
+                SUM(CASE WHEN s.metric = 'wbs_status' AND s.bucket = '已完成' THEN s.count ELSE 0 END)
+                    AS completed_wbs,
+                SUM(CASE WHEN s.metric = 'wbs_status' AND s.bucket = '進行中' THEN s.count ELSE 0 END)
+                    AS in_progress_wbs,
+                SUM(CASE WHEN s.metric = 'issue_status' THEN s.count ELSE 0 END) AS total_issues,
+                SUM(CASE WHEN s.metric = 'pending_status' THEN s.count ELSE 0 END) AS total_pending
+            FROM (
+                SELECT * FROM projects
+                WHERE {filters}
+                ORDER BY {order_by}
+                LIMIT ? OFFSET ?
+            ) page
+            LEFT JOIN project_stats s
+                ON s.project_id = page.project_id
+               AND s.metric IN ('wbs_status', 'issue_status', 'pending_status')
+            GROUP BY page.project_id
+        )
+        ORDER BY {order_by}
+    """
+
+    def _query_projects_with_stats(
+        self,
+        filters: str,
+        params: List[Any],
+        skip: int = 0,
+        limit: int = -1
+    ) -> List[sqlite3.Row]:
+        """Run the grouped projects query (limit -1 means no limit)"""
+        conn = self._get_connection()
+        rows = conn.execute(
+            self._PROJECTS_WITH_STATS_QUERY.format(filters=filters, order_by=PROJECT_KEYSET.order_by()),
+            params + [limit, skip]
+        ).fetchall()
         conn.close()
-        return ProjectResponse(**project_dict)
+        return rows
+
+    def get_project_by_id(self, project_id: str) -> Optional[ProjectResponse]:
+        """Get project by ID with statistics"""
+        rows = self._query_projects_with_stats("project_id = ?", [project_id])
+        return ProjectResponse(**dict(rows[0])) if rows else None
 
     def get_project_list(
         self,
         status: Optional[str] = None,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[ProjectResponse]:
-        """Get list of projects with filters"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        query = "SELECT * FROM projects WHERE 1=1"
+        limit: int = 100,
+        page_cursor: Optional[str] = None
+    ) -> Page:
+        """Get list of projects with filters
+
+        ``page_cursor`` (a previous page's next_cursor) continues after that
+        page and takes precedence over ``skip``.
+        """
+        filters = "1=1"
         params = []
 
         if status:
-            query += " AND status = ?"
+            filters += " AND status = ?"
             params.append(status)
 
-        query += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
-        params.extend([limit, skip])
-
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        conn.close()
-
-        # Get statistics for each project
-        projects = []
-        for row in rows:
-            project = self.get_project_by_id(row['project_id'])
-            if project:
-                projects.append(project)
+        if page_cursor:
+            condition, cursor_params = PROJECT_KEYSET.after(page_cursor)
+            filters += f" AND {condition}"
+            params.extend(cursor_params)
+            skip = 0
 
-        return projects
+        rows = self._query_projects_with_stats(filters, params, skip=skip, limit=limit + 1)
+        rows, next_cursor = paginate(rows, limit, PROJECT_KEYSET)
+        return Page([ProjectResponse(**dict(row)) for row in rows], next_cursor)
 
     def get_project_count(self, status: Optional[str] = None) -> int:
         """Get total count of projects"""
@@ -164,9 +153,6 @@ class ProjectService:
 
     def update_project(self, project_id: str, project_update: ProjectUpdate) -> Optional[ProjectResponse]:
         """Update project"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
         # Build dynamic UPDATE query
         update_fields = []
         params = []
@@ -178,7 +164,6 @@ class ProjectService:
             params.append(value)
 
         if not update_fields:
-            conn.close()
             return self.get_project_by_id(project_id)
 
         # Add updated_at
@@ -189,42 +174,38 @@ class ProjectService:
 
         query = f"UPDATE projects SET {', '.join(update_fields)} WHERE project_id = ?"
 
-        cursor.execute(query, params)
-        conn.commit()
-        conn.close()
+        get_writer(self.db_path).execute(lambda conn: conn.execute(query, params))
 
         return self.get_project_by_id(project_id)
 
     def delete_project(self, project_id: str) -> bool:
         """Delete project and all related data"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        def _delete(conn):
+            cursor = conn.cursor()
 
-        # Check if project exists
-        cursor.execute("SELECT project_id FROM projects WHERE project_id = ?", (project_id,))
-        if not cursor.fetchone():
-            conn.close()
-            return False
+            # Check if project exists
+            cursor.execute("SELECT project_id FROM projects WHERE project_id = ?", (project_id,))
+            if not cursor.fetchone():
+                return False
 
-        # Delete related data (cascade delete)
-        # Note: In production, consider soft delete or confirmation
+            # Delete related data (cascade delete)
+            # Note: In production, consider soft delete or confirmation
 
-        # Delete tracking items
-        cursor.execute("DELETE FROM tracking_items WHERE project_id = ?", (project_id,))
+            # Delete tracking items
+            cursor.execute("DELETE FROM tracking_items WHERE project_id = ?", (project_id,))
 
-        # Delete issues
-        cursor.execute("DELETE FROM issue_tracking WHERE project_id = ?", (project_id,))
+            # Delete issues
+            cursor.execute("DELETE FROM issue_tracking WHERE project_id = ?", (project_id,))
 
-        # Delete pending items
-        cursor.execute("DELETE FROM pending_items WHERE project_id = ?", (project_id,))
+            # Delete pending items
+            cursor.execute("DELETE FROM pending_items WHERE project_id = ?", (project_id,))
 
-        # Delete the project
-        cursor.execute("DELETE FROM projects WHERE project_id = ?", (project_id,))
+            # Delete the project
+            cursor.execute("DELETE FROM projects WHERE project_id = ?", (project_id,))
 
-        conn.commit()
-        conn.close()
+            return True
 
-        return True
+        return get_writer(self.db_path).execute(_delete)
 
     def get_project_stats(self, project_id: str) -> Optional[ProjectStats]:
         """Get detailed project statistics"""
@@ -246,58 +227,25 @@ class ProjectService:
             'project_name': row['project_name']
         }
 
-        # WBS Statistics
-        cursor.execute("""
-            SELECT
-                COUNT(*) as total,
-                SUM(CASE WHEN status = '已完成' THEN 1 ELSE 0 END) as completed,
-                SUM(CASE WHEN status = '進行中' THEN 1 ELSE 0 END) as in_progress,
-                SUM(CASE WHEN status = '未開始' THEN 1 ELSE 0 END) as not_started,
-                SUM(CASE WHEN is_overdue = 1 THEN 1 ELSE 0 END) as overdue,
-                AVG(actual_progress) as avg_progress
-            FROM tracking_items
-            WHERE project_id = ? AND item_type = 'WBS'
-        """, (project_id,))
-
-        wbs_stats = cursor.fetchone()
-        stats['total_wbs'] = wbs_stats['total'] or 0
-        stats['completed_wbs'] = wbs_stats['completed'] or 0
-        stats['in_progress_wbs'] = wbs_stats['in_progress'] or 0
-        stats['not_started_wbs'] = wbs_stats['not_started'] or 0
-        stats['overdue_wbs'] = wbs_stats['overdue'] or 0
-        stats['overall_progress'] = round(wbs_stats['avg_progress'] or 0, 2)
-
-        # Issue Statistics
-        cursor.execute("""
-            SELECT
-                COUNT(*) as total,
-                SUM(CASE WHEN status IN ('Open', 'In Progress') THEN 1 ELSE 0 END) as open,
-                SUM(CASE WHEN status IN ('Resolved', 'Closed') THEN 1 ELSE 0 END) as resolved,
-                SUM(CASE WHEN severity = 'Critical' THEN 1 ELSE 0 END) as critical
-            FROM issue_tracking
-            WHERE project_id = ?
-        """, (project_id,))
-
-        issue_stats = cursor.fetchone()
-        stats['total_issues'] = issue_stats['total'] or 0
-        stats['open_issues'] = issue_stats['open'] or 0
-        stats['resolved_issues'] = issue_stats['resolved'] or 0
-        stats['critical_issues'] = issue_stats['critical'] or 0
-
-        # Pending Items Statistics
-        cursor.execute("""
-            SELECT
-                COUNT(*) as total,
-                SUM(CASE WHEN is_replied = 1 THEN 1 ELSE 0 END) as replied,
-                SUM(CASE WHEN expected_reply_date < date('now') AND is_replied = 0 THEN 1 ELSE 0 END) as overdue
-            FROM pending_items
-            WHERE project_id = ?
-        """, (project_id,))
-
-        pending_stats = cursor.fetchone()
-        stats['total_pending'] = pending_stats['total'] or 0
-        stats['pending_replied'] = pending_stats['replied'] or 0
-        stats['pending_overdue'] = pending_stats['overdue'] or 0
+        # WBS, issue and pending counters are maintained by triggers
+        wbs = load_project_stats(conn, project_id, "wbs_")
+        stats['total_wbs'] = wbs.count('wbs_status')
+        stats['completed_wbs'] = wbs.count('wbs_status', '已完成')
+        stats['in_progress_wbs'] = wbs.count('wbs_status', '進行中')
+        stats['not_started_wbs'] = wbs.count('wbs_status', '未開始')
+        stats['overdue_wbs'] = wbs.count('wbs_overdue')
+        stats['overall_progress'] = round(wbs.average('wbs_progress') or 0, 2)
+
+        issues = load_project_stats(conn, project_id, "issue_")
+        stats['total_issues'] = issues.count('issue_status')
+        stats['open_issues'] = issues.count('issue_status', 'Open', 'In Progress')
+        stats['resolved_issues'] = issues.count('issue_status', 'Resolved', 'Closed')
+        stats['critical_issues'] = issues.count('issue_severity', 'Critical')
+
+        pending = load_project_stats(conn, project_id, "pending_")
+        stats['total_pending'] = pending.count('pending_status')
+        stats['pending_replied'] = pending.count('pending_replied', '1')
+        stats['pending_overdue'] = pending.count_before('pending_reply_due', today())
 
         # Determine health status
         health_status = "Healthy"
@@ -1,10 +1,11 @@
 """
 Business logic service for system and project settings
 """
-import sqlite3
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from backend.config import settings
+from backend.db_pool import get_pool
+from backend.db_writer import get_writer
 from backend.models.settings import (
     SystemSettingCreate, SystemSettingUpdate, SystemSettingResponse,
     ProjectSettingCreate, ProjectSettingUpdate, ProjectSettingResponse
@@ -18,10 +19,8 @@ class SettingsService:
         self.db_path = str(settings.database_path)
 
     def _get_connection(self):
-        """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get database connection from the shared pool"""
+        return get_pool(self.db_path).acquire()
 
     # ==================== System Settings ====================
 
@@ -55,17 +54,11 @@ class SettingsService:
 
     def update_system_setting(self, setting_key: str, update_data: SystemSettingUpdate) -> Optional[SystemSettingResponse]:
         """Update a system setting"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("""
+        get_writer(self.db_path).execute(lambda conn: conn.execute("""
             UPDATE system_settings
             SET setting_value = ?, updated_at = CURRENT_TIMESTAMP
             WHERE setting_key = ?
-        """, (update_data.setting_value, setting_key))
-
-        conn.commit()
-        conn.close()
+        """, (update_data.setting_value, setting_key)))
 
         return self.get_system_setting(setting_key)
 
@@ -114,24 +107,24 @@ class SettingsService:
 
     def create_project_setting(self, setting_data: ProjectSettingCreate) -> ProjectSettingResponse:
         """Create a new project setting"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        def _insert(conn):
+            cursor = conn.cursor()
 
-        cursor.execute("""
-            INSERT INTO project_settings (
-                project_id, setting_key, setting_value, display_order, is_active
-            ) VALUES (?, ?, ?, ?, ?)
-        """, (
-            setting_data.project_id,
-            setting_data.setting_key,
-            setting_data.setting_value,
-            setting_data.display_order,
-            setting_data.is_active
-        ))
-
-        setting_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+            cursor.execute("""
+                INSERT INTO project_settings (
+                    project_id, setting_key, setting_value, display_order, is_active
+                ) VALUES (?, ?, ?, ?, ?)
+            """, (
+                setting_data.project_id,
+                setting_data.setting_key,
+                setting_data.setting_value,
+                setting_data.display_order,
+                setting_data.is_active
+            ))
+
+            return cursor.lastrowid
+
+        setting_id = get_writer(self.db_path).execute(_insert)
 
         return self.get_project_setting_by_id(setting_id)
 
@@ -151,9 +144,6 @@ class SettingsService:
 
     def update_project_setting(self, setting_id: int, update_data: ProjectSettingUpdate) -> Optional[ProjectSettingResponse]:
         """Update a project setting"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
         # Build dynamic UPDATE query
         update_fields = []
         params = []
@@ -170,29 +160,24 @@ class SettingsService:
         params.append(setting_id)
 
         query = f"UPDATE project_settings SET {', '.join(update_fields)} WHERE setting_id = ?"
-        cursor.execute(query, params)
-
-        conn.commit()
-        conn.close()
+        get_writer(self.db_path).execute(lambda conn: conn.execute(query, params))
 
         return self.get_project_setting_by_id(setting_id)
 
     def delete_project_setting(self, setting_id: int) -> bool:
         """Delete a project setting (soft delete)"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        def _delete(conn):
+            cursor = conn.cursor()
 
-        cursor.execute("""
-            UPDATE project_settings
-            SET is_active = 0, updated_at = CURRENT_TIMESTAMP
-            WHERE setting_id = ?
-        """, (setting_id,))
+            cursor.execute("""
+                UPDATE project_settings
+                SET is_active = 0, updated_at = CURRENT_TIMESTAMP
+                WHERE setting_id = ?
+            """, (setting_id,))
 
-        success = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
+            return cursor.rowcount > 0
 
-        return success
+        return get_writer(self.db_path).execute(_delete)
 
     # ==================== Owner Units (Shortcut methods) ====================
 
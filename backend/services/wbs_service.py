@@ -1,13 +1,35 @@
 """
 Business logic service for WBS items
 """
+import re
 import sqlite3
 from datetime import date, datetime
 from typing import List, Optional, Dict, Any
 from backend.config import settings
+from backend.db_pool import get_pool
+from backend.db_writer import get_writer
+from backend.pagination import Keyset, Page, SortKey, paginate
 from backend.models.wbs import WBSCreate, WBSUpdate, WBSResponse
 
 
+# Sort order of WBS lists; item_id breaks ties between projects
+WBS_KEYSET = Keyset(SortKey("wbs_sort_key"), SortKey("item_id"))
+
+_DIGITS = re.compile(r"\d+")
+
+
+def wbs_sort_key(wbs_id: str) -> str:
+    """Key sorting dotted WBS ids in natural order ("2.10" -> "00000002.00000010")"""
+    return _DIGITS.sub(lambda m: m.group().zfill(8), str(wbs_id))
+
+
+# Columns returned for each tree node (the response fields stored in the table)
+_TREE_NODE_FIELDS = [
+    field for field in WBSResponse.model_fields
+    if field not in ('estimated_progress', 'progress_variance', 'is_overdue')
+]
+
+
 class WBSService:
     """Service for managing WBS items"""
 
@@ -15,10 +37,8 @@ class WBSService:
         self.db_path = str(settings.database_path)
 
     def _get_connection(self):
-        """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get database connection from the shared pool"""
+        return get_pool(self.db_path).acquire()
 
     def _generate_item_id(self, project_id: str, wbs_id: str) -> str:
         """Generate unique item_id for WBS"""
@@ -87,66 +107,123 @@ class WBSService:
             'is_overdue': is_overdue
         }
 
+    def _resolve_parent_id(self, project_id: str, parent_id: Optional[str]) -> Optional[str]:
+        """Convert parent_id from wbs_id format to item_id format if needed"""
+        if not parent_id:
+            return None
+        # If parent_id looks like a wbs_id (doesn't contain '_'), convert it
+        if '_' not in parent_id:
+            return self._generate_item_id(project_id, parent_id)
+        # Already in item_id format
+        return parent_id
+
+    def _parse_owner_unit(self, owner_unit: Optional[str]) -> Dict[str, Optional[str]]:
+        """Parse owner_unit to determine owner_type and primary/secondary owners"""
+        if not owner_unit:
+            return {}
+        if '客戶' in owner_unit:
+            return {'owner_type': 'Client', 'primary_owner': owner_unit}
+        if '/' in owner_unit:
+            parts = owner_unit.split('/')
+            return {
+                'owner_type': 'Department',
+                'primary_owner': parts[0].strip(),
+                'secondary_owner': parts[1].strip() if len(parts) > 1 else None,
+            }
+        return {'owner_type': 'Internal', 'primary_owner': owner_unit}
+
+    # An upsert, not INSERT OR REPLACE: REPLACE deletes the old row without
+    # firing delete triggers, so its project_stats counts would never be removed
+    _INSERT_SQL = """
+        INSERT INTO tracking_items (
+            item_id, project_id, wbs_id, wbs_sort_key, parent_id, task_name, item_type, category,
+            owner_unit, owner_type, primary_owner, secondary_owner,
+            original_planned_start, original_planned_end,
+            revised_planned_start, revised_planned_end,
+            actual_start_date, actual_end_date, work_days,
+            actual_progress, status, notes, alert_flag, is_internal,
+            source, source_date
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (item_id) DO UPDATE SET
+            project_id = excluded.project_id, wbs_id = excluded.wbs_id,
+            wbs_sort_key = excluded.wbs_sort_key, parent_id = excluded.parent_id,
+            task_name = excluded.task_name, item_type = excluded.item_type, category = excluded.category,
+            owner_unit = excluded.owner_unit, owner_type = excluded.owner_type,
+            primary_owner = excluded.primary_owner, secondary_owner = excluded.secondary_owner,
+            original_planned_start = excluded.original_planned_start,
+            original_planned_end = excluded.original_planned_end,
+            revised_planned_start = excluded.revised_planned_start,
+            revised_planned_end = excluded.revised_planned_end,
+            actual_start_date = excluded.actual_start_date, actual_end_date = excluded.actual_end_date,
+            work_days = excluded.work_days, actual_progress = excluded.actual_progress,
+            status = excluded.status, notes = excluded.notes, alert_flag = excluded.alert_flag,
+            is_internal = excluded.is_internal, source = excluded.source, source_date = excluded.source_date,
+            updated_at = CURRENT_TIMESTAMP
+    """
+
+    def _insert_params(self, wbs_data: Dict[str, Any]) -> tuple:
+        """Build the tracking_items INSERT parameters for one WBS item"""
+        project_id = wbs_data['project_id']
+        owner = self._parse_owner_unit(wbs_data.get('owner_unit'))
+
+        return (
+            self._generate_item_id(project_id, wbs_data['wbs_id']), project_id,
+            wbs_data['wbs_id'], wbs_sort_key(wbs_data['wbs_id']),
+            self._resolve_parent_id(project_id, wbs_data.get('parent_id')),
+            wbs_data['task_name'], 'WBS', wbs_data.get('category', 'Task'),
+            wbs_data.get('owner_unit'), owner.get('owner_type'),
+            owner.get('primary_owner'), owner.get('secondary_owner'),
+            wbs_data.get('original_planned_start'), wbs_data.get('original_planned_end'),
+            wbs_data.get('revised_planned_start'), wbs_data.get('revised_planned_end'),
+            wbs_data.get('actual_start_date'), wbs_data.get('actual_end_date'), wbs_data.get('work_days'),
+            wbs_data.get('actual_progress', 0), wbs_data.get('status', '未開始'), wbs_data.get('notes'),
+            wbs_data.get('alert_flag'), wbs_data.get('is_internal', False),
+            'Manual', date.today()
+        )
+
     def create_wbs(self, wbs_data: WBSCreate) -> WBSResponse:
         """Create a new WBS item"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
         item_id = self._generate_item_id(wbs_data.project_id, wbs_data.wbs_id)
+        params = self._insert_params(wbs_data.model_dump())
 
-        # Convert parent_id from wbs_id format to item_id format if provided
-        parent_item_id = None
-        if wbs_data.parent_id:
-            # If parent_id looks like a wbs_id (doesn't contain '_'), convert it
-            if '_' not in wbs_data.parent_id:
-                parent_item_id = self._generate_item_id(wbs_data.project_id, wbs_data.parent_id)
-            else:
-                # Already in item_id format
-                parent_item_id = wbs_data.parent_id
-
-        # Parse owner_unit to determine owner_type and primary/secondary owners
-        owner_type = None
-        primary_owner = None
-        secondary_owner = None
-
-        if wbs_data.owner_unit:
-            if '客戶' in wbs_data.owner_unit:
-                owner_type = 'Client'
-                primary_owner = wbs_data.owner_unit
-            elif '/' in wbs_data.owner_unit:
-                owner_type = 'Department'
-                parts = wbs_data.owner_unit.split('/')
-                primary_owner = parts[0].strip()
-                secondary_owner = parts[1].strip() if len(parts) > 1 else None
-            else:
-                owner_type = 'Internal'
-                primary_owner = wbs_data.owner_unit
+        get_writer(self.db_path).execute(lambda conn: conn.execute(self._INSERT_SQL, params))
 
-        cursor.execute("""
-            INSERT OR REPLACE INTO tracking_items (
-                item_id, project_id, wbs_id, parent_id, task_name, item_type, category,
-                owner_unit, owner_type, primary_owner, secondary_owner,
-                original_planned_start, original_planned_end,
-                revised_planned_start, revised_planned_end,
-                actual_start_date, actual_end_date, work_days,
-                actual_progress, status, notes, alert_flag, is_internal,
-                source, source_date
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            item_id, wbs_data.project_id, wbs_data.wbs_id, parent_item_id,
-            wbs_data.task_name, 'WBS', wbs_data.category,
-            wbs_data.owner_unit, owner_type, primary_owner, secondary_owner,
-            wbs_data.original_planned_start, wbs_data.original_planned_end,
-            wbs_data.revised_planned_start, wbs_data.revised_planned_end,
-            wbs_data.actual_start_date, wbs_data.actual_end_date, wbs_data.work_days,
-            wbs_data.actual_progress, wbs_data.status, wbs_data.notes, wbs_data.alert_flag, wbs_data.is_internal,
-            'Manual', date.today()
-        ))
+        return self.get_wbs_by_id(item_id)
 
-        conn.commit()
-        conn.close()
+    def bulk_create_wbs(self, items: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """
+        Insert many WBS items in a single transaction
 
-        return self.get_wbs_by_id(item_id)
+        Items are plain dicts with WBSCreate field names, already validated by
+        the caller. Returns one entry per item: None on success, otherwise the
+        database error for that item.
+        """
+        if not items:
+            return []
+
+        params = [self._insert_params(item) for item in items]
+
+        def _insert(conn):
+            conn.execute("SAVEPOINT bulk_wbs")
+            try:
+                conn.executemany(self._INSERT_SQL, params)
+                conn.execute("RELEASE SAVEPOINT bulk_wbs")
+                return [None] * len(params)
+            except sqlite3.Error:
+                conn.execute("ROLLBACK TO SAVEPOINT bulk_wbs")
+                conn.execute("RELEASE SAVEPOINT bulk_wbs")
+
+            # Retry row by row so one bad item does not fail the whole batch
+            errors = []
+            for row in params:
+                try:
+                    conn.execute(self._INSERT_SQL, row)
+                    errors.append(None)
+                except sqlite3.Error as e:
+                    errors.append(str(e))
+            return errors
+
+        return get_writer(self.db_path).execute(_insert)
 
     def get_wbs_by_id(self, item_id: str) -> Optional[WBSResponse]:
         """Get WBS item by ID"""
@@ -174,9 +251,14 @@ class WBSService:
         project_id: Optional[str] = None,
         status: Optional[str] = None,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[WBSResponse]:
-        """Get list of WBS items with filters"""
+        limit: int = 100,
+        page_cursor: Optional[str] = None
+    ) -> Page:
+        """Get list of WBS items with filters
+
+        ``page_cursor`` (a previous page's next_cursor) continues after that
+        page and takes precedence over ``skip``.
+        """
         conn = self._get_connection()
         cursor = conn.cursor()
 
@@ -191,11 +273,17 @@ class WBSService:
             query += " AND status = ?"
             params.append(status)
 
-        query += " ORDER BY wbs_id LIMIT ? OFFSET ?"
-        params.extend([limit, skip])
+        if page_cursor:
+            condition, cursor_params = WBS_KEYSET.after(page_cursor)
+            query += f" AND {condition}"
+            params.extend(cursor_params)
+            skip = 0
+
+        query += f" ORDER BY {WBS_KEYSET.order_by()} LIMIT ? OFFSET ?"
+        params.extend([limit + 1, skip])
 
         cursor.execute(query, params)
-        rows = cursor.fetchall()
+        rows, next_cursor = paginate(cursor.fetchall(), limit, WBS_KEYSET)
         conn.close()
 
         items = []
@@ -205,7 +293,7 @@ class WBSService:
             item_dict.update(metrics)
             items.append(WBSResponse(**item_dict))
 
-        return items
+        return Page(items, next_cursor)
 
     def get_wbs_count(self, project_id: Optional[str] = None) -> int:
         """Get total count of WBS items"""
@@ -250,18 +338,9 @@ class WBSService:
 
         # Parse owner_unit if provided
         if 'owner_unit' in update_data and update_data['owner_unit']:
-            owner_unit = update_data['owner_unit']
-            if '客戶' in owner_unit:
-                update_data['owner_type'] = 'Client'
-                update_data['primary_owner'] = owner_unit
-            elif '/' in owner_unit:
-                update_data['owner_type'] = 'Department'
-                parts = owner_unit.split('/')
-                update_data['primary_owner'] = parts[0].strip()
-                update_data['secondary_owner'] = parts[1].strip() if len(parts) > 1 else None
-            else:
-                update_data['owner_type'] = 'Internal'
-                update_data['primary_owner'] = owner_unit
+            update_data.update(self._parse_owner_unit(update_data['owner_unit']))
+
+        conn.close()
 
         for field, value in update_data.items():
             update_fields.append(f"{field} = ?")
@@ -278,59 +357,102 @@ class WBSService:
 
         query = f"UPDATE tracking_items SET {', '.join(update_fields)} WHERE item_id = ?"
 
-        cursor.execute(query, params)
-        conn.commit()
-        conn.close()
+        get_writer(self.db_path).execute(lambda wconn: wconn.execute(query, params))
 
         return self.get_wbs_by_id(item_id)
 
     def delete_wbs(self, item_id: str) -> bool:
         """Delete WBS item"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        def _delete(conn):
+            cursor = conn.cursor()
 
-        # Check if item exists
-        cursor.execute("SELECT item_id FROM tracking_items WHERE item_id = ?", (item_id,))
-        if not cursor.fetchone():
-            conn.close()
-            return False
+            # Check if item exists
+            cursor.execute("SELECT item_id FROM tracking_items WHERE item_id = ?", (item_id,))
+            if not cursor.fetchone():
+                return False
 
-        # Delete dependencies first
-        cursor.execute("""
-            DELETE FROM item_dependencies
-            WHERE predecessor_id = ? OR successor_id = ?
-        """, (item_id, item_id))
-
-        # Delete the item
-        cursor.execute("DELETE FROM tracking_items WHERE item_id = ?", (item_id,))
+            # Delete dependencies first
+            cursor.execute("""
+                DELETE FROM item_dependencies
+                WHERE predecessor_id = ? OR successor_id = ?
+            """, (item_id, item_id))
 
-        conn.commit()
-        conn.close()
+            # Delete the item
+            cursor.execute("DELETE FROM tracking_items WHERE item_id = ?", (item_id,))
 
-        return True
+            return True
 
-    def get_wbs_tree(self, project_id: str) -> List[Dict[str, Any]]:
-        """Get WBS items in tree structure"""
-        items = self.get_wbs_list(project_id=project_id, limit=1000)
+        return get_writer(self.db_path).execute(_delete)
 
-        # Build tree structure
-        items_dict = {item.item_id: item.model_dump() for item in items}
+    def get_wbs_tree(
+        self,
+        project_id: str,
+        root_id: Optional[str] = None,
+        max_depth: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Get WBS items in tree structure
+
+        ``root_id`` limits the tree to that item's subtree and ``max_depth``
+        to that many levels. Nodes cut off by the depth limit keep an empty
+        ``children`` list and ``has_children`` tells whether to expand them.
+        """
+        if root_id:
+            root_condition = "item_id = :root_id"
+            root_id = self._resolve_parent_id(project_id, root_id)
+        else:
+            # Top-level items and items whose parent isn't a WBS item of the project
+            root_condition = """(parent_id IS NULL OR NOT EXISTS (
+                SELECT 1 FROM tracking_items p
+                WHERE p.item_id = r.parent_id AND p.item_type = 'WBS' AND p.project_id = :project_id
+            ))"""
 
-        # Add children lists
-        for item in items_dict.values():
-            item['children'] = []
-            item['level'] = len(item['wbs_id'].split('.'))
+        conn = self._get_connection()
+        cursor = conn.cursor()
 
-        # Build parent-child relationships
-        root_items = []
-        for item in items_dict.values():
-            if item['parent_id'] and item['parent_id'] in items_dict:
-                parent = items_dict[item['parent_id']]
-                parent['children'].append(item)
+        # The root is excluded from its own descendants, so a parent_id cycle
+        # can't make the recursion endless
+        cursor.execute(f"""
+            WITH RECURSIVE subtree(item_id, depth) AS (
+                SELECT item_id, 1 FROM tracking_items r
+                WHERE project_id = :project_id AND item_type = 'WBS' AND {root_condition}
+                UNION ALL
+                SELECT c.item_id, s.depth + 1
+                FROM subtree s
+                JOIN tracking_items c
+                  ON c.parent_id = s.item_id AND c.item_type = 'WBS' AND c.project_id = :project_id
+                WHERE (:max_depth IS NULL OR s.depth < :max_depth)
+                  AND c.item_id IS NOT :root_id
+            )
+            SELECT t.*, s.depth,
+                   EXISTS (
+                       SELECT 1 FROM tracking_items c
+                       WHERE c.parent_id = t.item_id AND c.item_type = 'WBS' AND c.project_id = :project_id
+                   ) AS has_children
+            FROM subtree s
+            JOIN tracking_items t ON t.item_id = s.item_id
+            ORDER BY CASE WHEN s.depth = 1 THEN NULL ELSE t.parent_id END, t.wbs_sort_key
+        """, {'project_id': project_id, 'root_id': root_id, 'max_depth': max_depth})
+
+        # Rows arrive grouped by parent and in WBS order within each group, so one
+        # pass appending every node to its parent's list keeps sibling order
+        roots = []
+        children = {}
+        for row in cursor:
+            node = {field: row[field] for field in _TREE_NODE_FIELDS}
+            node.update(self._calculate_progress_metrics(node))
+            node['is_internal'] = bool(node['is_internal'])
+            node['level'] = len(node['wbs_id'].split('.'))
+            node['has_children'] = bool(row['has_children'])
+            node['children'] = children.setdefault(node['item_id'], [])
+
+            if row['depth'] == 1:
+                roots.append(node)
             else:
-                root_items.append(item)
+                children.setdefault(node['parent_id'], []).append(node)
+
+        conn.close()
 
-        return root_items
+        return roots
 
     def get_children(self, item_id: str) -> List[WBSResponse]:
         """Get all children of a WBS item"""
@@ -340,7 +462,7 @@ class WBSService:
         cursor.execute("""
             SELECT * FROM tracking_items
             WHERE parent_id = ? AND item_type = 'WBS'
-            ORDER BY wbs_id
+            ORDER BY wbs_sort_key
         """, (item_id,))
 
         rows = cursor.fetchall()
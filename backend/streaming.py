@@ -0,0 +1,57 @@
+"""
+Stream bytes written by a blocking function to an async HTTP response
+
+The function writes to a spooled temporary file (in memory up to
+SPOOL_MAX_SIZE, then on disk) and runs to the end before anything is sent,
+so its worker thread and any pooled connection it reads from are released
+at rendering speed, not held for as long as a slow client takes to download.
+"""
+import asyncio
+import tempfile
+import weakref
+from typing import AsyncIterator, Callable
+from backend.executor import run_sync
+
+# Size of each chunk handed to the response
+CHUNK_SIZE = 64 * 1024
+
+# Bytes of output kept in memory before the spool moves to a temporary file
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+async def stream_worker_output(func: Callable, *args, **kwargs) -> AsyncIterator[bytes]:
+    """
+    Run ``func(output, *args, **kwargs)`` in the worker pool and stream what
+    it writes to ``output`` (a writable binary file object)
+
+    func has finished when this returns, so an exception it raises (e.g.
+    nothing to export) propagates from this call and can still become a
+    normal error response.
+    """
+    loop = asyncio.get_running_loop()
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    try:
+        await run_sync(func, spool, *args, **kwargs)
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+
+    async def _chunks() -> AsyncIterator[bytes]:
+        try:
+            while True:
+                # Reads wait on the default executor (the spool may be on
+                # disk), never on the database worker threads
+                chunk = await loop.run_in_executor(None, spool.read, CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            spool.close()
+
+    chunks = _chunks()
+    # A response dropped before it starts iterating (e.g. the client went
+    # away) never runs the finally above; close the spool when the
+    # generator is collected instead
+    weakref.finalize(chunks, spool.close)
+    return chunks
@@ -0,0 +1,32 @@
+"""
+Shared fixtures: every test runs against a throwaway database
+
+DATABASE_PATH is set before any backend module is imported, so services,
+pools and writers all use the temporary file, never the configured one.
+"""
+import os
+import sqlite3
+import tempfile
+
+os.environ["DATABASE_PATH"] = os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ.setdefault("BACKUP_SCHEDULE_ENABLED", "false")
+
+import pytest
+
+from backend.config import settings
+from backend.init_db import create_database_schema
+from backend.migrations import add_is_internal_column, update_pending_dates
+
+create_database_schema()
+add_is_internal_column.migrate()
+update_pending_dates.migrate()
+# Again, so triggers built from the table columns include the migrated ones
+create_database_schema()
+
+
+@pytest.fixture
+def db():
+    """A plain connection to the test database"""
+    conn = sqlite3.connect(str(settings.database_path))
+    yield conn
+    conn.close()
@@ -0,0 +1,142 @@
+"""
+Backups: catalog, retention and point-in-time restore
+"""
+import gzip
+import hashlib
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.backup_catalog import BackupCatalog, retained_backups
+from backend.backup_scheduler import BackupScheduler
+from backend.backup_store import ChunkStore
+from backend.change_journal import journal_position, read_changes
+from backend.models.project import ProjectCreate
+from backend.services.backup_service import BackupService
+from backend.services.project_service import ProjectService
+from backend.services.wbs_service import WBSService
+
+
+def test_catalog_is_created_on_first_use(tmp_path):
+    catalog = BackupCatalog(tmp_path / "backups")
+    assert not catalog.backup_dir.exists()
+
+    assert catalog.list() == []
+    assert catalog.path.exists()
+
+
+def test_restores_replay_whole_write_jobs(db):
+    ProjectService().create_project(ProjectCreate(project_id="PITR", project_name="Point in time"))
+    after_id = journal_position(db)[0]
+    items = [{"project_id": "PITR", "wbs_id": wbs_id, "task_name": "Task"} for wbs_id in ("1", "2", "3")]
+    assert WBSService().bulk_create_wbs(items) == [None, None, None]
+
+    entries = db.execute(
+        "SELECT change_id, txn_id FROM change_journal WHERE change_id > ? ORDER BY change_id", (after_id,)
+    ).fetchall()
+    assert len(entries) == 3 and {txn_id for _, txn_id in entries} == {entries[0][0]}
+
+    # The job's entries straddle the restore time: none of them is replayed
+    until = "2000-01-01T00:00:00.000"
+    db.execute("UPDATE change_journal SET changed_at = ? WHERE change_id > ?", (until, after_id))
+    db.execute("UPDATE change_journal SET changed_at = '2000-01-01T00:00:00.001' WHERE change_id = ?",
+               (entries[-1][0],))
+    db.commit()
+    assert read_changes(db, after_id, until) == []
+    assert len(read_changes(db, after_id, "2000-01-01T00:00:00.001")) == 3
+
+
+@pytest.fixture
+def service(tmp_path):
+    """Backup service keeping its backups in a temporary directory"""
+    service = BackupService()
+    service.backup_dir = tmp_path / "backups"
+    service.store = ChunkStore(service.backup_dir / "chunks", "gzip")
+    service.catalog = BackupCatalog(service.backup_dir)
+    return service
+
+
+def test_backups_pass_an_integrity_check(service, tmp_path):
+    backup = service.create_backup(description="Integrity")
+    manifest = service._read_manifest(service.backup_dir / backup["filename"])
+    assert manifest["integrity_check"] == "ok"
+
+    copy = tmp_path / "copy.db"
+    service._reassemble(service.backup_dir / backup["filename"], copy)
+    conn = sqlite3.connect(str(copy))
+    try:
+        assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+        assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'tracking_items'").fetchone()
+    finally:
+        conn.close()
+
+
+def test_damaged_backups_are_not_restored(service, db):
+    projects = db.execute("SELECT COUNT(*) FROM projects").fetchone()[0]
+
+    backup = service.create_backup(description="Damaged chunk")
+    manifest = service._read_manifest(service.backup_dir / backup["filename"])
+    chunk_path, _ = service.store._find(manifest["chunks"][0])
+    chunk_path.write_bytes(b"not a chunk")
+    with pytest.raises(ValueError, match="damaged"):
+        service.restore_backup(backup["filename"])
+
+    (service.backup_dir / "backup_20000101_000000.db").write_bytes(b"SQLite format 3\0" + b"\xff" * 4096)
+    with pytest.raises(ValueError, match="integrity"):
+        service.restore_backup("backup_20000101_000000.db")
+
+    assert db.execute("SELECT COUNT(*) FROM projects").fetchone()[0] == projects
+    assert [b["kind"] for b in service.list_backups()] == ["manual"]
+
+
+def test_compressed_download_is_the_backed_up_database(service, tmp_path):
+    backup = service.create_backup(description="Download")
+    manifest = service._read_manifest(service.backup_dir / backup["filename"])
+    assert manifest["compression"] == "gzip" and manifest["compression_ratio"] > 1
+
+    name, chunks, sha256 = service.open_download(backup["filename"])
+    data = gzip.decompress(b"".join(chunks))
+
+    copy = tmp_path / "copy.db"
+    service._reassemble(service.backup_dir / backup["filename"], copy)
+    assert name.endswith(".db.gz")
+    assert data == copy.read_bytes() and hashlib.sha256(data).hexdigest() == sha256
+
+
+def test_retention_keeps_the_newest_backup_of_each_day_week_and_month():
+    now = datetime(2024, 6, 15, 12, 0)
+    backups = [
+        {"filename": day.strftime("%m-%d"), "created_at": day.isoformat()}
+        for day in (datetime(2024, 1, 1, 2, 0) + timedelta(days=n) for n in range(167))
+    ]
+
+    kept = retained_backups(backups, now, days=3, weeks=2, months=2)
+
+    # Days: June 13-15; weeks: newest of the ISO weeks ending June 9 and
+    # June 2; months: newest of May
+    assert kept == {"06-15", "06-14", "06-13", "06-09", "06-02", "05-31"}
+    assert retained_backups(backups[:10], now, days=3, weeks=2, months=2) == {"01-10"}
+
+
+def test_scheduler_skips_when_nothing_changed(service):
+    # Journal entries of earlier tests would be pruned (a change) once the
+    # first backup exists; start from a backup with nothing left to prune
+    service.create_backup()
+    service.prune_journal()
+    scheduler = BackupScheduler(service)
+
+    first = scheduler.run_once()
+    assert first["backup"] and not first["skipped"]
+    assert scheduler.run_once()["skipped"]
+
+    # After a restart the unchanged snapshot matches the latest scheduled backup
+    assert BackupScheduler(service).run_once()["skipped"]
+
+    ProjectService().create_project(ProjectCreate(project_id="SCHED", project_name="Scheduled"))
+    latest = scheduler.run_once()["backup"]
+    assert latest
+
+    # Retention keeps only the newest scheduled backup of the day
+    scheduled = [b["filename"] for b in service.list_backups() if b["kind"] == "scheduled"]
+    assert scheduled == [latest["filename"]]
@@ -0,0 +1,33 @@
+"""
+Dashboard summary ETags
+"""
+from fastapi.testclient import TestClient
+
+from backend.main import app
+
+client = TestClient(app)
+
+
+def test_unchanged_summary_is_not_modified():
+    client.post("/api/projects/", json={"project_id": "DASH", "project_name": "Dashboard"})
+    first = client.get("/api/dashboard/summary", params={"project_id": "DASH"})
+    etag = first.headers["etag"]
+    assert first.status_code == 200 and "max-age" in first.headers["cache-control"]
+
+    for if_none_match in (etag, f"W/{etag}", f'"other", {etag}'):
+        response = client.get(
+            "/api/dashboard/summary", params={"project_id": "DASH"}, headers={"If-None-Match": if_none_match}
+        )
+        assert response.status_code == 304 and response.content == b""
+        assert response.headers["etag"] == etag
+
+
+def test_changed_summary_gets_a_new_etag():
+    client.post("/api/projects/", json={"project_id": "DASH2", "project_name": "Dashboard"})
+    etag = client.get("/api/dashboard/summary", params={"project_id": "DASH2"}).headers["etag"]
+
+    client.post("/api/wbs/", json={"project_id": "DASH2", "wbs_id": "1", "task_name": "Task"})
+    response = client.get("/api/dashboard/summary", params={"project_id": "DASH2"}, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200 and response.headers["etag"] != etag
+    assert response.json()["wbs"]["total"] == 1
@@ -0,0 +1,49 @@
+"""
+Dependency cycle checks
+"""
+import pytest
+
+from backend.models.dependency import DependencyCreate, DependencyUpdate
+from backend.models.project import ProjectCreate
+from backend.models.wbs import WBSCreate
+from backend.services.dependency_service import DependencyCycleError, DependencyService
+from backend.services.project_service import ProjectService
+from backend.services.wbs_service import WBSService
+
+
+@pytest.fixture(scope="module")
+def items():
+    """Items CA1 in project CYC_A, CB1 and CB2 in project CYC_B"""
+    for project_id in ("CYC_A", "CYC_B"):
+        ProjectService().create_project(ProjectCreate(project_id=project_id, project_name=project_id))
+    wbs_service = WBSService()
+    for project_id, wbs_id in (("CYC_A", "1"), ("CYC_B", "1"), ("CYC_B", "2")):
+        wbs_service.create_wbs(WBSCreate(project_id=project_id, wbs_id=wbs_id, task_name=wbs_id))
+    return "CYC_A_1", "CYC_B_1", "CYC_B_2"
+
+
+def _link(predecessor_id, successor_id, **kwargs):
+    return DependencyService().create_dependency(
+        DependencyCreate(predecessor_id=predecessor_id, successor_id=successor_id, **kwargs)
+    )
+
+
+def test_cycle_through_another_project_is_rejected(items):
+    a1, b1, b2 = items
+    _link(b1, b2)
+    _link(b2, a1)
+
+    # The path back to a1 runs over b1 -> b2, an edge inside the other project
+    with pytest.raises(DependencyCycleError) as error:
+        _link(a1, b1)
+    assert error.value.path == [a1, b1, b2, a1]
+
+    # The same when an inactive dependency is switched back on
+    dependency = _link(a1, b1, is_active=False)
+    with pytest.raises(DependencyCycleError):
+        DependencyService().update_dependency(dependency.dependency_id, DependencyUpdate(is_active=True))
+
+
+def test_dependency_into_another_project_without_cycle_is_allowed(items):
+    a1, b1, b2 = items
+    assert _link(b1, a1).dependency_id
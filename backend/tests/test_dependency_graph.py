@@ -0,0 +1,70 @@
+"""
+Cached dependency graphs and their invalidation
+"""
+from datetime import date
+
+import pytest
+
+from backend.db_pool import get_pool
+from backend.dependency_graph import get_dependency_graph
+from backend.models.dependency import DependencyCreate, DependencyUpdate
+from backend.models.project import ProjectCreate
+from backend.models.wbs import WBSCreate, WBSUpdate
+from backend.services.dependency_service import DependencyService
+from backend.services.project_service import ProjectService
+from backend.services.wbs_service import WBSService
+
+
+@pytest.fixture(scope="module")
+def items():
+    """Items G1 and G2 in project GRAPH_A, X1 in GRAPH_B and U1 in unrelated GRAPH_C"""
+    for project_id in ("GRAPH_A", "GRAPH_B", "GRAPH_C"):
+        ProjectService().create_project(ProjectCreate(project_id=project_id, project_name=project_id))
+    for project_id, wbs_id in (("GRAPH_A", "1"), ("GRAPH_A", "2"), ("GRAPH_B", "1"), ("GRAPH_C", "1")):
+        WBSService().create_wbs(WBSCreate(project_id=project_id, wbs_id=wbs_id, task_name=wbs_id))
+    return "GRAPH_A_1", "GRAPH_A_2", "GRAPH_B_1", "GRAPH_C_1"
+
+
+def _graph():
+    conn = get_pool().acquire()
+    try:
+        return get_dependency_graph(conn, "GRAPH_A")
+    finally:
+        conn.close()
+
+
+def _edges(graph):
+    return {(graph.items[e.predecessor].item_id, graph.items[e.successor].item_id) for e in graph.edges}
+
+
+def test_graph_is_reused_until_a_dependency_changes(items):
+    g1, g2, x1, u1 = items
+    graph = _graph()
+    assert _graph() is graph
+
+    dependency = DependencyService().create_dependency(DependencyCreate(predecessor_id=g1, successor_id=g2))
+    graph = _graph()
+    assert _edges(graph) == {(g1, g2)}
+    assert _graph() is graph
+
+    DependencyService().update_dependency(dependency.dependency_id, DependencyUpdate(is_active=False))
+    assert _edges(_graph()) == set()
+
+    DependencyService().update_dependency(dependency.dependency_id, DependencyUpdate(is_active=True))
+    assert _edges(_graph()) == {(g1, g2)}
+
+    DependencyService().delete_dependency(dependency.dependency_id)
+    assert _edges(_graph()) == set()
+
+
+def test_graph_follows_item_dates_of_linked_projects_only(items):
+    g1, g2, x1, u1 = items
+    DependencyService().create_dependency(DependencyCreate(predecessor_id=x1, successor_id=g1))
+    graph = _graph()
+
+    WBSService().update_wbs(u1, WBSUpdate(original_planned_start=date(2024, 3, 1)))
+    assert _graph() is graph
+
+    WBSService().update_wbs(x1, WBSUpdate(original_planned_start=date(2024, 3, 1)))
+    graph = _graph()
+    assert graph.items[graph.index[x1]].start == date(2024, 3, 1)
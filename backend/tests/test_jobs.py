@@ -0,0 +1,60 @@
+"""
+Background job submission and cancellation
+"""
+import sqlite3
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.services import job_service
+from backend.services.job_service import JobService, register_job_type
+
+client = TestClient(app)
+
+_release = threading.Event()
+
+
+@register_job_type('test_wait')
+def _wait_job(ctx):
+    _release.wait(10)
+    return {}
+
+
+def test_export_without_project_is_rejected_on_submit():
+    for job_type in ("export_wbs", "export_pending", "export_issues"):
+        response = client.post("/api/jobs/", json={"job_type": job_type, "params": {}})
+        assert response.status_code == 400
+        assert "project_id" in response.json()["detail"]
+        assert client.get("/api/jobs/", params={"job_type": job_type}).json()["total"] == 0
+
+
+def test_failed_submit_leaves_no_job_directory(monkeypatch):
+    class _FailingWriter:
+        def execute(self, fn):
+            raise sqlite3.OperationalError("database is locked")
+
+    service = JobService()
+    service.jobs_dir.mkdir(parents=True, exist_ok=True)
+    before = set(service.jobs_dir.iterdir())
+    monkeypatch.setattr(job_service, "get_writer", lambda db_path: _FailingWriter())
+
+    with pytest.raises(sqlite3.OperationalError):
+        service.submit('test_wait')
+    assert set(service.jobs_dir.iterdir()) == before
+
+
+def test_cancel_racing_completion_keeps_the_final_message(monkeypatch):
+    service = JobService()
+    job = service.submit('test_wait')
+    future = job_service._futures[job.job_id]
+
+    # The job completes after cancel_job has read it as still unfinished
+    monkeypatch.setattr(service, "get_job", lambda job_id: job)
+    _release.set()
+    future.result(timeout=10)
+    service.cancel_job(job.job_id)
+
+    finished = JobService().get_job(job.job_id)
+    assert (finished.status, finished.message) == ("completed", "Completed")
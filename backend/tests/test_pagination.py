@@ -0,0 +1,39 @@
+"""
+Cursor pagination of list endpoints
+"""
+from fastapi.testclient import TestClient
+
+from backend.main import app
+
+client = TestClient(app)
+
+
+def _add_wbs(wbs_id):
+    response = client.post("/api/wbs/", json={"project_id": "PAGE", "wbs_id": wbs_id, "task_name": wbs_id})
+    assert response.status_code == 201
+
+
+def test_cursor_pages_stay_stable_across_inserts():
+    client.post("/api/projects/", json={"project_id": "PAGE", "project_name": "Pages"})
+    for wbs_id in ("1", "2", "3", "4", "5", "6"):
+        _add_wbs(wbs_id)
+
+    first = client.get("/api/wbs/", params={"project_id": "PAGE", "limit": 2}).json()
+    seen = [item["wbs_id"] for item in first["items"]]
+    assert seen == ["1", "2"]
+
+    # Rows inserted before the cursor don't shift later pages; rows after it show up
+    _add_wbs("0")
+    _add_wbs("7")
+    cursor = first["next_cursor"]
+    while cursor:
+        page = client.get("/api/wbs/", params={"project_id": "PAGE", "limit": 2, "cursor": cursor}).json()
+        seen += [item["wbs_id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+
+    assert seen == ["1", "2", "3", "4", "5", "6", "7"]
+
+
+def test_invalid_cursor_is_rejected():
+    response = client.get("/api/wbs/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
@@ -0,0 +1,51 @@
+"""
+Trigger-maintained project statistics stay equal to recomputed counts
+"""
+from backend.models.project import ProjectCreate
+from backend.models.wbs import WBSCreate
+from backend.project_stats import check_project_stats
+from backend.services.excel_service import ExcelService
+from backend.services.project_service import ProjectService
+from backend.services.wbs_service import WBSService
+
+
+def test_rewriting_a_wbs_id_keeps_counts(db):
+    ProjectService().create_project(ProjectCreate(project_id="STATS", project_name="Stats"))
+    wbs_service = WBSService()
+
+    for status, progress in (("未開始", 0), ("進行中", 40), ("已完成", 100)):
+        wbs_service.create_wbs(WBSCreate(
+            project_id="STATS", wbs_id="1", task_name="Task", status=status, actual_progress=progress
+        ))
+    items = [{"project_id": "STATS", "wbs_id": wbs_id, "task_name": "Task"} for wbs_id in ("1", "2")]
+    assert wbs_service.bulk_create_wbs(items) == [None, None]
+    assert wbs_service.bulk_create_wbs(items) == [None, None]
+
+    assert db.execute("SELECT COUNT(*) FROM tracking_items WHERE project_id = 'STATS'").fetchone()[0] == 2
+    assert check_project_stats(db) == []
+
+
+def test_reimporting_a_sheet_keeps_counts(db, tmp_path):
+    ProjectService().create_project(ProjectCreate(project_id="REIMPORT", project_name="Re-import"))
+    excel_service = ExcelService()
+    template = tmp_path / "template.xlsx"
+    excel_service.create_wbs_template(str(template))
+
+    first = excel_service.import_wbs_from_excel(str(template), "REIMPORT")
+    second = excel_service.import_wbs_from_excel(str(template), "REIMPORT")
+
+    assert first["imported"] > 0 and second["imported"] == first["imported"]
+    assert check_project_stats(db) == []
+
+
+def test_project_list_counts_come_from_stats(db):
+    ProjectService().create_project(ProjectCreate(project_id="LISTED", project_name="Listed"))
+    wbs_service = WBSService()
+    for wbs_id, status in (("1", "已完成"), ("2", "進行中"), ("3", "未開始")):
+        wbs_service.create_wbs(WBSCreate(project_id="LISTED", wbs_id=wbs_id, task_name="Task", status=status))
+
+    project = ProjectService().get_project_by_id("LISTED")
+    assert (project.total_wbs, project.completed_wbs, project.in_progress_wbs) == (3, 1, 1)
+    assert (project.total_issues, project.total_pending) == (0, 0)
+    listed = {p.project_id: p for p in ProjectService().get_project_list().items}
+    assert listed["LISTED"].total_wbs == 3
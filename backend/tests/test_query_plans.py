@@ -0,0 +1,22 @@
+"""
+No service query falls back to a full table scan (see backend.benchmarks.query_plans)
+"""
+import sqlite3
+
+from backend.benchmarks.query_plans import RecordingCursor, exercise_api, find_full_scans
+from backend.db_pool import PooledConnection
+from backend.db_writer import WriterConnection
+
+
+def test_no_statement_scans_a_whole_table(monkeypatch):
+    def cursor(self, factory=RecordingCursor):
+        return sqlite3.Connection.cursor(self, factory)
+
+    for cls in (PooledConnection, WriterConnection):
+        monkeypatch.setattr(cls, "cursor", cursor)
+    monkeypatch.setattr(RecordingCursor, "statements", {})
+
+    exercise_api()
+
+    assert len(RecordingCursor.statements) > 50
+    assert find_full_scans() == []
@@ -0,0 +1,114 @@
+"""
+Critical path and propagation of date changes
+"""
+import json
+from datetime import date
+
+import pytest
+
+from backend.critical_path import CriticalPath
+from backend.dependency_graph import DependencyGraph, GraphItem
+from backend.models.dependency import DependencyCreate, ScheduleChangeRequest
+from backend.models.project import ProjectCreate
+from backend.models.wbs import WBSCreate, WBSUpdate
+from backend.schedule_propagation import propagate
+from backend.services.dependency_service import DependencyService
+from backend.services.project_service import ProjectService
+from backend.services.wbs_service import WBSService
+
+
+def _graph(items, edges):
+    """Graph of (item_id, start, end) items and (predecessor, successor, type, lag) edges"""
+    return DependencyGraph(
+        [GraphItem(item_id, "SCH", item_id, item_id, None, start, end) for item_id, start, end in items],
+        [(n, predecessor, successor, kind, lag, None) for n, (predecessor, successor, kind, lag) in enumerate(edges)]
+    )
+
+
+@pytest.mark.parametrize("kind", ["FS", "SS", "FF", "SF"])
+def test_propagation_agrees_with_the_critical_path(kind):
+    # The successor is planned well before its predecessor allows
+    graph = _graph(
+        [("P", date(2024, 1, 10), date(2024, 1, 14)), ("S", date(2024, 1, 1), date(2024, 1, 3))],
+        [("P", "S", kind, 2)]
+    )
+    shift = propagate(graph, 0, date(2024, 1, 10), date(2024, 1, 14))[1]
+
+    cpm = CriticalPath(graph)
+    assert shift.start == cpm.start_date(cpm.early_start[1])
+    assert shift.end == cpm.finish_date(1, cpm.early_finish[1])
+
+
+def test_critical_path_dates_and_float():
+    ProjectService().create_project(ProjectCreate(project_id="CPM", project_name="CPM"))
+    for wbs_id, start, end in (("A", 1, 3), ("B", 4, 5), ("C", 4, 4), ("D", 6, 6)):
+        WBSService().create_wbs(WBSCreate(
+            project_id="CPM", wbs_id=wbs_id, task_name=wbs_id,
+            original_planned_start=date(2024, 1, start), original_planned_end=date(2024, 1, end)
+        ))
+    service = DependencyService()
+    for predecessor, successor in (("A", "B"), ("A", "C"), ("B", "D"), ("C", "D")):
+        service.create_dependency(
+            DependencyCreate(predecessor_id=f"CPM_{predecessor}", successor_id=f"CPM_{successor}")
+        )
+
+    result = service.get_critical_path("CPM")
+    items = {item.wbs_id: item for item in result.items}
+
+    assert result.critical_path == ["CPM_A", "CPM_B", "CPM_D"]
+    assert (result.project_start, result.project_finish) == (date(2024, 1, 1), date(2024, 1, 6))
+    assert {wbs_id: item.total_float for wbs_id, item in items.items()} == {"A": 0, "B": 0, "C": 1, "D": 0}
+    assert (items["C"].early_start, items["C"].late_finish) == (date(2024, 1, 4), date(2024, 1, 5))
+    assert items["B"].duration_days == 2
+
+    # Cached until the graph changes
+    assert service._critical_path("CPM") is service._critical_path("CPM")
+    WBSService().update_wbs("CPM_C", WBSUpdate(original_planned_end=date(2024, 1, 6)))
+    assert service.get_critical_path("CPM").project_finish == date(2024, 1, 7)
+
+
+def test_apply_impact_moves_dependents_and_records_the_change(db):
+    ProjectService().create_project(ProjectCreate(project_id="APPLY", project_name="Apply"))
+    for wbs_id, start, end in (("A", 1, 5), ("B", 6, 8), ("C", 9, 9)):
+        WBSService().create_wbs(WBSCreate(
+            project_id="APPLY", wbs_id=wbs_id, task_name=wbs_id,
+            original_planned_start=date(2024, 1, start), original_planned_end=date(2024, 1, end)
+        ))
+    service = DependencyService()
+    for predecessor, successor in (("A", "B"), ("B", "C")):
+        service.create_dependency(
+            DependencyCreate(predecessor_id=f"APPLY_{predecessor}", successor_id=f"APPLY_{successor}")
+        )
+
+    result = service.apply_schedule_change("APPLY_A", ScheduleChangeRequest(
+        field="revised_planned_end", new_value="2024-01-10", change_by="test", change_reason="late delivery"
+    ))
+
+    assert result.total_updated == 3
+    assert db.execute(
+        "SELECT item_id, revised_planned_start, revised_planned_end FROM tracking_items"
+        " WHERE project_id = 'APPLY' ORDER BY item_id"
+    ).fetchall() == [
+        ("APPLY_A", None, "2024-01-10"),
+        ("APPLY_B", "2024-01-11", "2024-01-13"),
+        ("APPLY_C", "2024-01-14", "2024-01-14"),
+    ]
+
+    change = db.execute("""
+        SELECT item_id, change_by, change_reason, old_end_date, new_end_date, affected_items_count, affected_items
+        FROM schedule_changes WHERE change_id = ?
+    """, (result.change_id,)).fetchone()
+    assert change[:6] == ("APPLY_A", "test", "late delivery", "2024-01-05", "2024-01-10", 2)
+    assert [item["item_id"] for item in json.loads(change[6])] == ["APPLY_B", "APPLY_C"]
+
+
+def test_rejected_apply_impact_changes_nothing(db):
+    changes = db.execute("SELECT COUNT(*) FROM schedule_changes").fetchone()[0]
+    with pytest.raises(ValueError):
+        DependencyService().apply_schedule_change(
+            "APPLY_A", ScheduleChangeRequest(field="actual_progress", new_value="2024-01-20")
+        )
+    assert DependencyService().apply_schedule_change(
+        "APPLY_NONE", ScheduleChangeRequest(field="revised_planned_end", new_value="2024-01-20")
+    ) is None
+    assert db.execute("SELECT COUNT(*) FROM schedule_changes").fetchone()[0] == changes
@@ -0,0 +1,60 @@
+"""
+Streaming worker output to responses
+"""
+import asyncio
+
+import pytest
+
+from backend.config import settings
+from backend.db_pool import get_pool
+from backend.executor import run_sync
+from backend.services.project_service import ProjectService
+from backend.streaming import CHUNK_SIZE, stream_worker_output
+
+
+def test_streams_everything_written():
+    def produce(output):
+        for i in range(100):
+            output.write(bytes([i % 256]) * 1000)
+
+    async def collect():
+        return b"".join([chunk async for chunk in await stream_worker_output(produce)])
+
+    body = asyncio.run(collect())
+    assert len(body) == 100 * 1000 and body[:1000] == b"\0" * 1000
+
+
+def test_errors_raise_before_the_response():
+    def produce(output):
+        output.write(b"partial")
+        raise ValueError("Nothing to export")
+
+    with pytest.raises(ValueError, match="Nothing to export"):
+        asyncio.run(stream_worker_output(produce))
+
+
+def test_slow_downloads_leave_the_workers_free():
+    def export(output):
+        # Reads through a pooled connection while writing, like the exports
+        conn = get_pool().acquire()
+        try:
+            for _ in range(64):
+                conn.execute("SELECT 1").fetchone()
+                output.write(b"x" * CHUNK_SIZE)
+        finally:
+            conn.close()
+
+    async def stalled_downloads_and_a_request():
+        # More clients than worker threads, each reading one chunk and stalling
+        downloads = [await stream_worker_output(export) for _ in range(settings.db_executor_workers + 1)]
+        for chunks in downloads:
+            assert len(await chunks.__anext__()) == CHUNK_SIZE
+
+        projects = await asyncio.wait_for(run_sync(ProjectService().get_project_list), timeout=5)
+
+        rest = [b"".join([chunk async for chunk in chunks]) for chunks in downloads]
+        return projects, rest
+
+    projects, rest = asyncio.run(stalled_downloads_and_a_request())
+    assert isinstance(projects.items, list)
+    assert all(len(body) == 63 * CHUNK_SIZE for body in rest)
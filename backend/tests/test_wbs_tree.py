@@ -0,0 +1,45 @@
+"""
+WBS tree and natural WBS order
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+
+client = TestClient(app)
+
+
+def _ids(nodes):
+    return [node["wbs_id"] for node in nodes]
+
+
+@pytest.fixture(scope="module")
+def project():
+    """Project TREE with its WBS items added out of order"""
+    client.post("/api/projects/", json={"project_id": "TREE", "project_name": "Tree"})
+    for wbs_id in ("10", "2", "2.10", "1", "2.9", "2.1", "2.2", "2.10.1"):
+        parent = wbs_id.rsplit(".", 1)[0] if "." in wbs_id else None
+        response = client.post("/api/wbs/", json={
+            "project_id": "TREE", "wbs_id": wbs_id, "task_name": wbs_id, "parent_id": parent
+        })
+        assert response.status_code == 201
+    return "TREE"
+
+
+def test_tree_is_in_natural_wbs_order(project):
+    tree = client.get(f"/api/wbs/tree/{project}").json()["tree"]
+    assert _ids(tree) == ["1", "2", "10"]
+    assert _ids(tree[1]["children"]) == ["2.1", "2.2", "2.9", "2.10"]
+    assert _ids(tree[1]["children"][3]["children"]) == ["2.10.1"]
+
+    items = client.get("/api/wbs/", params={"project_id": project, "limit": 100}).json()["items"]
+    assert _ids(items) == ["1", "2", "2.1", "2.2", "2.9", "2.10", "2.10.1", "10"]
+
+
+def test_subtree_and_depth_limit(project):
+    subtree = client.get(f"/api/wbs/tree/{project}", params={"root_id": "2", "depth": 2}).json()["tree"]
+    assert _ids(subtree) == ["2"]
+    ten = subtree[0]["children"][3]
+    assert ten["wbs_id"] == "2.10" and ten["children"] == [] and ten["has_children"]
+
+    assert client.get(f"/api/wbs/tree/{project}", params={"root_id": "9"}).status_code == 404
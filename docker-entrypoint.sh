@@ -6,10 +6,7 @@ export DATABASE_PATH=${DATABASE_PATH:-/app/data/project_tracking.db}
 echo "資料庫路徑: $DATABASE_PATH"
 
 # 確保資料目錄存在
-mkdir -p /app/data/backups/daily
-mkdir -p /app/data/backups/weekly
-mkdir -p /app/data/backups/monthly
-mkdir -p /app/data/backups/manual
+mkdir -p /app/data/backups
 
 # 如果資料庫不存在，則初始化
 if [ ! -f "$DATABASE_PATH" ]; then
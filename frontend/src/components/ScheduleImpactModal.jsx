@@ -2,11 +2,33 @@
  * Schedule Impact Modal Component
  * Displays schedule adjustment suggestions based on dependency analysis
  */
-import React from 'react'
+import React, { useState } from 'react'
+import api from '../utils/api'
+
+const ScheduleImpactModal = ({ analysis, onClose, onApplied }) => {
+  const [applying, setApplying] = useState(false)
 
-const ScheduleImpactModal = ({ analysis, onClose }) => {
   if (!analysis) return null
 
+  const handleApply = async () => {
+    if (!window.confirm(`確定要套用變更並調整 ${analysis.affected_items.length} 個項目的計畫日期嗎？`)) return
+
+    try {
+      setApplying(true)
+      const result = await api.post(
+        `/dependencies/item/${analysis.source_item_id}/apply-impact`,
+        analysis.date_change
+      )
+      alert(`已更新 ${result.total_updated} 個項目`)
+      if (onApplied) onApplied(result)
+      onClose()
+    } catch (err) {
+      alert(`套用失敗: ${err.message}`)
+    } finally {
+      setApplying(false)
+    }
+  }
+
   const formatDate = (dateStr) => {
     if (!dateStr) return '-'
     return dateStr
@@ -162,14 +184,11 @@ const ScheduleImpactModal = ({ analysis, onClose }) => {
               關閉
             </button>
             <button
-              onClick={() => {
-                // TODO: Implement apply adjustments
-                alert('套用調整功能開發中...')
-              }}
+              onClick={handleApply}
               className="btn-primary"
-              disabled={analysis.affected_items.length === 0}
+              disabled={analysis.affected_items.length === 0 || applying}
             >
-              套用建議調整
+              {applying ? '套用中...' : '套用建議調整'}
             </button>
           </div>
         </div>
@@ -11,6 +11,7 @@ const BackupManagement = () => {
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState(null)
   const [description, setDescription] = useState('')
+  const [restoreTime, setRestoreTime] = useState('')
 
   useEffect(() => {
     fetchBackups()
@@ -64,7 +65,8 @@ const BackupManagement = () => {
       const url = `${api.defaults.baseURL}/backup/download/${filename}`
       const link = document.createElement('a')
       link.href = url
-      link.download = filename
+      // The server names the file (backups download compressed)
+      link.download = ''
       document.body.appendChild(link)
       link.click()
       document.body.removeChild(link)
@@ -93,6 +95,30 @@ const BackupManagement = () => {
     }
   }
 
+  const handleRestoreToTime = async () => {
+    if (!restoreTime) {
+      return
+    }
+
+    if (!window.confirm(
+      `警告：資料庫將還原至 ${formatDateTime(restoreTime)} 的狀態！\n\n` +
+      '系統會在還原前自動建立目前資料庫的備份。\n\n' +
+      '確定要繼續嗎？'
+    )) {
+      return
+    }
+
+    try {
+      setLoading(true)
+      const response = await api.post('/backup/restore', { to_time: restoreTime })
+      alert(`資料庫已還原至指定時間點（基準備份：${response.restore.base}，重播 ${response.restore.replayed} 筆變更）。\n\n頁面將重新載入以反映變更。`)
+      window.location.reload()
+    } catch (err) {
+      alert(`時間點還原失敗: ${err.message}`)
+      setLoading(false)
+    }
+  }
+
   const handleDeleteBackup = async (filename) => {
     if (!window.confirm(`確定要刪除備份 "${filename}" 嗎？\n\n此操作無法復原！`)) {
       return
@@ -211,6 +237,30 @@ const BackupManagement = () => {
         </div>
       </div>
 
+      {/* Point-in-time Restore Section */}
+      <div className="bg-white rounded-lg shadow mb-6 p-6">
+        <h3 className="text-lg font-semibold text-gray-900 mb-2">還原至時間點</h3>
+        <p className="text-sm text-gray-600 mb-4">
+          以該時間點前最近的備份為基準，重播之後的 WBS 項目、依賴關係、問題與待辦事項變更
+        </p>
+        <div className="flex gap-4">
+          <input
+            type="datetime-local"
+            step="1"
+            value={restoreTime}
+            onChange={(e) => setRestoreTime(e.target.value)}
+            className="input-field flex-1"
+          />
+          <button
+            onClick={handleRestoreToTime}
+            disabled={loading || !restoreTime}
+            className="btn-secondary whitespace-nowrap"
+          >
+            ⏪ 還原至此時間
+          </button>
+        </div>
+      </div>
+
       {/* Backups List */}
       <div className="bg-white rounded-lg shadow overflow-hidden">
         <div className="px-6 py-4 border-b border-gray-200">
@@ -255,6 +305,9 @@ const BackupManagement = () => {
                     </td>
                     <td className="px-6 py-4 text-sm text-center text-gray-600">
                       {formatFileSize(backup.size)}
+                      {backup.stored_size < backup.size && (
+                        <div className="text-xs text-gray-400">新增 {formatFileSize(backup.stored_size)}</div>
+                      )}
                     </td>
                     <td className="px-6 py-4 text-sm text-center text-gray-600">
                       {formatDateTime(backup.created_at)}
@@ -17,6 +17,7 @@ const Dashboard = () => {
   const [shouldStartItems, setShouldStartItems] = useState([])
   const [dueTodayItems, setDueTodayItems] = useState([])
   const [dueSoonItems, setDueSoonItems] = useState([])
+  const [listTotals, setListTotals] = useState({ overdue: 0, shouldStart: 0, dueToday: 0, dueSoon: 0 })
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState(null)
 
@@ -29,270 +30,64 @@ const Dashboard = () => {
     setError(null)
 
     try {
-      // Fetch all data in parallel
-      const [projectsRes, wbsRes, pendingRes, issuesRes, depsRes] = await Promise.all([
-        api.get('/projects/'),
-        api.get('/wbs/', { params: { limit: 1000 } }),
-        api.get('/pending/', { params: { limit: 1000 } }),
-        api.get('/issues/', { params: { limit: 1000 } }),
-        api.get('/dependencies/').catch(() => ({ items: [], total: 0 })),
-      ])
-
-      // Calculate project stats
-      const activeProjects = projectsRes.items?.filter(
-        (p) => p.status === 'Active' || p.status === '進行中'
-      ).length || 0
-
-      // Calculate WBS stats
-      const wbsItems = wbsRes.items || []
-      const completedWBS = wbsItems.filter((w) => w.status === '已完成').length
-      const inProgressWBS = wbsItems.filter((w) => w.status === '進行中').length
-      const notStartedWBS = wbsItems.filter((w) => w.status === '未開始').length
-      const overdueWBS = wbsItems.filter((w) => w.is_overdue && w.status !== '已完成').length
-
-      // Calculate pending stats
-      const pendingItems = pendingRes.items || []
-      const pendingPending = pendingItems.filter((p) => p.status === '待處理').length
-      const inProgressPending = pendingItems.filter((p) => p.status === '處理中').length
-      const completedPending = pendingItems.filter((p) => p.status === '已完成').length
-      const overduePending = pendingItems.filter((p) => {
-        if (!p.expected_completion_date || p.status === '已完成') return false
-        const dueDate = new Date(p.expected_completion_date)
-        return dueDate < new Date()
-      }).length
-
-      // Calculate issue stats
-      const issueItems = issuesRes.items || []
-      const openIssues = issueItems.filter((i) => i.status === 'Open').length
-      const inProgressIssues = issueItems.filter((i) => i.status === 'In Progress').length
-      const resolvedIssues = issueItems.filter((i) => i.status === 'Resolved' || i.status === 'Closed').length
-      const criticalIssues = issueItems.filter((i) =>
-        (i.severity === 'Critical' || i.priority === 'Urgent') &&
-        i.status !== 'Resolved' && i.status !== 'Closed'
-      ).length
-
-      // Calculate dependency stats
-      const depsItems = depsRes.items || []
-      const activeDeps = depsItems.filter((d) => d.is_active).length
+      // Counts and the first items of each list are aggregated by the server
+      const summary = await api.get('/dashboard/summary')
 
       setStats({
         projects: {
-          total: projectsRes.total || 0,
-          active: activeProjects,
+          total: summary.projects.total,
+          active: summary.projects.active,
         },
         wbs: {
-          total: wbsRes.total || 0,
-          completed: completedWBS,
-          inProgress: inProgressWBS,
-          notStarted: notStartedWBS,
-          overdue: overdueWBS,
+          total: summary.wbs.total,
+          completed: summary.wbs.completed,
+          inProgress: summary.wbs.in_progress,
+          notStarted: summary.wbs.not_started,
+          overdue: summary.wbs.overdue,
         },
         pending: {
-          total: pendingRes.total || 0,
-          pending: pendingPending,
-          inProgress: inProgressPending,
-          completed: completedPending,
-          overdue: overduePending,
+          total: summary.pending.total,
+          pending: summary.pending.pending,
+          inProgress: summary.pending.in_progress,
+          completed: summary.pending.completed,
+          overdue: summary.pending.overdue,
         },
         issues: {
-          total: issuesRes.total || 0,
-          open: openIssues,
-          inProgress: inProgressIssues,
-          resolved: resolvedIssues,
-          critical: criticalIssues,
+          total: summary.issues.total,
+          open: summary.issues.open,
+          inProgress: summary.issues.in_progress,
+          resolved: summary.issues.resolved,
+          critical: summary.issues.critical,
         },
         dependencies: {
-          total: depsRes.total || 0,
-          active: activeDeps,
+          total: summary.dependencies.total,
+          active: summary.dependencies.active,
         },
       })
 
-      // Collect overdue items
-      const overdue = [
-        ...wbsItems
-          .filter((w) => w.is_overdue && w.status !== '已完成')
-          .map((w) => ({
-            type: 'WBS',
-            id: w.wbs_id,
-            code: w.wbs_id,
-            name: w.task_name,
-            dueDate: w.revised_planned_end || w.original_planned_end,
-            status: w.status,
-            projectId: w.project_id,
-          })),
-        ...pendingItems
-          .filter((p) => {
-            if (!p.expected_completion_date || p.status === '已完成') return false
-            const dueDate = new Date(p.expected_completion_date)
-            return dueDate < new Date()
-          })
-          .map((p) => ({
-            type: 'Pending',
-            id: p.pending_id,
-            code: p.pending_id,
-            name: p.description,
-            dueDate: p.expected_completion_date,
-            status: p.status,
-            projectId: p.project_id,
-          })),
-        ...issueItems
-          .filter((i) => {
-            if (!i.target_resolution_date || i.status === 'Resolved' || i.status === 'Closed') return false
-            const dueDate = new Date(i.target_resolution_date)
-            return dueDate < new Date()
-          })
-          .map((i) => ({
-            type: 'Issue',
-            id: i.issue_id,
-            code: i.issue_id,
-            name: i.issue_title,
-            dueDate: i.target_resolution_date,
-            status: i.status,
-            projectId: i.project_id,
-          })),
-      ]
-      setOverdueItems(overdue.slice(0, 5))
-
-      // Collect items that should have started but haven't
-      const now = new Date()
-      const shouldStart = [
-        ...wbsItems
-          .filter((w) => {
-            // Skip completed items
-            if (w.status === '已完成') return false
-
-            // Get the planned start date (revised takes priority)
-            const startDate = w.revised_planned_start || w.original_planned_start
-            if (!startDate) return false
-
-            const plannedStart = new Date(startDate)
-
-            // Check if planned start date has passed
-            if (plannedStart > now) return false
-
-            // Check if not actually started (no actual start date OR status is still "未開始")
-            return !w.actual_start_date || w.status === '未開始'
-          })
-          .map((w) => ({
-            type: 'WBS',
-            id: w.wbs_id,
-            code: w.wbs_id,
-            name: w.task_name,
-            startDate: w.revised_planned_start || w.original_planned_start,
-            status: w.status,
-            projectId: w.project_id,
-          })),
-      ]
-      setShouldStartItems(shouldStart.slice(0, 5))
-
-      // Collect items due today
-      const today = new Date(now)
-      today.setHours(0, 0, 0, 0)
-      const tomorrow = new Date(today)
-      tomorrow.setDate(tomorrow.getDate() + 1)
-
-      const dueToday = [
-        ...wbsItems
-          .filter((w) => {
-            if (w.status === '已完成') return false
-            const dueDate = new Date(w.revised_planned_end || w.original_planned_end)
-            dueDate.setHours(0, 0, 0, 0)
-            return dueDate.getTime() === today.getTime()
-          })
-          .map((w) => ({
-            type: 'WBS',
-            id: w.wbs_id,
-            code: w.wbs_id,
-            name: w.task_name,
-            dueDate: w.revised_planned_end || w.original_planned_end,
-            status: w.status,
-            projectId: w.project_id,
-          })),
-        ...pendingItems
-          .filter((p) => {
-            if (!p.expected_completion_date || p.status === '已完成') return false
-            const dueDate = new Date(p.expected_completion_date)
-            dueDate.setHours(0, 0, 0, 0)
-            return dueDate.getTime() === today.getTime()
-          })
-          .map((p) => ({
-            type: 'Pending',
-            id: p.pending_id,
-            code: p.pending_id,
-            name: p.description,
-            dueDate: p.expected_completion_date,
-            status: p.status,
-            projectId: p.project_id,
-          })),
-        ...issueItems
-          .filter((i) => {
-            if (!i.target_resolution_date || i.status === 'Resolved' || i.status === 'Closed') return false
-            const dueDate = new Date(i.target_resolution_date)
-            dueDate.setHours(0, 0, 0, 0)
-            return dueDate.getTime() === today.getTime()
-          })
-          .map((i) => ({
-            type: 'Issue',
-            id: i.issue_id,
-            code: i.issue_id,
-            name: i.issue_title,
-            dueDate: i.target_resolution_date,
-            status: i.status,
-            projectId: i.project_id,
-          })),
-      ]
-      setDueTodayItems(dueToday.slice(0, 5))
+      const toItem = (item) => ({
+        type: item.type,
+        id: item.id,
+        code: item.code,
+        name: item.name,
+        dueDate: item.date,
+        daysUntilDue: item.days_until_due,
+        status: item.status,
+        projectId: item.project_id,
+      })
 
-      // Collect items due in 7 days
-      const sevenDaysLater = new Date(now.getTime() + 7 * 24 * 60 * 60 * 1000)
-      const dueSoon = [
-        ...wbsItems
-          .filter((w) => {
-            if (w.status === '已完成') return false
-            const dueDate = new Date(w.revised_planned_end || w.original_planned_end)
-            return dueDate > now && dueDate <= sevenDaysLater
-          })
-          .map((w) => ({
-            type: 'WBS',
-            id: w.wbs_id,
-            code: w.wbs_id,
-            name: w.task_name,
-            dueDate: w.revised_planned_end || w.original_planned_end,
-            daysUntilDue: Math.ceil((new Date(w.revised_planned_end || w.original_planned_end) - now) / (1000 * 60 * 60 * 24)),
-            projectId: w.project_id,
-          })),
-        ...pendingItems
-          .filter((p) => {
-            if (!p.expected_completion_date || p.status === '已完成') return false
-            const dueDate = new Date(p.expected_completion_date)
-            return dueDate > now && dueDate <= sevenDaysLater
-          })
-          .map((p) => ({
-            type: 'Pending',
-            id: p.pending_id,
-            code: p.pending_id,
-            name: p.description,
-            dueDate: p.expected_completion_date,
-            daysUntilDue: Math.ceil((new Date(p.expected_completion_date) - now) / (1000 * 60 * 60 * 24)),
-            projectId: p.project_id,
-          })),
-        ...issueItems
-          .filter((i) => {
-            if (!i.target_resolution_date || i.status === 'Resolved' || i.status === 'Closed') return false
-            const dueDate = new Date(i.target_resolution_date)
-            return dueDate > now && dueDate <= sevenDaysLater
-          })
-          .map((i) => ({
-            type: 'Issue',
-            id: i.issue_id,
-            code: i.issue_number,
-            name: i.issue_title,
-            dueDate: i.target_resolution_date,
-            daysUntilDue: Math.ceil((new Date(i.target_resolution_date) - now) / (1000 * 60 * 60 * 24)),
-            projectId: i.project_id,
-          })),
-      ]
-      setDueSoonItems(dueSoon.slice(0, 5))
+      setOverdueItems(summary.overdue.items.map(toItem))
+      setShouldStartItems(
+        summary.should_start.items.map((item) => ({ ...toItem(item), startDate: item.date }))
+      )
+      setDueTodayItems(summary.due_today.items.map(toItem))
+      setDueSoonItems(summary.due_soon.items.map(toItem))
+      setListTotals({
+        overdue: summary.overdue.total,
+        shouldStart: summary.should_start.total,
+        dueToday: summary.due_today.total,
+        dueSoon: summary.due_soon.total,
+      })
     } catch (err) {
       setError(err.message)
     } finally {
@@ -381,7 +176,7 @@ const Dashboard = () => {
         {dueTodayItems.length > 0 && (
           <div className="mb-6 bg-blue-50 border-l-4 border-blue-600 p-4 rounded shadow-md">
             <div className="flex items-center mb-3">
-              <span className="text-blue-700 font-bold text-xl">🎯 今日到期項目 ({dueTodayItems.length})</span>
+              <span className="text-blue-700 font-bold text-xl">🎯 今日到期項目 ({listTotals.dueToday})</span>
             </div>
             <div className="grid grid-cols-1 md:grid-cols-2 gap-2">
               {dueTodayItems.map((item, idx) => {
@@ -422,7 +217,7 @@ const Dashboard = () => {
             {overdueItems.length > 0 && (
               <div className="bg-red-50 border-l-4 border-red-500 p-4 rounded">
                 <div className="flex items-center mb-2">
-                  <span className="text-red-600 font-semibold text-lg">⚠️ 逾期項目 ({overdueItems.length})</span>
+                  <span className="text-red-600 font-semibold text-lg">⚠️ 逾期項目 ({listTotals.overdue})</span>
                 </div>
                 <div className="space-y-2">
                   {overdueItems.map((item, idx) => {
@@ -454,7 +249,7 @@ const Dashboard = () => {
             {shouldStartItems.length > 0 && (
               <div className="bg-purple-50 border-l-4 border-purple-500 p-4 rounded">
                 <div className="flex items-center mb-2">
-                  <span className="text-purple-600 font-semibold text-lg">🚀 應該開始而未開始 ({shouldStartItems.length})</span>
+                  <span className="text-purple-600 font-semibold text-lg">🚀 應該開始而未開始 ({listTotals.shouldStart})</span>
                 </div>
                 <div className="space-y-2">
                   {shouldStartItems.map((item, idx) => {
@@ -503,7 +298,7 @@ const Dashboard = () => {
         {dueSoonItems.length > 0 && (
           <div className="mb-6 bg-yellow-50 border-l-4 border-yellow-500 p-4 rounded">
             <div className="flex items-center mb-2">
-              <span className="text-yellow-700 font-semibold text-lg">📅 本週即將到期 ({dueSoonItems.length})</span>
+              <span className="text-yellow-700 font-semibold text-lg">📅 本週即將到期 ({listTotals.dueSoon})</span>
             </div>
             <div className="grid grid-cols-1 md:grid-cols-2 gap-2">
               {dueSoonItems.map((item, idx) => {
@@ -451,6 +451,7 @@ const DependencyManagement = () => {
       {showImpactModal && impactAnalysis && (
         <ScheduleImpactModal
           analysis={impactAnalysis}
+          onApplied={fetchDependencies}
           onClose={() => {
             setShowImpactModal(false)
             setImpactAnalysis(null)
@@ -201,6 +201,14 @@ const WBSList = () => {
         })
       }
 
+      // 無法辨識的日期會以空白匯入，列出供使用者確認
+      if (result.warnings && result.warnings.length > 0) {
+        message += '\n\n日期格式無法辨識（已留空）：'
+        result.warnings.forEach(item => {
+          message += `\n第 ${item.row} 行 (${item.wbs_id}) ${item.column}: ${item.value}`
+        })
+      }
+
       if (result.imported > 0) {
         setSuccessMessage(message)
       } else {
@@ -306,7 +314,8 @@ const WBSList = () => {
       itemMap.set(item.wbs_id, { ...item, children: [] })
     })
 
-    // Build parent-child relationships
+    // Build parent-child relationships; items arrive in WBS order, so
+    // siblings are already sorted
     const topLevel = []
     items.forEach(item => {
       const node = itemMap.get(item.wbs_id)
@@ -328,37 +337,6 @@ const WBSList = () => {
       }
     })
 
-    // Sort children recursively
-    const sortChildren = (node) => {
-      if (node.children && node.children.length > 0) {
-        node.children.sort((a, b) => {
-          const aParts = a.wbs_id.split('.').map(Number)
-          const bParts = b.wbs_id.split('.').map(Number)
-          for (let i = 0; i < Math.max(aParts.length, bParts.length); i++) {
-            const aNum = aParts[i] || 0
-            const bNum = bParts[i] || 0
-            if (aNum !== bNum) return aNum - bNum
-          }
-          return 0
-        })
-        node.children.forEach(child => sortChildren(child))
-      }
-    }
-
-    // Sort top-level items
-    topLevel.sort((a, b) => {
-      const aParts = a.wbs_id.split('.').map(Number)
-      const bParts = b.wbs_id.split('.').map(Number)
-      for (let i = 0; i < Math.max(aParts.length, bParts.length); i++) {
-        const aNum = aParts[i] || 0
-        const bNum = bParts[i] || 0
-        if (aNum !== bNum) return aNum - bNum
-      }
-      return 0
-    })
-
-    topLevel.forEach(node => sortChildren(node))
-
     // Debug: Log tree structure
     if (topLevel.length > 0) {
       console.log('WBS Tree Structure:', topLevel.map(node => ({
@@ -569,18 +547,9 @@ const WBSList = () => {
             >
               <option value="">全部</option>
               {(() => {
-                // Only show top-level WBS items (those without parent_id)
+                // Only show top-level WBS items (those without parent_id), already in WBS order
                 const topLevelItems = wbsList.filter(item => !item.parent_id)
-                return topLevelItems.sort((a, b) => {
-                  const aParts = a.wbs_id.split('.').map(Number)
-                  const bParts = b.wbs_id.split('.').map(Number)
-                  for (let i = 0; i < Math.max(aParts.length, bParts.length); i++) {
-                    const aNum = aParts[i] || 0
-                    const bNum = bParts[i] || 0
-                    if (aNum !== bNum) return aNum - bNum
-                  }
-                  return 0
-                }).map(item => (
+                return topLevelItems.map(item => (
                   <option key={item.item_id} value={item.wbs_id}>
                     {item.wbs_id} - {item.task_name}
                   </option>
@@ -7,6 +7,9 @@ import { useSearchParams } from 'react-router-dom'
 import api from '../utils/api'
 import { useProjects } from '../hooks/useProjects'
 
+// Levels loaded per request; deeper nodes are fetched when expanded
+const TREE_DEPTH = 3
+
 const WBSTreeView = () => {
   const [searchParams, setSearchParams] = useSearchParams()
   const projectId = searchParams.get('project_id') || ''
@@ -36,14 +39,15 @@ const WBSTreeView = () => {
     try {
       setLoading(true)
       setError(null)
-      const response = await api.get(`/wbs/tree/${projectId}`)
+      const response = await api.get(`/wbs/tree/${projectId}`, { params: { depth: TREE_DEPTH } })
       setTreeData(response.tree || [])
       // Auto-expand all nodes by default
       const allNodeIds = new Set()
       const collectNodeIds = (nodes) => {
         nodes.forEach(node => {
-          allNodeIds.add(node.item_id)
+          // Nodes past the loaded depth stay collapsed until fetched
           if (node.children && node.children.length > 0) {
+            allNodeIds.add(node.item_id)
             collectNodeIds(node.children)
           }
         })
@@ -67,7 +71,32 @@ const WBSTreeView = () => {
     }
   }
 
-  const toggleNode = (nodeId) => {
+  // Replace a node (found by item_id) anywhere in the tree
+  const replaceNode = (nodes, replacement) => nodes.map((node) => {
+    if (node.item_id === replacement.item_id) return replacement
+    if (!node.children || node.children.length === 0) return node
+    return { ...node, children: replaceNode(node.children, replacement) }
+  })
+
+  const loadChildren = async (node) => {
+    try {
+      const response = await api.get(`/wbs/tree/${projectId}`, {
+        params: { root_id: node.item_id, depth: TREE_DEPTH },
+      })
+      const [subtree] = response.tree || []
+      if (subtree) {
+        setTreeData((prev) => replaceNode(prev, subtree))
+      }
+    } catch (err) {
+      setError(err.message || '載入子項目失敗')
+    }
+  }
+
+  const toggleNode = (node) => {
+    const nodeId = node.item_id
+    if (!expandedNodes.has(nodeId) && node.has_children && node.children.length === 0) {
+      loadChildren(node)
+    }
     setExpandedNodes((prev) => {
       const newSet = new Set(prev)
       if (newSet.has(nodeId)) {
@@ -83,8 +112,8 @@ const WBSTreeView = () => {
     const allNodeIds = new Set()
     const collectNodeIds = (nodes) => {
       nodes.forEach(node => {
-        allNodeIds.add(node.item_id)
         if (node.children && node.children.length > 0) {
+          allNodeIds.add(node.item_id)
           collectNodeIds(node.children)
         }
       })
@@ -119,7 +148,7 @@ const WBSTreeView = () => {
   }
 
   const TreeNode = ({ node, level = 0 }) => {
-    const hasChildren = node.children && node.children.length > 0
+    const hasChildren = node.has_children
     const isExpanded = expandedNodes.has(node.item_id)
 
     return (
@@ -132,7 +161,7 @@ const WBSTreeView = () => {
           <div className="w-6 flex-shrink-0">
             {hasChildren && (
               <button
-                onClick={() => toggleNode(node.item_id)}
+                onClick={() => toggleNode(node)}
                 className="text-gray-600 hover:text-gray-900 focus:outline-none"
               >
                 {isExpanded ? (
@@ -211,7 +240,7 @@ const WBSTreeView = () => {
         </div>
 
         {/* Children */}
-        {hasChildren && isExpanded && (
+        {hasChildren && isExpanded && node.children.length > 0 && (
           <div className="tree-children">
             {node.children.map((child) => (
               <TreeNode key={child.item_id} node={child} level={level + 1} />
@@ -33,10 +33,7 @@ echo ""
 
 # 步驟 3: 確保資料目錄存在
 echo "步驟 3: 確保資料目錄結構存在..."
-mkdir -p ./data/backups/daily
-mkdir -p ./data/backups/weekly
-mkdir -p ./data/backups/monthly
-mkdir -p ./data/backups/manual
+mkdir -p ./data/backups
 echo "✅ 完成"
 echo ""
 